@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import contextlib
+import time
+
+from yt_dlp.aes import (
+    _cbc_decrypt,
+    _ctr_encrypt,
+    _gcm_decrypt_and_verify,
+    aes_decrypt,
+    aes_encrypt,
+    inc,
+    key_expansion,
+    xor,
+)
+from yt_dlp.dependencies import Cryptodome
+from yt_dlp.utils import bytes_to_intlist, intlist_to_bytes
+
+
+def legacy_cbc_decrypt(data, key, iv):
+    # The byte-wise implementation that was used before the T-table one
+    data, key, iv = map(bytes_to_intlist, (data, key, iv))
+    expanded_key = key_expansion(key)
+    decrypted_data = []
+    previous_cipher_block = iv
+    for i in range(0, len(data), 16):
+        block = data[i:i + 16]
+        decrypted_data += xor(aes_decrypt(block, expanded_key), previous_cipher_block)
+        previous_cipher_block = block
+    return intlist_to_bytes(decrypted_data)
+
+
+def legacy_ctr_encrypt(data, key, iv):
+    data, key, counter = map(bytes_to_intlist, (data, key, iv))
+    expanded_key = key_expansion(key)
+    encrypted_data = []
+    for i in range(0, len(data), 16):
+        encrypted_data += xor(data[i:i + 16], aes_encrypt(counter, expanded_key))
+        counter = inc(counter)
+    return intlist_to_bytes(encrypted_data)
+
+
+def gcm_decrypt(data, key, iv):
+    with contextlib.suppress(ValueError):  # The tag of random data does not match
+        _gcm_decrypt_and_verify(data, key, bytes(16), iv[:12])
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the throughput of the native AES implementation')
+    parser.add_argument('--size', type=int, default=256, help='Size of the data in KiB (default: %(default)s)')
+    parser.add_argument(
+        '--skip-legacy', action='store_true', help='Do not measure the slow byte-wise implementation')
+    args = parser.parse_args()
+
+    size = args.size * 1024
+    data, key, iv = os.urandom(size), os.urandom(16), os.urandom(16)
+    assert legacy_cbc_decrypt(data[:4096], key, iv) == _cbc_decrypt(data[:4096], key, iv)
+
+    benchmarks = {
+        'CBC decrypt': [('native', _cbc_decrypt), ('legacy', legacy_cbc_decrypt)],
+        'CTR': [('native', _ctr_encrypt), ('legacy', legacy_ctr_encrypt)],
+        'GCM decrypt': [('native', gcm_decrypt)],
+    }
+    if Cryptodome.AES:
+        benchmarks['CBC decrypt'].append((
+            'pycryptodome', lambda data, key, iv: Cryptodome.AES.new(key, Cryptodome.AES.MODE_CBC, iv).decrypt(data)))
+
+    for mode, implementations in benchmarks.items():
+        for name, func in implementations:
+            if name == 'legacy' and args.skip_legacy:
+                continue
+            elapsed = measure(func, data, key, iv)
+            print(f'{mode:<12} {name:<13} {size / elapsed / 1024 / 1024:8.2f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
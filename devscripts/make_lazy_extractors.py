@@ -86,9 +86,12 @@ def extra_ie_code(ie, base=None):
 
 
 def build_ies(ies, bases, attr_base):
+    from yt_dlp.extractor._dispatch import url_ngrams
+
+    ies_ngrams = dict(zip(ies, url_ngrams(ies)))
     names = []
     for ie in sort_ies(ies, bases):
-        yield build_lazy_ie(ie, ie.__name__, attr_base)
+        yield build_lazy_ie(ie, ie.__name__, attr_base, ies_ngrams.get(ie))
         if ie in ies:
             names.append(ie.__name__)
 
@@ -118,13 +121,14 @@ def sort_ies(ies, ignored_bases):
     yield ies[-1]
 
 
-def build_lazy_ie(ie, name, attr_base):
+def build_lazy_ie(ie, name, attr_base, url_ngrams):
     bases = ', '.join({
         'InfoExtractor': 'LazyLoadExtractor',
         'SearchInfoExtractor': 'LazyLoadSearchExtractor',
     }.get(base.__name__, base.__name__) for base in ie.__bases__)
 
     s = IE_TEMPLATE.format(name=name, module=ie.__module__, bases=bases)
+    s += f'    _URL_NGRAMS = {url_ngrams!r}\n'
     return s + '\n'.join(extra_ie_code(ie, attr_base))
 
 
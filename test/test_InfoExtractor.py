@@ -19,6 +19,7 @@
     ExtractorError,
     RegexNotFoundError,
     encode_data_uri,
+    js_to_json,
     strip_jsonp,
 )
 
@@ -1906,6 +1907,31 @@ def test_response_with_expected_status_returns_content(self):
             expected_status=TEAPOT_RESPONSE_STATUS)
         self.assertEqual(content, TEAPOT_RESPONSE_BODY)
 
+    def test_search_json(self):
+        def search_json(*args, **kwargs):
+            result = self.ie._search_json(*args, **kwargs)
+            # Same pattern as the default, which makes it use the regex
+            self.assertEqual(self.ie._search_json(*args, **kwargs, contains_pattern=r'(?s:{.+})'), result)
+            return result
+
+        html = '<script>var data = "{}"; data = {"a": "}\\"{", "b": [{"c": 1}]};</script>{"d": 2}'
+        data = {'a': '}"{', 'b': [{'c': 1}]}
+        self.assertEqual(search_json(r'data\s*=', html, 'data', None), data)
+        self.assertEqual(search_json(r'data\s*=', html, 'data', None, end_pattern=';</script>'), data)
+        self.assertEqual(search_json(r'data\s*=', html, 'data', None, end_pattern='$'), data)
+        self.assertEqual(search_json(r'</script>', html, 'data', None), {'d': 2})
+        self.assertEqual(search_json(r'data\s*=', html, 'data', None, end_pattern='x', default=None), None)
+        self.assertEqual(search_json(r'missing', html, 'data', None, fatal=False), {})
+
+        js = '''<script>window.data = {a: '}', /* } */ b: {"c": `{`}, // }
+            d: [1, 2,]};</script>'''
+        self.assertEqual(
+            search_json(r'window\.data\s*=', js, 'data', None, transform_source=js_to_json),
+            {'a': '}', 'b': {'c': '{'}, 'd': [1, 2]})
+        self.assertEqual(search_json(r'window\.data\s*=', js, 'data', None, default=None), None)
+        with self.assertRaisesRegex(ExtractorError, 'Failed to parse JSON'):
+            search_json(r'window\.data\s*=', js, 'data', None)
+
     def test_search_nextjs_data(self):
         data = '<script id="__NEXT_DATA__" type="application/json">{"props":{}}</script>'
         self.assertEqual(self.ie._search_nextjs_data(data, None), {'props': {}})
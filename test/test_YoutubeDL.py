@@ -11,7 +11,9 @@
 
 import contextlib
 import copy
+import io
 import json
+import threading
 
 from test.helper import FakeYDL, assertRegexpMatches, try_rm
 from yt_dlp import YoutubeDL
@@ -22,6 +24,7 @@
 from yt_dlp.utils import (
     ExtractorError,
     LazyList,
+    MaxDownloadsReached,
     OnDemandPagedList,
     int_or_none,
     match_filter_func,
@@ -203,6 +206,27 @@ def test_format_selection_audio_exts(self):
         downloaded = ydl.downloaded_info_dicts[0]
         self.assertEqual(downloaded['format_id'], 'ogg-64')
 
+    def test_format_sorter_reuse(self):
+        formats = [
+            {'format_id': 'low', 'ext': 'mp4', 'height': 360, 'filesize': 3000, 'url': TEST_URL},
+            {'format_id': 'high', 'ext': 'mp4', 'height': 720, 'filesize': 1000, 'url': TEST_URL},
+        ]
+
+        def sort(**kwargs):
+            info_dict = _make_result(copy.deepcopy(formats), **kwargs)
+            ydl.sort_formats(info_dict)
+            return [f['format_id'] for f in info_dict['formats']]
+
+        ydl = YDL()
+        self.assertEqual(sort(), ['low', 'high'])
+        self.assertEqual(sort(), ['low', 'high'])
+        self.assertEqual(len(ydl._format_sorters), 1)
+        self.assertEqual(sort(_format_sort_fields=('size',)), ['high', 'low'])
+        self.assertEqual(len(ydl._format_sorters), 2)
+        ydl.params['format_sort'] = ['+size']
+        self.assertEqual(sort(), ['low', 'high'])
+        self.assertEqual(len(ydl._format_sorters), 3)
+
     def test_format_selection_video(self):
         formats = [
             {'format_id': 'dash-video-low', 'ext': 'mp4', 'preference': 1, 'acodec': 'none', 'url': TEST_URL},
@@ -433,6 +457,49 @@ def test_format_not_available(self):
         ydl = YDL({'format': 'best[height>360]'})
         self.assertRaises(ExtractorError, ydl.process_ie_result, info_dict.copy())
 
+    def test_check_formats(self):
+        tested = []
+
+        class CheckYDL(YDL):
+            def dl(self, name, info, subtitle=False, test=False):
+                tested.append(info['format_id'])
+                return info['format_id'] != 'f2', info
+
+        formats = [
+            {'format_id': f'f{i}', 'ext': 'mp4', 'height': i, 'url': TEST_URL, 'protocol': 'm3u8_native'}
+            for i in range(10)]
+
+        ydl = CheckYDL({'check_formats': True})
+        ydl.process_ie_result(_make_result(copy.deepcopy(formats)))
+        self.assertEqual(sorted(tested), sorted(f'f{i}' for i in range(10)))
+        self.assertEqual([f['format_id'] for f in ydl.downloaded_info_dicts[0]['formats']],
+                         [f'f{i}' for i in range(10) if i != 2])
+
+        # Only the formats up to the selected one and those being tested in advance are tested
+        for format_spec, expected, needed in (('best', 'f9', 1), ('worst', 'f0', 1), ('worst.3', 'f3', 4)):
+            tested.clear()
+            ydl = CheckYDL({'check_formats': 'selected', 'format': format_spec})
+            ydl.process_ie_result(_make_result(copy.deepcopy(formats)))
+            self.assertEqual(ydl.downloaded_info_dicts[0]['format_id'], expected)
+            self.assertLessEqual(len(tested), needed + YoutubeDL._FORMAT_TEST_CONCURRENCY)
+
+        responses = {'http://localhost/ok': b'x', 'http://localhost/empty': b''}
+
+        def urlopen(request):
+            self.assertEqual(request.headers['Range'], 'bytes=0-0')
+            if request.url not in responses:
+                raise OSError
+            return io.BytesIO(responses[request.url])
+
+        tested.clear()
+        ydl = CheckYDL({'check_formats': True})
+        ydl.urlopen = urlopen
+        ydl.process_ie_result(_make_result([
+            {'format_id': name, 'ext': 'mp4', 'url': f'http://localhost/{name}'}
+            for name in ('missing', 'empty', 'ok')]))
+        self.assertEqual([f['format_id'] for f in ydl.downloaded_info_dicts[0]['formats']], ['ok'])
+        self.assertEqual(tested, [])
+
     def test_format_selection_issue_10083(self):
         # See https://github.com/ytdl-org/youtube-dl/issues/10083
         formats = [
@@ -682,6 +749,16 @@ def test_add_extra_info(self):
         ],
     }
 
+    def test_compiled_outtmpl(self):
+        ydl = FakeYDL()
+        tmpl = '%%(id)s %(title,id|NA)s %(n+1)03d %(formats.0.{id,ext})j'
+        self.assertEqual(YoutubeDL._compile_outtmpl(tmpl), YoutubeDL._compile_outtmpl(tmpl))
+        self.assertEqual(len(YoutubeDL._compile_outtmpl(tmpl)), 6)
+        self.assertEqual(ydl.evaluate_outtmpl(tmpl, {'id': 'a', 'n': 1}), '%(id)s a 002 {}')
+        self.assertEqual(
+            ydl.evaluate_outtmpl(tmpl, {'id': 'b', 'title': 'B', 'formats': [{'id': 1}]}),
+            '%(id)s B NA {"id": 1}')
+
     def test_prepare_outtmpl_and_filename(self):
         def test(tmpl, expected, *, info=None, **params):
             params['outtmpl'] = tmpl
@@ -1244,6 +1321,167 @@ def _real_extract(self, url):
         self.assertEqual(downloaded['extractor'], 'Video')
         self.assertEqual(downloaded['extractor_key'], 'Video')
 
+    def test_playlist_prefetch(self):
+        extracted, abort_at = [], None
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append((video_id, threading.current_thread().name, self))
+                if video_id == '1':
+                    raise ExtractorError('foo', expected=True)
+                elif video_id == abort_at:
+                    raise MaxDownloadsReached
+                return {
+                    'id': video_id,
+                    'title': f'Video {video_id}',
+                    'url': TEST_URL,
+                }
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    self.url_result(f'video:{i}', VideoIE, str(i)) for i in range(6))
+
+        for prefetch in (0, 2):
+            extracted.clear()
+            ydl = YDL({'playlist_prefetch': prefetch, 'ignoreerrors': True, 'download_archive': {'video 3'}})
+            ydl.report_error = lambda *_, **__: None
+            video_ie = VideoIE(ydl)
+            ydl.add_info_extractor(video_ie)
+            ydl.add_info_extractor(PlaylistIE(ydl))
+            info = ydl.extract_info('playlist:')
+
+            self.assertEqual([entry and entry['id'] for entry in info['entries']], ['0', None, '2', '4', '5'])
+            self.assertEqual([i['id'] for i in ydl.downloaded_info_dicts], ['0', '2', '4', '5'])
+            self.assertEqual([i['playlist_index'] for i in ydl.downloaded_info_dicts], [1, 3, 5, 6])
+            self.assertEqual(sorted(video_id for video_id, _, _ in extracted), ['0', '1', '2', '4', '5'])
+            self.assertEqual(any(name.startswith('playlist_prefetch') for _, name, _ in extracted), bool(prefetch))
+            # The prefetched entries are extracted by their own copies of the extractor
+            for _, name, ie in extracted:
+                self.assertEqual(ie is video_ie, not name.startswith('playlist_prefetch'))
+            self.assertEqual(ydl._prefetched_entries, {})
+
+            # The prefetched entries are discarded when the playlist is aborted
+            abort_at = '2'
+            ydl = YDL({'playlist_prefetch': prefetch, 'ignoreerrors': True})
+            ydl.report_error = lambda *_, **__: None
+            ydl.add_info_extractor(VideoIE(ydl))
+            ydl.add_info_extractor(PlaylistIE(ydl))
+            try:
+                ydl.extract_info('playlist:')
+            except MaxDownloadsReached:
+                # Checked while the traceback still references the playlist
+                self.assertEqual(ydl._prefetched_entries, {})
+            else:
+                self.fail('MaxDownloadsReached not raised')
+            abort_at = None
+
+    def test_concurrent_urls(self):
+        extracted = []
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append((video_id, threading.current_thread().name))
+                if video_id == '2':
+                    raise ExtractorError('foo', expected=True)
+                return {
+                    'id': video_id,
+                    'title': f'Video {video_id}',
+                    'url': TEST_URL,
+                }
+
+        for concurrency in (1, 3):
+            extracted.clear()
+            ydl = YDL({'concurrent_urls': concurrency, 'ignoreerrors': True})
+            ydl.add_info_extractor(VideoIE(ydl))
+            ydl.report_error = lambda *_, **__: setattr(ydl, '_download_retcode', 1)
+            retcode = YoutubeDL.download(ydl, [f'video:{i}' for i in range(5)])
+
+            self.assertEqual(retcode, 1)
+            self.assertEqual(sorted(i['id'] for i in ydl.downloaded_info_dicts), ['0', '1', '3', '4'])
+            self.assertEqual(sorted(video_id for video_id, _ in extracted), ['0', '1', '2', '3', '4'])
+            self.assertEqual(
+                any(name.startswith('download') for _, name in extracted), concurrency > 1)
+
+    def test_concurrent_max_downloads(self):
+        extracted = threading.Barrier(3, timeout=5)
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                # The URLs are processed at the same time
+                extracted.wait()
+                return {'id': video_id, 'title': f'Video {video_id}', 'url': TEST_URL}
+
+        ydl = FakeYDL({
+            'concurrent_urls': 3,
+            'max_downloads': 2,
+            'simulate': True,
+            'forceprint': {'video': ['%(autonumber)s %(video_autonumber)s']},
+        })
+        ydl.add_info_extractor(VideoIE(ydl))
+        printed = []
+        ydl.to_stdout = printed.append
+        with self.assertRaises(MaxDownloadsReached):
+            YoutubeDL.download(ydl, [f'video:{i}' for i in range(3)])
+        # Only the allowed number of videos is downloaded, and their numbers are not shared
+        autonumbers, video_autonumbers = zip(*map(str.split, printed))
+        self.assertEqual(sorted(autonumbers), ['00001', '00002'])
+        self.assertEqual(len(set(video_autonumbers)), 2)
+
+    def test_stream_single_json(self):
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:(?P<id>\d*)'
+
+            def _entries(self, playlist_id):
+                for i in range(3):
+                    video_id = f'{playlist_id}{i}'
+                    if video_id == '01':
+                        yield self.url_result(f'playlist:{video_id}', PlaylistIE)
+                    elif video_id == '02':
+                        yield None
+                    else:
+                        yield {'id': video_id, 'title': f'Video {video_id}', 'url': TEST_URL}
+
+            def _real_extract(self, url):
+                playlist_id = self._match_id(url)
+                return self.playlist_result(self._entries(playlist_id), playlist_id, f'Playlist {playlist_id}')
+
+        def dump(stream):
+            ydl = YDL({
+                'dump_single_json': True, 'stream_single_json': stream, 'simulate': True, 'quiet': True, 'verbose': False})
+            ydl.add_info_extractor(PlaylistIE(ydl))
+            output = []
+            ydl._write_string = lambda message, *_, **__: output.append(message)
+            YoutubeDL.download(ydl, ['playlist:0'])
+            self.assertEqual(''.join(output).count('\n'), 1)
+            return output
+
+        output, streamed = dump(False), dump(True)
+        self.assertEqual(len(output), 1)
+        self.assertGreater(len(streamed), 3)
+        self.assertEqual(streamed[0], '{"entries": [')
+
+        def without_epoch(info):
+            return info and {
+                k: [without_epoch(e) for e in v] if k == 'entries' else v
+                for k, v in info.items() if k != 'epoch'}
+
+        info, streamed_info = json.loads(output[0]), json.loads(''.join(streamed))
+        self.assertEqual(without_epoch(streamed_info), without_epoch(info))
+        self.assertEqual([e and e['id'] for e in info['entries']], ['00', '01', None])
+        self.assertEqual([e['id'] for e in info['entries'][1]['entries']], ['010', '011', '012'])
+
     def test_header_cookies(self):
         from http.cookiejar import Cookie
 
@@ -12,6 +12,7 @@
 
 from test.helper import gettestcases
 from yt_dlp.extractor import FacebookIE, YoutubeIE, gen_extractors
+from yt_dlp.extractor._dispatch import ExtractorIndex
 
 
 class TestAllURLsMatching(unittest.TestCase):
@@ -82,6 +83,14 @@ def test_no_duplicates(self):
                         ie.suitable(url),
                         f'{type(ie).__name__} should not match URL {url!r} . That URL belongs to {tc["name"]}.')
 
+    def test_extractor_index(self):
+        index = ExtractorIndex((ie.ie_key(), ie) for ie in self.ies)
+        for tc in gettestcases(include_onlymatching=True):
+            self.assertIn(tc['name'], [ie_key for ie_key, _ in index.candidates(tc['url'])], tc['url'])
+        self.assertEqual(next(ie_key for ie_key, ie in index.candidates('https://vimeo.com/channels/tributes')
+                              if ie.suitable('https://vimeo.com/channels/tributes')), 'VimeoChannel')
+        self.assertIn('Generic', [ie_key for ie_key, _ in index.candidates('https://example.com/\u00e9')])
+
     def test_keywords(self):
         self.assertMatch(':ytsubs', ['youtube:subscriptions'])
         self.assertMatch(':ytsubscriptions', ['youtube:subscriptions'])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from test.helper import FakeYDL, try_rm
+from yt_dlp.archive import DownloadArchive
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        self.filename = os.path.join(TEST_DIR, 'testdata', 'archive_test.txt')
+        self.tearDown()
+
+    def tearDown(self):
+        for suffix in ('', '.sqlite3', '.sqlite3-wal', '.sqlite3-shm'):
+            try_rm(self.filename + suffix)
+
+    def write(self, data, mode='a'):
+        with open(self.filename, mode, encoding='utf-8') as f:
+            f.write(data)
+
+    def archive(self):
+        archive = DownloadArchive(FakeYDL(), self.filename)
+        self.addCleanup(archive.close)
+        return archive
+
+    def test_missing_file(self):
+        archive = self.archive()
+        self.assertFalse(archive)
+        self.assertNotIn('youtube a', archive)
+        archive.add('youtube a')
+        self.assertTrue(archive)
+        self.assertIn('youtube a', archive)
+
+    def test_index(self):
+        self.write('youtube a\nyoutube b\n\nvimeo 1\n')
+        archive = self.archive()
+        self.assertTrue(archive)
+        for vid_id in ('youtube a', 'youtube b', 'vimeo 1'):
+            self.assertIn(vid_id, archive)
+        self.assertNotIn('youtube c', archive)
+        self.assertNotIn(None, archive)
+        archive.close()
+
+        self.write('youtube c\nyoutube d')
+        archive = self.archive()
+        for vid_id in ('youtube a', 'youtube c', 'youtube d'):
+            self.assertIn(vid_id, archive)
+        archive.close()
+
+        self.write('e\n')
+        self.assertIn('youtube de', self.archive())
+
+    def test_rewrite(self):
+        self.write('youtube a\nyoutube b\n')
+        self.assertIn('youtube a', self.archive())
+        self.write('youtube b\n', mode='w')
+        archive = self.archive()
+        self.assertNotIn('youtube a', archive)
+        self.assertIn('youtube b', archive)
+        os.remove(self.filename)
+        self.assertFalse(self.archive())
+
+    def test_rewrite_after_head(self):
+        head = ''.join(f'youtube {i:05d}\n' for i in range(1000))
+        self.write(head + 'youtube a\n', mode='w')
+        self.assertIn('youtube a', self.archive())
+        # The line after the start of the file is removed, and the file grows past the indexed offset
+        self.write(head + 'youtube bb\nyoutube cc\n', mode='w')
+        archive = self.archive()
+        self.assertNotIn('youtube a', archive)
+        self.assertIn('youtube bb', archive)
+        self.assertIn('youtube cc', archive)
+
+    def test_unusable_index(self):
+        self.write('youtube a\n')
+        os.mkdir(self.filename + '.sqlite3')
+        ydl = FakeYDL()
+        warnings = []
+        ydl.report_warning = lambda msg, *_, **__: warnings.append(msg)
+        archive = DownloadArchive(ydl, self.filename)
+        try:
+            # The whole file is loaded instead
+            self.assertTrue(archive)
+            self.assertIn('youtube a', archive)
+            self.assertNotIn('youtube b', archive)
+            self.assertEqual(len(warnings), 1)
+        finally:
+            archive.close()
+            os.rmdir(self.filename + '.sqlite3')
+
+    def test_record(self):
+        archive = self.archive()
+        with patch.object(DownloadArchive, '_FLUSH_INTERVAL', 1000):
+            archive.record('youtube a')
+            archive.record('youtube b')
+            self.assertIn('youtube b', archive)
+            self.assertFalse(os.path.exists(self.filename))
+            archive.flush()
+            self.write('youtube c\n')
+            archive.record('youtube d')
+            archive.close()
+        with open(self.filename, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube a\nyoutube b\nyoutube c\nyoutube d\n')
+        archive = self.archive()
+        with patch.object(DownloadArchive, '_FLUSH_INTERVAL', 0):
+            archive.record('youtube e')
+        with open(self.filename, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines()[-1], 'youtube e')
+
+
+if __name__ == '__main__':
+    unittest.main()
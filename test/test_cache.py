@@ -9,9 +9,11 @@
 
 
 import shutil
+import time
+from unittest.mock import patch
 
 from test.helper import FakeYDL
-from yt_dlp.cache import Cache
+from yt_dlp.cache import Cache, SQLiteCacheBackend
 
 
 def _is_empty(d):
@@ -35,22 +37,95 @@ def tearDown(self):
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
 
-    def test_cache(self):
+    def test_cache(self, backend='file'):
         ydl = FakeYDL({
             'cachedir': self.test_dir,
+            'cache_backend': backend,
         })
         c = Cache(ydl)
         obj = {'x': 1, 'y': ['ä', '\\a', True]}
         self.assertEqual(c.load('test_cache', 'k.'), None)
         c.store('test_cache', 'k.', obj)
         self.assertEqual(c.load('test_cache', 'k2'), None)
+        c.close()
         self.assertFalse(_is_empty(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), obj)
         self.assertEqual(c.load('test_cache', 'y'), None)
         self.assertEqual(c.load('test_cache2', 'k.'), None)
+        self.assertEqual(Cache(ydl).load('test_cache', 'k.'), obj)
         c.remove()
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
+        c.close()
+
+    def test_cache_sqlite(self):
+        self.test_cache('sqlite')
+
+    def test_prune(self, backend='file'):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': backend,
+        })
+        c = Cache(ydl)
+        for i in range(5):
+            with patch('time.time', return_value=time.time() + i):
+                c.store('test_cache', f'k{i}', i)
+                if backend == 'file':
+                    os.utime(c._backend._get_cache_fn('test_cache', f'k{i}'), (i, i))
+        c.store('test_cache2', 'k', 0)
+        c.prune('test_cache', 2)
+        c.close()
+        self.assertEqual([c.load('test_cache', f'k{i}') for i in range(5)], [None, None, None, 3, 4])
+        self.assertEqual(c.load('test_cache2', 'k'), 0)
+        c.prune('test_cache3', 2)
+        c.close()
+
+    def test_prune_sqlite(self):
+        self.test_prune('sqlite')
+
+    def test_sqlite_eviction(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': 'sqlite',
+        })
+        c = Cache(ydl)
+        with patch.object(SQLiteCacheBackend, 'MAX_ENTRIES', 3):
+            with patch('time.time', return_value=time.time() - SQLiteCacheBackend.MAX_AGE - 1):
+                c.store('test_cache', 'old', 0)
+            c.close()
+            self.assertEqual(c.load('test_cache', 'old'), None)
+            for i in range(5):
+                with patch('time.time', return_value=time.time() + i):
+                    c.store('test_cache', f'k{i}', i)
+            c.close()
+        self.assertEqual([c.load('test_cache', f'k{i}') for i in range(5)], [None, None, 2, 3, 4])
+        c.close()
+
+    def test_invalid(self, backend='file'):
+        ydl = FakeYDL({
+            'cachedir': os.path.join(self.test_dir, 'file', 'cache'),
+            'cache_backend': backend,
+        })
+        ydl.report_warning = lambda *_, **__: None
+        c = Cache(ydl)
+        # The cache directory can not be created
+        _mkdir(self.test_dir)
+        with open(os.path.join(self.test_dir, 'file'), 'w'):
+            pass
+        c.store('test_cache', 'k', 1)
+        c.close()
+        self.assertEqual(c.load('test_cache', 'k', default=0), 0)
+        c.prune('test_cache', 1)
+        c.close()
+
+        os.remove(os.path.join(self.test_dir, 'file'))
+        c._backend.store('test_cache', 'k', {'yt-dlp_version': '2022.08.19'})
+        c.close()
+        self.assertEqual(c.load('test_cache', 'k', default=0), 0)
+        c.close()
+
+    def test_invalid_sqlite(self):
+        self.test_invalid('sqlite')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import concurrent.futures
+import http.server
+import re
+import threading
+import time
+from unittest.mock import patch
+
+from test.helper import http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader.fragment import FragmentConcurrencyController
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.networking.common import Response
+from yt_dlp.networking.exceptions import HTTPError
+from yt_dlp.utils import encodeFilename
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+TEST_FRAGMENTS = 8
+TEST_FRAGMENT_SIZE = 4 * 1024
+
+
+def fragment_content(index):
+    return bytes([index]) * TEST_FRAGMENT_SIZE
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/live.m3u8':
+            # Every refresh adds two fragments to a sliding window of four
+            end = min(self.server.live_refreshes * 2 + 2, TEST_FRAGMENTS)
+            self.server.live_refreshes += 1
+            # Size of the download when the playlist is refreshed
+            part = encodeFilename('testfile.ts.part')
+            self.server.live_sizes.append(os.path.getsize(part) if os.path.exists(part) else 0)
+            start = max(end - 4, 0)
+            self.send_body('\n'.join((
+                '#EXTM3U',
+                '#EXT-X-TARGETDURATION:0.1',
+                f'#EXT-X-MEDIA-SEQUENCE:{start}',
+                *(f'#EXTINF:0.1,\n/live/{i}.ts' for i in range(start, end)),
+                *(['#EXT-X-ENDLIST'] if end == TEST_FRAGMENTS else []),
+            )).encode(), 'application/vnd.apple.mpegurl')
+        elif self.path == '/split.m3u8':
+            half = TEST_FRAGMENTS // 2
+            self.send_body('\n'.join((
+                '#EXTM3U',
+                '#EXT-X-TARGETDURATION:2',
+                '#EXT-X-MEDIA-SEQUENCE:0',
+                '#EXT-X-DISCONTINUITY-SEQUENCE:0',
+                *(f'#EXTINF:2.0,\n/split/{i}.ts' for i in range(half)),
+                '#EXT-X-DISCONTINUITY',
+                *(f'#EXTINF:2.0,\n/split/{i}.ts' for i in range(half, TEST_FRAGMENTS)),
+                '#EXT-X-ENDLIST',
+            )).encode(), 'application/vnd.apple.mpegurl')
+        elif mobj := re.fullmatch(r'/(\w+)\.m3u8', self.path):
+            self.send_body('\n'.join((
+                '#EXTM3U',
+                '#EXT-X-TARGETDURATION:2',
+                '#EXT-X-MEDIA-SEQUENCE:0',
+                *(f'#EXTINF:2.0,\n/{mobj.group(1)}/{i}.ts' for i in range(TEST_FRAGMENTS)),
+                '#EXT-X-ENDLIST',
+            )).encode(), 'application/vnd.apple.mpegurl')
+        elif mobj := re.fullmatch(r'/(\w+)/(\d+)\.ts', self.path):
+            index = int(mobj.group(2))
+            if mobj.group(1) == 'slow' and index % 3 == 0:
+                time.sleep(0.2)
+            self.send_body(fragment_content(index), 'video/mp2t')
+        else:
+            assert False
+
+
+class TestFragmentFD(unittest.TestCase):
+    def setUp(self):
+        self.httpd = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.httpd.live_refreshes = 0
+        self.httpd.live_sizes = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def download(self, params, playlist='playlist', fragments=range(TEST_FRAGMENTS), **info_dict):
+        params['logger'] = FakeLogger()
+        ydl = YoutubeDL(params)
+        downloader = HlsFD(ydl, params)
+        filename = 'testfile.ts'
+        try_rm(encodeFilename(filename))
+        try:
+            self.assertTrue(downloader.real_download(filename, {
+                'url': f'http://127.0.0.1:{self.port}/{playlist}.m3u8',
+                'ext': 'ts',
+                **info_dict,
+            }))
+            with open(encodeFilename(filename), 'rb') as f:
+                self.assertEqual(f.read(), b''.join(map(fragment_content, fragments)))
+            self.assertEqual([f for f in os.listdir() if f.startswith(f'{filename}.part')], [])
+        finally:
+            try_rm(encodeFilename(filename))
+        return ydl
+
+    def test_regular(self):
+        self.download({})
+
+    def test_concurrent(self):
+        self.download({'concurrent_fragment_downloads': 3})
+
+    def test_concurrent_out_of_order(self):
+        self.download({'concurrent_fragment_downloads': 3}, 'slow')
+        self.download({'concurrent_fragment_downloads': 3, 'fragment_window': 5}, 'slow')
+        self.download({'concurrent_fragment_downloads': 3, 'fragment_window': 1}, 'slow')
+
+    def test_adaptive(self):
+        self.download({'concurrent_fragment_downloads': 4, 'adaptive_concurrent_fragments': True}, 'slow')
+
+    def test_connection_pool(self):
+        with self.download({'concurrent_fragment_downloads': 3, 'connection_pool_size': 3}) as ydl:
+            opened, reused = ydl._request_director.handlers['Urllib'].connection_stats.snapshot()
+        # manifest + warm up + fragments
+        self.assertEqual(opened + reused, 1 + 3 + TEST_FRAGMENTS)
+        self.assertGreater(reused, 0)
+
+    def test_live(self):
+        self.download({'hls_native_live': True}, 'live', is_live=True)
+        self.assertEqual(self.httpd.live_refreshes, 4)
+        self.httpd.live_refreshes = 0
+        self.httpd.live_sizes = []
+        self.download({'hls_native_live': True, 'concurrent_fragment_downloads': 3}, 'live', is_live=True)
+        # The fragments are appended while waiting for the refresh
+        self.assertGreater(self.httpd.live_sizes[1], 0)
+
+    def test_live_interrupted(self):
+        wait = concurrent.futures.wait
+
+        def interrupting_wait(*args, timeout=None, **kwargs):
+            # Interrupt while waiting for the first refresh of the playlist
+            if timeout is not None:
+                raise KeyboardInterrupt
+            return wait(*args, timeout=timeout, **kwargs)
+
+        params = {'hls_native_live': True, 'concurrent_fragment_downloads': 3, 'logger': FakeLogger()}
+        downloader = HlsFD(YoutubeDL(params), params)
+        filename = 'testfile.ts'
+        try_rm(encodeFilename(filename))
+        try:
+            with patch('concurrent.futures.wait', interrupting_wait):
+                self.assertTrue(downloader.real_download(filename, {
+                    'url': f'http://127.0.0.1:{self.port}/live.m3u8',
+                    'ext': 'ts',
+                    'is_live': True,
+                }))
+            with open(encodeFilename(filename), 'rb') as f:
+                data = f.read()
+            # The fragments downloaded before the interruption are kept, in order
+            count = len(data) // TEST_FRAGMENT_SIZE
+            self.assertLessEqual(count, 2)
+            self.assertEqual(data, b''.join(map(fragment_content, range(count))))
+        finally:
+            try_rm(encodeFilename(filename))
+
+    def test_split_discontinuity(self):
+        # The indices match those of InfoExtractor._extract_m3u8_formats_and_subtitles, which also counts the
+        # EXT-X-DISCONTINUITY-SEQUENCE tag of non-live playlists
+        half = TEST_FRAGMENTS // 2
+        self.download({}, 'split', range(half), format_index=1)
+        self.download({}, 'split', range(half, TEST_FRAGMENTS), format_index=2)
+
+    def test_buffered(self):
+        self.download({'fragment_buffer_size': TEST_FRAGMENTS * TEST_FRAGMENT_SIZE})
+        self.download({'fragment_buffer_size': TEST_FRAGMENTS * TEST_FRAGMENT_SIZE, 'concurrent_fragment_downloads': 3})
+
+    def test_buffered_spill(self):
+        self.download({'fragment_buffer_size': TEST_FRAGMENT_SIZE // 2})
+        self.download({'fragment_buffer_size': TEST_FRAGMENT_SIZE // 2, 'concurrent_fragment_downloads': 3})
+
+
+class TestFragmentConcurrencyController(unittest.TestCase):
+    def test_limits(self):
+        controller = FragmentConcurrencyController(4)
+        self.assertEqual(controller.limit, 1)
+        self.assertTrue(controller.acquire(blocking=False))
+        self.assertFalse(controller.acquire(blocking=False))
+        controller.release()
+
+        speed = 1000
+        for _ in range(2):
+            controller._speed = speed
+            controller._round_start -= 1
+            for _ in range(controller.limit):
+                controller.report_fragment(speed * 2)
+            speed *= 2
+        self.assertEqual(controller.limit, 4)
+
+        controller.report_fragment(0)
+        self.assertEqual(controller.limit, 4)
+        controller.report_retry(HTTPError(Response(None, '', {}, status=429)))
+        self.assertEqual(controller.limit, 2)
+        controller.report_retry(HTTPError(Response(None, '', {}, status=503)))
+        controller.report_retry(HTTPError(Response(None, '', {}, status=503)))
+        self.assertEqual(controller.limit, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,8 +9,10 @@
 
 
 import http.server
+import json
 import re
 import threading
+from unittest.mock import patch
 
 from test.helper import http_server_port, try_rm
 from yt_dlp import YoutubeDL
@@ -22,6 +24,7 @@
 
 
 TEST_SIZE = 10 * 1024
+TEST_DATA = bytes(i % 251 for i in range(TEST_SIZE))
 
 
 class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
@@ -42,18 +45,18 @@ def send_content_range(self, total=None):
             if total:
                 content_range += f'/{total}'
             self.send_header('Content-Range', content_range)
-        return (end - start + 1) if valid_range else total
+        return (start, end - start + 1) if valid_range else (0, total)
 
     def serve(self, range=True, content_length=True):
         self.send_response(200)
         self.send_header('Content-Type', 'video/mp4')
-        size = TEST_SIZE
+        start, size = 0, TEST_SIZE
         if range:
-            size = self.send_content_range(TEST_SIZE)
+            start, size = self.send_content_range(TEST_SIZE)
         if content_length:
             self.send_header('Content-Length', size)
         self.end_headers()
-        self.wfile.write(b'#' * size)
+        self.wfile.write(TEST_DATA[start:start + size])
 
     def do_GET(self):
         if self.path == '/regular':
@@ -77,16 +80,18 @@ def setUp(self):
         self.server_thread.daemon = True
         self.server_thread.start()
 
-    def download(self, params, ep):
+    def download(self, params, ep, clean=True):
         params['logger'] = FakeLogger()
         ydl = YoutubeDL(params)
         downloader = HttpFD(ydl, params)
         filename = 'testfile.mp4'
-        try_rm(encodeFilename(filename))
+        if clean:
+            try_rm(encodeFilename(filename))
         self.assertTrue(downloader.real_download(filename, {
             'url': f'http://127.0.0.1:{self.port}/{ep}',
         }), ep)
-        self.assertEqual(os.path.getsize(encodeFilename(filename)), TEST_SIZE, ep)
+        with open(encodeFilename(filename), 'rb') as f:
+            self.assertEqual(f.read(), TEST_DATA, ep)
         try_rm(encodeFilename(filename))
 
     def download_all(self, params):
@@ -101,6 +106,48 @@ def test_chunked(self):
             'http_chunk_size': 1000,
         })
 
+    @patch.object(HttpFD, '_MIN_RANGE_SIZE', 1024)
+    def test_split(self):
+        self.download_all({'http_connections': 3})
+        self.download_all({'http_connections': 3, 'http_chunk_size': 1000})
+
+    @patch.object(HttpFD, '_MIN_RANGE_SIZE', 1024)
+    def test_split_resume(self):
+        filename = 'testfile.mp4'
+        with open(encodeFilename(f'{filename}.part'), 'wb') as f:
+            f.write(TEST_DATA[:1000] + bytes(TEST_SIZE - 1000))
+        with open(encodeFilename(f'{filename}.ytdl'), 'w') as f:
+            json.dump({'downloader': {'content_length': TEST_SIZE, 'ranges': [
+                {'start': 0, 'end': 4999, 'downloaded': 1000},
+                {'start': 5000, 'end': TEST_SIZE - 1, 'downloaded': 0},
+            ]}}, f)
+        self.download({'http_connections': 2}, 'regular', clean=False)
+        self.assertFalse(os.path.exists(encodeFilename(f'{filename}.ytdl')))
+
+    @patch.object(HttpFD, '_MIN_RANGE_SIZE', 1024)
+    def test_split_state(self):
+        filename = 'testfile.mp4'
+        saved = []
+
+        def check_state(downloader, status, info_dict):
+            if status['status'] != 'downloading':
+                return
+            # The state is saved right before the progress is reported
+            with open(encodeFilename(f'{filename}.ytdl')) as f:
+                ranges = json.load(f)['downloader']['ranges']
+            with open(encodeFilename(f'{filename}.part'), 'rb') as f:
+                data = f.read()
+            for rng in ranges:
+                end = rng['start'] + rng['downloaded']
+                self.assertEqual(data[rng['start']:end], TEST_DATA[rng['start']:end])
+            saved.append(sum(rng['downloaded'] for rng in ranges))
+
+        clock = iter(range(0, 1000000, 2))
+        with patch('time.time', lambda: next(clock)), patch.object(HttpFD, '_hook_progress', check_state):
+            self.download({'http_connections': 2}, 'regular')
+        # The threads read the clock in any order, so only the first progress report is sure to save the state
+        self.assertTrue(saved)
+
 
 if __name__ == '__main__':
     unittest.main()
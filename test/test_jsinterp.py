@@ -431,6 +431,17 @@ def test_slice(self):
         self._test('function f(){return "012345678".slice(-1, 1)}', '')
         self._test('function f(){return "012345678".slice(-3, -1)}', '67')
 
+    def test_separate_cache(self):
+        jsi = JSInterpreter('function f(a){var b = a.split(""); b.reverse(); return b.join("")}')
+        self._test(jsi, 'cba', args=['abc'])
+        misses = jsi._cached_separate.cache_info().misses
+        self._test(jsi, 'fed', args=['def'])
+        self.assertEqual(jsi._cached_separate.cache_info().misses, misses)
+
+        jsi = JSInterpreter('function f(a){return a} function g(){return 1}' + ' ' * 10000)
+        self.assertEqual(jsi.extract_function_code('f'), (['a'], 'return a'))
+        self.assertEqual(jsi._cached_separate.cache_info().currsize, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -680,6 +680,13 @@ def test_read(self, handler):
             assert res.read().decode().endswith('\n\n')
             assert res.read() == b''
 
+    @pytest.mark.skip_handler('CurlCFFI', 'not supported by curl-cffi')
+    def test_connection_reuse(self, handler):
+        with handler(connection_pool_size=2) as rh:
+            for _ in range(3):
+                assert validate_and_send(rh, Request(f'http://127.0.0.1:{self.http_port}/headers')).read()
+            assert rh.connection_stats.snapshot() == (1, 2)
+
     def test_request_disable_proxy(self, handler):
         for proxy_proto in handler._SUPPORTED_PROXY_SCHEMES or ['http']:
             # Given the handler is configured with a proxy
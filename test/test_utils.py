@@ -14,6 +14,7 @@
 import io
 import itertools
 import json
+import re
 import subprocess
 import xml.etree.ElementTree
 
@@ -714,13 +715,16 @@ def get_page(pagenum):
                 upto = min(size, pagenum * pagesize + pagesize)
                 yield from range(firstid, upto)
 
-            pl = OnDemandPagedList(get_page, pagesize)
-            got = pl.getslice(*sliceargs)
-            self.assertEqual(got, expected)
+            for prefetch in (0, 2):
+                pl = OnDemandPagedList(get_page, pagesize)
+                pl.prefetch(prefetch)
+                got = pl.getslice(*sliceargs)
+                self.assertEqual(got, expected)
 
-            iapl = InAdvancePagedList(get_page, size // pagesize + 1, pagesize)
-            got = iapl.getslice(*sliceargs)
-            self.assertEqual(got, expected)
+                iapl = InAdvancePagedList(get_page, size // pagesize + 1, pagesize)
+                iapl.prefetch(prefetch)
+                got = iapl.getslice(*sliceargs)
+                self.assertEqual(got, expected)
 
         testPL(5, 2, (), [0, 1, 2, 3, 4])
         testPL(5, 2, (1,), [1, 2, 3, 4])
@@ -731,6 +735,29 @@ def get_page(pagenum):
         testPL(5, 2, (2, 99), [2, 3, 4])
         testPL(5, 2, (20, 99), [])
 
+    def test_paged_list_prefetch(self):
+        fetched = []
+
+        def get_page(pagenum):
+            fetched.append(pagenum)
+            if pagenum == 3:
+                raise ValueError('no more pages')
+            return range(pagenum * 10, pagenum * 10 + (5 if pagenum == 2 else 10))
+
+        pl = OnDemandPagedList(get_page, 10)
+        pl.prefetch(4, cache_size=2)
+        self.assertEqual(pl.getslice(), list(range(25)))
+        self.assertLessEqual(set(fetched), set(range(6)))
+        self.assertEqual(sorted(fetched)[:3], [0, 1, 2])
+        self.assertEqual(list(pl._cache), [1, 2])
+        self.assertEqual(pl[3], 3)
+        self.assertEqual(fetched.count(0), 2)
+
+        # Errors of pages that are not consumed are ignored
+        pl = OnDemandPagedList(get_page, 10)
+        pl.prefetch(2)
+        self.assertEqual(pl.getslice(20), list(range(20, 25)))
+
     def test_read_batch_urls(self):
         f = io.StringIO('''\xef\xbb\xbf foo
             bar\r
@@ -1532,6 +1559,14 @@ def test_match_str(self):
         self.assertTrue(match_str('!x', {'id': 'foo'}, True))
         self.assertFalse(match_str('x', {'id': 'foo'}, False))
 
+        # Parsed filters are reused
+        for value, expected in ((100, True), (99, False), ('100', True), (None, True)):
+            self.assertEqual(bool(match_str('x>=?100 & !is_live', {'x': value})), expected)
+        self.assertRaises(ValueError, match_str, 'x*=100', {'x': 1})
+        self.assertTrue(match_str('x*=100', {'x': '1000'}))
+        self.assertFalse(match_str('x~=(', {}))
+        self.assertRaises(re.error, match_str, 'x~=(', {'x': 'a'})
+
     def test_parse_dfxp_time_expr(self):
         self.assertEqual(parse_dfxp_time_expr(None), None)
         self.assertEqual(parse_dfxp_time_expr(''), None)
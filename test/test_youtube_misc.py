@@ -8,7 +8,15 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-from yt_dlp.extractor import YoutubeIE
+import io
+import itertools
+import shutil
+import threading
+from unittest.mock import patch
+
+from test.helper import FakeYDL
+from yt_dlp.extractor import YoutubeIE, YoutubeTabIE
+from yt_dlp.networking import Response
 
 
 class TestYoutubeMisc(unittest.TestCase):
@@ -21,6 +29,182 @@ def test_youtube_extract(self):
         assertExtractId('http://www.youtube.com/watch?v=BaW_jenozKcsharePLED17F32AD9753930', 'BaW_jenozKc')
         assertExtractId('BaW_jenozKc', 'BaW_jenozKc')
 
+    def test_extract_player_responses(self):
+        requested, android_requested = [], threading.Event()
+
+        def extract_player_response(client, video_id, *args):
+            requested.append(client)
+            if client == 'android':
+                android_requested.set()
+            elif client == 'ios':
+                # The requests of the other clients are made while this one is pending
+                self.assertTrue(android_requested.wait(5))
+            return {
+                'videoDetails': {'videoId': 'other' if client == 'mweb' else video_id},
+                'playabilityStatus': {'reason': 'age-restricted' if client == 'ios' else None},
+                'streamingData': {'formats': [{'itag': 18}]},
+                'client': client,
+            }
+
+        ydl = FakeYDL({'extractor_args': {'youtube': {'player_skip': ['js']}}})
+        ydl.report_warning = lambda *_, **__: None
+        ie = YoutubeIE(ydl)
+        ie._extract_player_response = extract_player_response
+        prs, player_url = ie._extract_player_responses(['ios', 'mweb', 'android'], 'vid', None, {}, {})
+        self.assertEqual(sorted(requested), ['android', 'ios', 'mweb', 'tv_embedded'])
+        # The fallback client of ios is processed right after it; mweb returned another video
+        self.assertEqual([pr['client'] for pr in prs], ['ios', 'tv_embedded', 'android'])
+        self.assertEqual(prs[0]['streamingData']['formats'][0]['__yt_dlp_client'], 'IOS')
+        self.assertIsNone(player_url)
+
+    def test_comment_entries(self):
+        def continuation(token):
+            return {'continuationItemRenderer': {'continuationEndpoint': {'continuationCommand': {'token': token}}}}
+
+        def thread(comment_id, replies=None):
+            return {'commentThreadRenderer': {
+                'comment': {'commentRenderer': {'commentId': comment_id}},
+                **({'replies': {'commentRepliesRenderer': {'contents': [continuation(replies)]}}} if replies else {}),
+            }}
+
+        def items(*items):
+            return {'onResponseReceivedEndpoints': [{'appendContinuationItemsAction': {'continuationItems': list(items)}}]}
+
+        sort_item = {'serviceEndpoint': {'continuationCommand': {'token': 'sorted'}}}
+        responses = {
+            'root': items({'commentsHeaderRenderer': {'sortMenu': {'sortFilterSubMenuRenderer': {
+                'subMenuItems': [sort_item, sort_item]}}}}),
+            'sorted': items(thread('c1', 'r1'), thread('c2'), thread('c3', 'r3'), continuation('page2')),
+            'page2': items(thread('c4', 'r4')),
+            'r1': items({'commentRenderer': {'commentId': 'r1a'}}, {'commentRenderer': {'commentId': 'r1b'}},
+                        continuation('r1p2')),
+            'r1p2': items({'commentRenderer': {'commentId': 'r1c'}}),
+            'r3': items({'commentRenderer': {'commentId': 'r3a'}}),
+            'r4': items({'commentRenderer': {'commentId': 'r4a'}}),
+        }
+        requested, r3_requested, page2_requested = [], threading.Event(), threading.Event()
+
+        def extract_response(query, **kwargs):
+            token = query['continuation']
+            requested.append(token)
+            if token == 'r3':
+                r3_requested.set()
+            elif token == 'page2':
+                page2_requested.set()
+            elif token == 'r1':
+                # The reply threads and the next page of comments are downloaded concurrently
+                self.assertTrue(r3_requested.wait(5))
+                self.assertTrue(page2_requested.wait(5))
+            return responses[token]
+
+        def comment_ids(max_comments):
+            requested.clear()
+            ie = YoutubeIE(FakeYDL({'extractor_args': {'youtube': {'max_comments': max_comments}}}))
+            ie._extract_response = extract_response
+            return [comment['id'] for comment in ie._comment_entries({'contents': [continuation('root')]}, {}, 'vid')]
+
+        self.assertEqual(comment_ids([]), ['c1', 'r1a', 'r1b', 'r1c', 'c2', 'c3', 'r3a', 'c4', 'r4a'])
+        self.assertEqual(sorted(requested), ['page2', 'r1', 'r1p2', 'r3', 'r4', 'root', 'sorted'])
+        self.assertEqual(comment_ids(['all', 'all', 'all', '1']), ['c1', 'r1a', 'c2', 'c3', 'r3a', 'c4', 'r4a'])
+        self.assertNotIn('r1p2', requested)
+        self.assertEqual(comment_ids(['all', 'all', '2']), ['c1', 'r1a', 'r1b', 'c2', 'c3', 'c4'])
+
+        # The reply threads of a page share the remaining max-replies
+        responses['sorted'] = items(thread('c1', 'r1'), thread('c2', 'r2'))
+        responses['r2'] = items({'commentRenderer': {'commentId': 'r2a'}})
+        with patch.object(YoutubeIE, '_COMMENT_REPLIES_CONCURRENCY', 0):
+            r3_requested.set()
+            page2_requested.set()
+            self.assertEqual(comment_ids(['all', 'all', '2']), ['c1', 'r1a', 'r1b', 'c2'])
+        self.assertEqual(requested, ['root', 'sorted', 'r1'])
+
+    def test_tab_entries_prefetch(self):
+        def items(page, next_page=None):
+            contents = [
+                {'richItemRenderer': {'content': {'videoRenderer': {'videoId': f'{page}_{i}'}}}} for i in range(2)]
+            if next_page:
+                contents.append({'continuationItemRenderer': {
+                    'continuationEndpoint': {'continuationCommand': {'token': next_page}}}})
+            return contents
+
+        tab = {'content': {'richGridRenderer': {'contents': items('p0', 'p1')}}}
+        # p4 continues with p2 again, which is detected as feed looping
+        pages = {'p1': 'p2', 'p2': 'p3', 'p3': 'p4', 'p4': 'p2'}
+        requested, p3_requested = [], threading.Event()
+
+        def extract_response(query, **kwargs):
+            page = query['continuation']
+            requested.append(page)
+            if page == 'p3':
+                p3_requested.set()
+            return {'onResponseReceivedActions': [{
+                'appendContinuationItemsAction': {'continuationItems': items(page, pages[page])}}]}
+
+        for prefetch in (0, 2):
+            requested.clear()
+            p3_requested.clear()
+            ie = YoutubeTabIE(FakeYDL({'playlist_page_prefetch': prefetch}))
+            ie._extract_response = extract_response
+            entries = ie._entries(tab, 'tab', {}, None, None)
+            ids = [entry['id'] for entry in itertools.islice(entries, 3)]
+            # The pages after the current one are only requested in advance when prefetching
+            self.assertEqual(p3_requested.wait(5 if prefetch else 0), bool(prefetch))
+            self.assertEqual(requested, ['p1', 'p2', 'p3'][:1 + prefetch])
+            ids.extend(entry['id'] for entry in entries)
+            self.assertEqual(ids, [f'p{page}_{i}' for page in range(5) for i in range(2)])
+            self.assertEqual(requested, ['p1', 'p2', 'p3', 'p4'])
+
+    def test_player_cache(self):
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'youtube_cache_test')
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        player_url = 'https://www.youtube.com/s/player/0123abcd/player_ias.vflset/en_US/base.js'
+        downloads = []
+
+        def download_webpage(url, *args, **kwargs):
+            downloads.append(url)
+            return 'var a = {signatureTimestamp: 19876};'
+
+        def youtube_ie():
+            ie = YoutubeIE(FakeYDL({'cachedir': cache_dir}))
+            ie._download_webpage = download_webpage
+            return ie
+
+        self.assertEqual(youtube_ie()._extract_signature_timestamp('vid', player_url), 19876)
+        self.assertEqual(downloads, [player_url])
+        # A new process loads the timestamp and the player from the cache
+        self.assertEqual(youtube_ie()._extract_signature_timestamp('vid', player_url), 19876)
+        self.assertEqual(youtube_ie()._load_player('vid', player_url), 'var a = {signatureTimestamp: 19876};')
+        self.assertEqual(downloads, [player_url])
+
+        ie = youtube_ie()
+        cached = ie.cache.load('youtube-player', '0123abcd')
+        ie.cache.store('youtube-player', '0123abcd', {**cached, 'code': 'corrupted'})
+        ie._load_player('vid', player_url)
+        self.assertEqual(downloads, [player_url, player_url])
+        youtube_ie()._load_player('vid', player_url.replace('en_US', 'fr_FR'))
+        self.assertEqual(len(downloads), 3)
+
+    def test_ytcfg_revalidation(self):
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'youtube_cache_test')
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        requests = []
+
+        def download_webpage_handle(url, video_id, headers={}, expected_status=None, **kwargs):
+            requests.append(headers)
+            if headers.get('If-None-Match') == '"v1"':
+                return '', Response(io.BytesIO(), url, {}, status=304)
+            return (f'<script>ytcfg.set({{"INNERTUBE_CLIENT_VERSION": "{len(requests)}"}});</script>',
+                    Response(io.BytesIO(), url, {'ETag': '"v1"'}))
+
+        def download_ytcfg():
+            ie = YoutubeIE(FakeYDL({'cachedir': cache_dir}))
+            ie._download_webpage_handle = download_webpage_handle
+            return ie._download_ytcfg('web', 'vid')
+
+        self.assertEqual(download_ytcfg(), {'INNERTUBE_CLIENT_VERSION': '1'})
+        self.assertEqual(download_ytcfg(), {'INNERTUBE_CLIENT_VERSION': '1'})
+        self.assertEqual(requests, [{}, {'If-None-Match': '"v1"'}])
+
 
 if __name__ == '__main__':
     unittest.main()
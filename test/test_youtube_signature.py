@@ -10,8 +10,10 @@
 
 import contextlib
 import re
+import shutil
 import string
 import urllib.request
+from unittest.mock import patch
 
 from test.helper import FakeYDL, is_download_test
 from yt_dlp.extractor import YoutubeIE
@@ -224,6 +226,39 @@ def tearDown(self):
                 os.remove(f)
 
 
+class TestNsigResultCache(unittest.TestCase):
+    PLAYER_URL = 'https://www.youtube.com/s/player/deadbeef/player_ias.vflset/en_US/base.js'
+
+    def setUp(self):
+        TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+        self.test_dir = os.path.join(TEST_DIR, 'testdata', 'nsig_cache_test')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_nsig_result_cache(self):
+        ie = YoutubeIE(FakeYDL({'cachedir': self.test_dir}))
+        ie.cache.store('youtube-nsig', 'deadbeef', [['a'], 'return a.split("").reverse().join("")'])
+        self.assertEqual(ie._decrypt_nsig('abc', None, self.PLAYER_URL), 'cba')
+
+        ie = YoutubeIE(FakeYDL({'cachedir': self.test_dir}))
+        with patch.object(YoutubeIE, '_extract_n_function_code', side_effect=AssertionError):
+            self.assertEqual(ie._decrypt_nsig('abc', None, self.PLAYER_URL), 'cba')
+
+        with patch.object(YoutubeIE, '_NSIG_RESULTS_CACHE_SIZE', 2):
+            for n in ('def', 'ghi'):
+                ie._decrypt_nsig(n, None, self.PLAYER_URL)
+        self.assertEqual(ie.cache.load('youtube-nsig-results', 'deadbeef'), {'def': 'fed', 'ghi': 'ihg'})
+
+        # The other players are only pruned when the results of a new player are stored
+        ie.cache.store('youtube-nsig', 'cafebabe', [['a'], 'return a.split("").reverse().join("")'])
+        with patch.object(ie.cache, 'prune') as prune:
+            ie._decrypt_nsig('jkl', None, self.PLAYER_URL)
+            prune.assert_not_called()
+            ie._decrypt_nsig('abc', None, self.PLAYER_URL.replace('deadbeef', 'cafebabe'))
+            prune.assert_called_once_with('youtube-nsig-results', YoutubeIE._NSIG_RESULTS_CACHE_PLAYERS)
+
+
 def t_factory(name, sig_func, url_pattern):
     def make_tfunc(url, sig_input, expected_sig):
         m = url_pattern.match(url)
@@ -1,4 +1,5 @@
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime as dt
@@ -19,18 +20,22 @@
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import tokenize
 import traceback
 import unicodedata
 
+from .archive import DownloadArchive
 from .cache import Cache
 from .compat import urllib  # isort: split
 from .compat import compat_os_name, urllib_req_to_req
 from .cookies import LenientSimpleCookie, load_cookies
+from .dependencies import sqlite3
 from .downloader import FFmpegFD, get_suitable_downloader, shorten_protocol_name
 from .downloader.rtmp import rtmpdump_version
 from .extractor import gen_extractor_classes, get_info_extractor
+from .extractor._dispatch import ExtractorIndex
 from .extractor.common import UnsupportedURLIE
 from .extractor.openload import PhantomJSwrapper
 from .minicurses import format_text
@@ -234,6 +239,11 @@ class YoutubeDL:
     forcejson:         Force printing info_dict as JSON.
     dump_single_json:  Force printing the info_dict of the whole playlist
                        (or video) as a single JSON line.
+    stream_single_json: With dump_single_json, print the entries of playlists
+                       as they are processed instead of keeping them in memory.
+                       The "entries" are then printed before the other fields,
+                       and the playlist postprocessors and infojson only see
+                       the unresolved entries
     force_write_download_archive: Force writing download archive regardless
                        of 'skip_download' or 'simulate'.
     simulate:          Do not download the video files. If unset (or None),
@@ -281,6 +291,13 @@ class YoutubeDL:
     playlist_items:    Specific indices of playlist to download.
     playlistrandom:    Download playlist items in random order.
     lazy_playlist:     Process playlist entries as they are received.
+    concurrent_urls:   Number of URLs passed to download() to process in parallel
+                       threads sharing this instance (default: 1)
+    playlist_prefetch: Number of upcoming playlist entries that may be extracted
+                       in parallel while the current one is processed (default: 0).
+                       Their extractors must be safe to run concurrently
+    playlist_page_prefetch: Number of pages of paged playlists to download in
+                       advance while the current page is processed (default: 0)
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            Log messages to a logging.Logger instance.
@@ -314,6 +331,8 @@ class YoutubeDL:
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    cache_backend:     How the cache is stored. One of "file" (default), one file
+                       per entry; or "sqlite", a single database in the cachedir
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -328,6 +347,9 @@ class YoutubeDL:
                        downloaded. None for no limit.
     download_archive:  A set, or the name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded again.
+    download_archive_index: Look up the download_archive file through an SQLite
+                       index (FILE.sqlite3) instead of loading it into memory.
+                       IDs recorded in quick succession are appended to the file in batches
     break_on_existing: Stop the download process after attempting to download a
                        file that is in the archive.
     break_per_url:     Whether break_on_reject and break_on_existing
@@ -352,6 +374,10 @@ class YoutubeDL:
     geo_verification_proxy:  URL of the proxy to use for IP address verification
                        on geo-restricted sites.
     socket_timeout:    Time to wait for unresponsive hosts, in seconds
+    connection_pool_size: Maximum number of idle HTTP connections to keep open
+                       per host for reuse. Enables keep-alive for the urllib
+                       request handler. Native HLS/DASH downloads also open
+                       connections to the fragment host in advance
     bidi_workaround:   Work around buggy terminals without bidirectional text
                        support, using fridibi
     debug_printtraffic:Print out sent and received HTTP traffic
@@ -496,8 +522,9 @@ class YoutubeDL:
     the downloader (see yt_dlp/downloader/common.py):
     nopart, updatetime, buffersize, ratelimit, throttledratelimit, min_filesize,
     max_filesize, test, noresizebuffer, retries, file_access_retries, fragment_retries,
-    continuedl, xattr_set_filesize, hls_use_mpegts, http_chunk_size,
-    external_downloader_args, concurrent_fragment_downloads, progress_delta.
+    continuedl, xattr_set_filesize, hls_use_mpegts, hls_native_live, http_chunk_size, http_connections,
+    external_downloader_args, concurrent_fragment_downloads, fragment_window,
+    adaptive_concurrent_fragments, fragment_buffer_size, progress_delta.
 
     The following options are used by the post processors:
     ffmpeg_location:   Location of the ffmpeg/avconv binary; either the path
@@ -609,6 +636,11 @@ class YoutubeDL:
         'creator': 'creators',
         'genre': 'genres',
     }
+    # Number of URLs to match against the extractors one by one before indexing them
+    _EXTRACTOR_INDEX_THRESHOLD = 10
+    # Number of formats that are tested in parallel by _check_formats
+    _FORMAT_TEST_CONCURRENCY = 4
+
     _format_selection_exts = {
         'audio': set(MEDIA_EXTENSIONS.common_audio),
         'video': {*MEDIA_EXTENSIONS.common_video, '3gp'},
@@ -625,6 +657,9 @@ def __init__(self, params=None, auto_init=True):
         self.params = params
         self._ies = {}
         self._ies_instances = {}
+        self._ies_index, self._ies_lookups = None, 0
+        self._format_sorters = {}  # by the sort fields of the extractor
+        self._prefetched_entries = {}
         self._pps = {k: [] for k in POSTPROCESS_WHEN}
         self._printed_messages = set()
         self._first_webpage_request = True
@@ -634,8 +669,10 @@ def __init__(self, params=None, auto_init=True):
         self._download_retcode = 0
         self._num_downloads = 0
         self._num_videos = 0
-        self._playlist_level = 0
-        self._playlist_urls = set()
+        # State of the URL that is being processed by the current thread, see download
+        self._local = threading.local()
+        self._lock = threading.Lock()  # guards the state shared between those threads
+        self._write_lock = threading.RLock()  # keeps the messages of the threads whole
         self.cache = Cache(self)
         self.__header_cookies = []
 
@@ -816,6 +853,12 @@ def preload_download_archive(fn):
                 return archive
             elif not is_path_like(fn):
                 return fn
+            elif self.params.get('download_archive_index'):
+                if sqlite3:
+                    return DownloadArchive(self, fn)
+                self.report_warning(
+                    'Cannot index the download archive without sqlite3 support. '
+                    'Please use a Python interpreter compiled with sqlite3 support')
 
             self.write_debug(f'Loading archive file {fn!r}')
             try:
@@ -829,6 +872,26 @@ def preload_download_archive(fn):
 
         self.archive = preload_download_archive(self.params.get('download_archive'))
 
+    @property
+    def _playlist_level(self):
+        return getattr(self._local, 'playlist_level', 0)
+
+    @_playlist_level.setter
+    def _playlist_level(self, value):
+        self._local.playlist_level = value
+
+    def _check_interrupted(self):
+        """Stop the URL of this thread once the concurrent downloads are interrupted, see __download_concurrently"""
+        interrupted = getattr(self._local, 'interrupted', None)
+        if interrupted and interrupted.is_set():
+            raise KeyboardInterrupt
+
+    @property
+    def _playlist_urls(self):
+        if not hasattr(self._local, 'playlist_urls'):
+            self._local.playlist_urls = set()
+        return self._local.playlist_urls
+
     def warn_if_short_id(self, argv):
         # short YouTube ID starting with dash?
         idxs = [
@@ -847,11 +910,23 @@ def warn_if_short_id(self, argv):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         ie_key = ie.ie_key()
+        if ie_key not in self._ies:
+            self._ies_index = None
         self._ies[ie_key] = ie
         if not isinstance(ie, type):
             self._ies_instances[ie_key] = ie
             ie.set_downloader(self)
 
+    def _suitable_ies(self, url):
+        """Yield (ie_key, ie) of the extractors that are suitable for the URL, in order"""
+        self._ies_lookups += 1
+        if self._ies_index is None and self._ies_lookups > self._EXTRACTOR_INDEX_THRESHOLD:
+            self._ies_index = ExtractorIndex(self._ies.items())
+        ies = self._ies_index.candidates(url) if self._ies_index else self._ies.items()
+        for ie_key, ie in ies:
+            if ie.suitable(url):
+                yield ie_key, ie
+
     def get_info_extractor(self, ie_key):
         """
         Get an instance of an IE with name ie_key, it will try to get one from
@@ -921,7 +996,8 @@ def _write_string(self, message, out=None, only_once=False):
             if message in self._printed_messages:
                 return
             self._printed_messages.add(message)
-        write_string(message, out=out, encoding=self.params.get('encoding'))
+        with self._write_lock:
+            write_string(message, out=out, encoding=self.params.get('encoding'))
 
     def to_stdout(self, message, skip_eol=False, quiet=None):
         """Print message to stdout"""
@@ -993,6 +1069,9 @@ def __exit__(self, *args):
 
     def close(self):
         self.save_cookies()
+        self.cache.close()
+        if isinstance(getattr(self, 'archive', None), DownloadArchive):
+            self.archive.close()
         if '_request_director' in self.__dict__:
             self._request_director.close()
             del self._request_director
@@ -1165,6 +1244,7 @@ def _outtmpl_expandpath(outtmpl):
         return expand_path(outtmpl).replace(sep, '')
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def escape_outtmpl(outtmpl):
         """ Escape any remaining strings like %s, %abc% etc. """
         return re.sub(
@@ -1192,6 +1272,108 @@ def _copy_infodict(info_dict):
         info_dict.pop('__pending_error', None)
         return info_dict
 
+    # Math operators of output template fields
+    _OUTTMPL_MATH_FUNCTIONS = {
+        '+': float.__add__,
+        '-': float.__sub__,
+        '*': float.__mul__,
+    }
+    # Field is of the form key1.key2...
+    # where keys (except first) can be string, int, slice or "{field, ...}"
+    _OUTTMPL_FIELD_INNER_RE = r'(?:\w+|%(num)s|%(num)s?(?::%(num)s?){1,2})' % {'num': r'(?:-?\d+)'}  # noqa: UP031
+    _OUTTMPL_FIELD_RE = r'\w*(?:\.(?:%(inner)s|{%(field)s(?:,%(field)s)*}))*' % {  # noqa: UP031
+        'inner': _OUTTMPL_FIELD_INNER_RE,
+        'field': rf'\w*(?:\.{_OUTTMPL_FIELD_INNER_RE})*',
+    }
+    _OUTTMPL_MATH_FIELD_RE = rf'(?:{_OUTTMPL_FIELD_RE}|-?{NUMBER_RE})'
+    _OUTTMPL_MATH_OPERATORS_RE = r'(?:{})'.format('|'.join(map(re.escape, _OUTTMPL_MATH_FUNCTIONS.keys())))
+    _OUTTMPL_INTERNAL_FORMAT_RE = re.compile(rf'''(?xs)
+        (?P<negate>-)?
+        (?P<fields>{_OUTTMPL_FIELD_RE})
+        (?P<maths>(?:{_OUTTMPL_MATH_OPERATORS_RE}{_OUTTMPL_MATH_FIELD_RE})*)
+        (?:>(?P<strf_format>.+?))?
+        (?P<remaining>
+            (?P<alternate>(?<!\\),[^|&)]+)?
+            (?:&(?P<replacement>.*?))?
+            (?:\|(?P<default>.*?))?
+        )$''')
+    _OUTTMPL_EXTERNAL_FORMAT_RE = re.compile(STR_FORMAT_RE_TMPL.format('[^)]*', f'[{STR_FORMAT_TYPES}ljhqBUDS]'))
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_outtmpl(cls, outtmpl):
+        """
+        Split an output template into its literal text and its fields, so that prepare_outtmpl
+        need not parse the same template again. A field is a tuple of
+        (prefix, key, format, conversion, alternatives), where alternatives are the groupdicts
+        of _OUTTMPL_INTERNAL_FORMAT_RE for the key and each of its ","-separated fallbacks
+        """
+        parts, literal, pos = [], [], 0
+        for outer_mobj in cls._OUTTMPL_EXTERNAL_FORMAT_RE.finditer(outtmpl):
+            literal.append(outtmpl[pos:outer_mobj.start()])
+            pos = outer_mobj.end()
+            if not outer_mobj.group('has_key'):
+                literal.append(outer_mobj.group(0))
+                continue
+            alternatives = []
+            mobj = cls._OUTTMPL_INTERNAL_FORMAT_RE.match(outer_mobj.group('key'))
+            while mobj:
+                alternatives.append(mobj.groupdict())
+                mobj = mobj.group('alternate') and cls._OUTTMPL_INTERNAL_FORMAT_RE.match(mobj.group('remaining')[1:])
+            parts.extend((
+                ''.join(literal),
+                (*outer_mobj.group('prefix', 'key', 'format', 'conversion'), tuple(alternatives))))
+            literal.clear()
+        literal.append(outtmpl[pos:])
+        parts.append(''.join(literal))
+        return tuple(part for part in parts if part != '')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _outtmpl_field_path(fields):
+        """The traversal path for the fields of an output template key, e.g. "formats.0.{url,height}" """
+        def _from_user_input(field):
+            if field == ':':
+                return ...
+            elif ':' in field:
+                return slice(*map(int_or_none, field.split(':')))
+            elif int_or_none(field) is not None:
+                return int(field)
+            return field
+
+        fields = [f for x in re.split(r'\.({.+?})\.?', fields)
+                  for f in ([x] if x.startswith('{') else x.split('.'))]
+        for i in (0, -1):
+            if fields and not fields[i]:
+                fields.pop(i)
+
+        for i, f in enumerate(fields):
+            if not f.startswith('{'):
+                fields[i] = _from_user_input(f)
+                continue
+            assert f.endswith('}'), f'No closing brace for {f} in {fields}'
+            fields[i] = {k: list(map(_from_user_input, k.split('.'))) for k in f[1:-1].split(',')}
+
+        return tuple(fields)
+
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def _outtmpl_maths(cls, offset_key):
+        """Parse the maths of an output template key into (operator, multiplier, number or field) tuples"""
+        maths, operator = [], None
+        while offset_key:
+            item = re.match(
+                cls._OUTTMPL_MATH_FIELD_RE if operator else cls._OUTTMPL_MATH_OPERATORS_RE,
+                offset_key).group(0)
+            offset_key = offset_key[len(item):]
+            if operator is None:
+                operator = cls._OUTTMPL_MATH_FUNCTIONS[item]
+                continue
+            item, multiplier = (item[1:], -1) if item[0] == '-' else (item, 1)
+            maths.append((operator, multiplier, item))
+            operator = None
+        return tuple(maths)
+
     def prepare_outtmpl(self, outtmpl, info_dict, sanitize=False):
         """ Make the outtmpl and info_dict suitable for substitution: ydl.escape_outtmpl(outtmpl) % info_dict
         @param sanitize    Whether to sanitize the output as a filename.
@@ -1205,8 +1387,10 @@ def prepare_outtmpl(self, outtmpl, info_dict, sanitize=False):
             formatSeconds(info_dict['duration'], '-' if sanitize else ':')
             if info_dict.get('duration', None) is not None
             else None)
-        info_dict['autonumber'] = int(self.params.get('autonumber_start', 1) - 1 + self._num_downloads)
-        info_dict['video_autonumber'] = self._num_videos
+        # The numbers of the video that is being processed by this thread, see process_video_result and process_info
+        info_dict['autonumber'] = int(self.params.get('autonumber_start', 1) - 1
+                                      + getattr(self._local, 'num_downloads', self._num_downloads))
+        info_dict['video_autonumber'] = getattr(self._local, 'num_videos', self._num_videos)
         if info_dict.get('resolution') is None:
             info_dict['resolution'] = self.format_resolution(info_dict, default=None)
 
@@ -1218,88 +1402,26 @@ def prepare_outtmpl(self, outtmpl, info_dict, sanitize=False):
             'autonumber': self.params.get('autonumber_size') or 5,
         }
 
-        TMPL_DICT = {}
-        EXTERNAL_FORMAT_RE = re.compile(STR_FORMAT_RE_TMPL.format('[^)]*', f'[{STR_FORMAT_TYPES}ljhqBUDS]'))
-        MATH_FUNCTIONS = {
-            '+': float.__add__,
-            '-': float.__sub__,
-            '*': float.__mul__,
-        }
-        # Field is of the form key1.key2...
-        # where keys (except first) can be string, int, slice or "{field, ...}"
-        FIELD_INNER_RE = r'(?:\w+|%(num)s|%(num)s?(?::%(num)s?){1,2})' % {'num': r'(?:-?\d+)'}  # noqa: UP031
-        FIELD_RE = r'\w*(?:\.(?:%(inner)s|{%(field)s(?:,%(field)s)*}))*' % {  # noqa: UP031
-            'inner': FIELD_INNER_RE,
-            'field': rf'\w*(?:\.{FIELD_INNER_RE})*',
-        }
-        MATH_FIELD_RE = rf'(?:{FIELD_RE}|-?{NUMBER_RE})'
-        MATH_OPERATORS_RE = r'(?:{})'.format('|'.join(map(re.escape, MATH_FUNCTIONS.keys())))
-        INTERNAL_FORMAT_RE = re.compile(rf'''(?xs)
-            (?P<negate>-)?
-            (?P<fields>{FIELD_RE})
-            (?P<maths>(?:{MATH_OPERATORS_RE}{MATH_FIELD_RE})*)
-            (?:>(?P<strf_format>.+?))?
-            (?P<remaining>
-                (?P<alternate>(?<!\\),[^|&)]+)?
-                (?:&(?P<replacement>.*?))?
-                (?:\|(?P<default>.*?))?
-            )$''')
-
-        def _from_user_input(field):
-            if field == ':':
-                return ...
-            elif ':' in field:
-                return slice(*map(int_or_none, field.split(':')))
-            elif int_or_none(field) is not None:
-                return int(field)
-            return field
-
-        def _traverse_infodict(fields):
-            fields = [f for x in re.split(r'\.({.+?})\.?', fields)
-                      for f in ([x] if x.startswith('{') else x.split('.'))]
-            for i in (0, -1):
-                if fields and not fields[i]:
-                    fields.pop(i)
-
-            for i, f in enumerate(fields):
-                if not f.startswith('{'):
-                    fields[i] = _from_user_input(f)
-                    continue
-                assert f.endswith('}'), f'No closing brace for {f} in {fields}'
-                fields[i] = {k: list(map(_from_user_input, k.split('.'))) for k in f[1:-1].split(',')}
-
-            return traverse_obj(info_dict, fields, traverse_string=True)
-
         def get_value(mdict):
             # Object traversal
-            value = _traverse_infodict(mdict['fields'])
+            value = traverse_obj(info_dict, self._outtmpl_field_path(mdict['fields']), traverse_string=True)
             # Negative
             if mdict['negate']:
                 value = float_or_none(value)
                 if value is not None:
                     value *= -1
             # Do maths
-            offset_key = mdict['maths']
-            if offset_key:
+            if mdict['maths']:
                 value = float_or_none(value)
-                operator = None
-                while offset_key:
-                    item = re.match(
-                        MATH_FIELD_RE if operator else MATH_OPERATORS_RE,
-                        offset_key).group(0)
-                    offset_key = offset_key[len(item):]
-                    if operator is None:
-                        operator = MATH_FUNCTIONS[item]
-                        continue
-                    item, multiplier = (item[1:], -1) if item[0] == '-' else (item, 1)
+                for operator, multiplier, item in self._outtmpl_maths(mdict['maths']):
                     offset = float_or_none(item)
                     if offset is None:
-                        offset = float_or_none(_traverse_infodict(item))
+                        offset = float_or_none(traverse_obj(
+                            info_dict, self._outtmpl_field_path(item), traverse_string=True))
                     try:
                         value = operator(value, multiplier * offset)
                     except (TypeError, ZeroDivisionError):
                         return None
-                    operator = None
             # Datetime formatting
             if mdict['strf_format']:
                 value = strftime_or_none(value, mdict['strf_format'].replace('\\,', ','))
@@ -1333,20 +1455,13 @@ def get_field(self, field_name, args, kwargs):
 
         replacement_formatter = _ReplacementFormatter()
 
-        def create_key(outer_mobj):
-            if not outer_mobj.group('has_key'):
-                return outer_mobj.group(0)
-            key = outer_mobj.group('key')
-            mobj = re.match(INTERNAL_FORMAT_RE, key)
+        def create_key(prefix, key, outer_fmt, flags, alternatives):
             value, replacement, default, last_field = None, None, na, ''
-            while mobj:
-                mobj = mobj.groupdict()
+            for mobj in alternatives:
                 default = mobj['default'] if mobj['default'] is not None else default
                 value = get_value(mobj)
                 last_field, replacement = mobj['fields'], mobj['replacement']
-                if value is None and mobj['alternate']:
-                    mobj = re.match(INTERNAL_FORMAT_RE, mobj['remaining'][1:])
-                else:
+                if value is not None or not mobj['alternate']:
                     break
 
             if None not in (value, replacement):
@@ -1355,11 +1470,11 @@ def create_key(outer_mobj):
                 except ValueError:
                     value, default = None, na
 
-            fmt = outer_mobj.group('format')
+            fmt = outer_fmt
             if fmt == 's' and last_field in field_size_compat_map and isinstance(value, int):
                 fmt = f'0{field_size_compat_map[last_field]:d}d'
 
-            flags = outer_mobj.group('conversion') or ''
+            flags = flags or ''
             str_fmt = f'{fmt[:-1]}s'
             if value is None:
                 value, fmt = default, 's'
@@ -1409,11 +1524,15 @@ def create_key(outer_mobj):
                 if fmt[-1] in 'csra':
                     value = sanitizer(last_field, value)
 
-            key = '{}\0{}'.format(key.replace('%', '%\0'), outer_mobj.group('format'))
+            key = key.replace('%', '%\0')
+            key = f'{key}\0{outer_fmt}'
             TMPL_DICT[key] = value
-            return '{prefix}%({key}){fmt}'.format(key=key, fmt=fmt, prefix=outer_mobj.group('prefix'))
+            return f'{prefix}%({key}){fmt}'
 
-        return EXTERNAL_FORMAT_RE.sub(create_key, outtmpl), TMPL_DICT
+        TMPL_DICT = {}
+        return ''.join(
+            part if isinstance(part, str) else create_key(*part)
+            for part in self._compile_outtmpl(outtmpl)), TMPL_DICT
 
     def evaluate_outtmpl(self, outtmpl, info_dict, *args, **kwargs):
         outtmpl, info_dict = self.prepare_outtmpl(outtmpl, info_dict, *args, **kwargs)
@@ -1593,14 +1712,11 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
             ie_key = 'Generic'
 
         if ie_key:
-            ies = {ie_key: self._ies[ie_key]} if ie_key in self._ies else {}
+            ies = [(ie_key, self._ies[ie_key])] if ie_key in self._ies and self._ies[ie_key].suitable(url) else []
         else:
-            ies = self._ies
-
-        for key, ie in ies.items():
-            if not ie.suitable(url):
-                continue
+            ies = self._suitable_ies(url)
 
+        for key, ie in ies:
             if not ie.working():
                 self.report_warning('The program functionality for this site has been marked as broken, '
                                     'and will probably not work.')
@@ -1755,10 +1871,12 @@ def _apply_header_cookies(self, url, cookies=None):
 
     @_handle_extraction_exceptions
     def __extract_info(self, url, ie, download, extra_info, process):
+        self._check_interrupted()
         self._apply_header_cookies(url)
 
         try:
-            ie_result = ie.extract(url)
+            prefetched = self._prefetched_entries.pop((ie.ie_key(), url), None)
+            ie_result = prefetched.result() if prefetched else ie.extract(url)
         except UserNotLive as e:
             if process:
                 if self.params.get('wait_for_video'):
@@ -1907,12 +2025,17 @@ def process_ie_result(self, ie_result, download=True, extra_info=None):
             self._playlist_urls.add(webpage_url)
             self._fill_common_fields(ie_result, False)
             self._sanitize_thumbnails(ie_result)
+            stream, result = getattr(self._local, 'json_stream', None), None
+            depth = len(stream or ())
             try:
-                return self.__process_playlist(ie_result, download)
+                result = self.__process_playlist(ie_result, download)
             finally:
+                if stream and len(stream) > depth:
+                    self.__end_json_stream(result)
                 self._playlist_level -= 1
                 if not self._playlist_level:
                     self._playlist_urls.clear()
+            return result
         elif result_type == 'compat_list':
             self.report_warning(
                 'Extractor {} returned a compat_list result. '
@@ -2024,49 +2147,69 @@ def __process_playlist(self, ie_result, download):
         keep_resolved_entries = self.params.get('extract_flat') != 'discard'
         if self.params.get('extract_flat') == 'discard_in_playlist':
             keep_resolved_entries = ie_result['_type'] != 'playlist'
+        stream = getattr(self._local, 'json_stream', None)
+        if stream is not None:
+            # The entries are printed as they are processed instead; see __end_json_stream
+            keep_resolved_entries = False
+            self.__write_json_stream('{"entries": [')
+            stream.append(0)
         if keep_resolved_entries:
             self.write_debug('The information of all playlist entries will be held in memory')
 
+        entries = self.__prefetch_entries(
+            entries, self.params.get('extract_flat') not in (True, 'in_playlist') and self.params.get('playlist_prefetch'))
+
         failures = 0
         max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
-        for i, (playlist_index, entry) in enumerate(entries):
-            if lazy:
-                resolved_entries.append((playlist_index, entry))
-            if not entry:
-                continue
+        try:
+            for i, (playlist_index, entry) in enumerate(entries):
+                self._check_interrupted()
+                if lazy:
+                    resolved_entries.append((playlist_index, entry))
+                if not entry:
+                    if stream is not None:
+                        self.__write_json_stream(json.dumps(entry))
+                    continue
 
-            entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
-            if not lazy and 'playlist-index' in self.params['compat_opts']:
-                playlist_index = ie_result['requested_entries'][i]
+                entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
+                if not lazy and 'playlist-index' in self.params['compat_opts']:
+                    playlist_index = ie_result['requested_entries'][i]
 
-            entry_copy = collections.ChainMap(entry, {
-                **common_info,
-                'n_entries': int_or_none(n_entries),
-                'playlist_index': playlist_index,
-                'playlist_autonumber': i + 1,
-            })
+                entry_copy = collections.ChainMap(entry, {
+                    **common_info,
+                    'n_entries': int_or_none(n_entries),
+                    'playlist_index': playlist_index,
+                    'playlist_autonumber': i + 1,
+                })
 
-            if self._match_entry(entry_copy, incomplete=True) is not None:
-                # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
-                resolved_entries[i] = (playlist_index, NO_DEFAULT)
-                continue
+                if self._match_entry(entry_copy, incomplete=True) is not None:
+                    # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
+                    resolved_entries[i] = (playlist_index, NO_DEFAULT)
+                    continue
 
-            self.to_screen(
-                f'[download] Downloading item {self._format_screen(i + 1, self.Styles.ID)} '
-                f'of {self._format_screen(n_entries, self.Styles.EMPHASIS)}')
-
-            entry_result = self.__process_iterable_entry(entry, download, collections.ChainMap({
-                'playlist_index': playlist_index,
-                'playlist_autonumber': i + 1,
-            }, extra))
-            if not entry_result:
-                failures += 1
-            if failures >= max_failures:
-                self.report_error(
-                    f'Skipping the remaining entries in playlist "{title}" since {failures} items failed extraction')
-                break
-            if keep_resolved_entries:
-                resolved_entries[i] = (playlist_index, entry_result)
+                self.to_screen(
+                    f'[download] Downloading item {self._format_screen(i + 1, self.Styles.ID)} '
+                    f'of {self._format_screen(n_entries, self.Styles.EMPHASIS)}')
+
+                streamed = stream and stream[-1]
+                entry_result = self.__process_iterable_entry(entry, download, collections.ChainMap({
+                    'playlist_index': playlist_index,
+                    'playlist_autonumber': i + 1,
+                }, extra))
+                if stream is not None and stream[-1] == streamed:  # Nested playlists are streamed by themselves
+                    self.post_extract(entry_result)
+                    self.__write_json_stream(self._info_json(entry_result, root=False))
+                if not entry_result:
+                    failures += 1
+                if failures >= max_failures:
+                    self.report_error(
+                        f'Skipping the remaining entries in playlist "{title}" '
+                        f'since {failures} items failed extraction')
+                    break
+                if keep_resolved_entries:
+                    resolved_entries[i] = (playlist_index, entry_result)
+        finally:
+            entries.close()
 
         # Update with processed data
         ie_result['entries'] = [e for _, e in resolved_entries if e is not NO_DEFAULT]
@@ -2085,6 +2228,86 @@ def __process_playlist(self, ie_result, download):
         self.to_screen(f'[download] Finished downloading playlist: {title}')
         return ie_result
 
+    def __write_json_stream(self, value):
+        stream = self._local.json_stream
+        self._write_string(self._bidi_workaround(', ' * bool(stream[-1]) + value), self._out_files.out)
+        stream[-1] += 1
+
+    def __end_json_stream(self, ie_result):
+        """Print the fields of a streamed playlist other than the entries, and close it"""
+        stream = self._local.json_stream
+        stream.pop()
+        if ie_result is not None and len(stream) == 1:
+            self._add_info_json_defaults(ie_result)
+        rest = self._info_json({k: v for k, v in (ie_result or {}).items() if k != 'entries'}, root=False)
+        self._write_string(self._bidi_workaround(']' + (', ' + rest[1:] if rest != '{}' else '}')), self._out_files.out)
+
+    def __prefetch_entries(self, entries, count):
+        """
+        Extract up to count upcoming url entries in the background while yielding the current one.
+        Each is extracted by its own copy of the extractor, but the extractors must still be safe to run concurrently
+        """
+        if not count:
+            yield from entries
+            return
+
+        def prefetch(entry):
+            if not isinstance(entry, dict) or entry.get('_type') not in ('url', 'url_transparent'):
+                return None
+            url = sanitize_url(entry['url'], scheme='http' if self.params.get('prefer_insecure') else 'https')
+            ie_key = entry.get('ie_key')
+            if ie_key:
+                ie = self._ies.get(ie_key)
+                if not ie or not ie.suitable(url):
+                    return None
+            else:
+                ie_key, ie = next(self._suitable_ies(url), (None, None))
+            if not ie:
+                return None
+            temp_id = ie.get_temp_id(url)
+            if temp_id is not None and self.in_download_archive({'id': temp_id, 'ie_key': ie_key}):
+                return None
+            key = (ie_key, url)
+            if key in self._prefetched_entries:
+                return None
+            ie = self.get_info_extractor(ie_key)
+            if not ie._ready:
+                # Login etc. must not run concurrently; any errors are reported when the entry is processed
+                try:
+                    ie.initialize()
+                except Exception:
+                    return None
+            self._apply_header_cookies(url)
+            # A copy of the initialized instance, so that the state set during extraction is not shared
+            self._prefetched_entries[key] = executor.submit(copy.copy(ie).extract, url)
+            return key
+
+        def discard(key):
+            future = self._prefetched_entries.pop(key, None)
+            if future:
+                future.cancel()
+
+        executor = concurrent.futures.ThreadPoolExecutor(count, thread_name_prefix='playlist_prefetch')
+        entries, pending, current = iter(entries), collections.deque(), None
+        try:
+            while True:
+                while len(pending) <= count:
+                    item = next(entries, None)
+                    if item is None:
+                        break
+                    pending.append((item, prefetch(item[1])))
+                if not pending:
+                    break
+                item, current = pending.popleft()
+                yield item
+                # The entry may have been skipped without being extracted
+                discard(current)
+        finally:
+            discard(current)
+            for _, key in pending:
+                discard(key)
+            executor.shutdown(wait=False)
+
     @_handle_extraction_exceptions
     def __process_iterable_entry(self, entry, download, extra_info):
         return self.process_ie_result(
@@ -2157,34 +2380,77 @@ def _filter(f):
             return op(actual_value, comparison_value)
         return _filter
 
-    def _check_formats(self, formats):
-        for f in formats:
-            working = f.get('__working')
-            if working is not None:
+    def _test_format(self, f):
+        """Whether the format can be downloaded; for direct HTTP(S) formats only the first byte is requested"""
+        headers = f.get('http_headers') or {}
+        if (f.get('protocol') in ('http', 'https') and not f.get('has_drm')
+                and not f.get('request_data') and 'Range' not in headers):
+            try:
+                request = Request(f['url'], headers={**headers, 'Range': 'bytes=0-0'})
+                with contextlib.closing(self.urlopen(request)) as response:
+                    return bool(response.read(1))
+            except (OSError, ValueError, *network_exceptions):
+                return False
+
+        path = self.get_output_path('temp')
+        if not self._ensure_dir_exists(f'{path}/'):
+            return None
+        temp_file = tempfile.NamedTemporaryFile(suffix='.tmp', delete=False, dir=path or None)
+        temp_file.close()
+        try:
+            success, _ = self.dl(temp_file.name, f, test=True)
+        except (DownloadError, OSError, ValueError, *network_exceptions):
+            success = False
+        finally:
+            if os.path.exists(temp_file.name):
+                try:
+                    os.remove(temp_file.name)
+                except OSError:
+                    self.report_warning(f'Unable to delete temporary file "{temp_file.name}"')
+        return success
+
+    def _check_formats(self, formats, needs_testing=None):
+        """
+        Yield the formats that can be downloaded, in order; formats for which needs_testing(f) is false are not tested.
+        The next _FORMAT_TEST_CONCURRENCY formats are tested in parallel, so that the first working one
+        is found quickly; tests that are still pending are cancelled once the generator is closed
+        """
+        executor = None
+
+        def test(f):
+            nonlocal executor
+            if f.get('__working') is not None:
+                return f, f['__working']
+            elif needs_testing and not needs_testing(f):
+                return f, True
+            self.to_screen('[info] Testing format {}'.format(f['format_id']))
+            if not executor:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    self._FORMAT_TEST_CONCURRENCY, thread_name_prefix='check_formats')
+            return f, executor.submit(self._test_format, f)
+
+        formats, pending = iter(formats), collections.deque()
+        try:
+            while True:
+                pending.extend(map(test, itertools.islice(formats, self._FORMAT_TEST_CONCURRENCY - len(pending))))
+                if not pending:
+                    return
+                f, working = pending.popleft()
+                if isinstance(working, concurrent.futures.Future):
+                    working = working.result()
+                    if working is None:
+                        continue
+                    f['__working'] = working
+                    if not working:
+                        self.to_screen('[info] Unable to download format {}. Skipping...'.format(f['format_id']))
                 if working:
                     yield f
-                continue
-            self.to_screen('[info] Testing format {}'.format(f['format_id']))
-            path = self.get_output_path('temp')
-            if not self._ensure_dir_exists(f'{path}/'):
-                continue
-            temp_file = tempfile.NamedTemporaryFile(suffix='.tmp', delete=False, dir=path or None)
-            temp_file.close()
-            try:
-                success, _ = self.dl(temp_file.name, f, test=True)
-            except (DownloadError, OSError, ValueError, *network_exceptions):
-                success = False
-            finally:
-                if os.path.exists(temp_file.name):
-                    try:
-                        os.remove(temp_file.name)
-                    except OSError:
-                        self.report_warning(f'Unable to delete temporary file "{temp_file.name}"')
-            f['__working'] = success
-            if success:
-                yield f
-            else:
-                self.to_screen('[info] Unable to download format {}. Skipping...'.format(f['format_id']))
+        finally:
+            for _, working in pending:
+                if isinstance(working, concurrent.futures.Future):
+                    working.cancel()
+            if executor:
+                executor.shutdown(wait=False)
 
     def _select_formats(self, formats, selector):
         return list(selector({
@@ -2414,11 +2680,7 @@ def _check_formats(formats):
                 yield from formats
                 return
 
-            for f in formats:
-                if f.get('has_drm') or f.get('__needs_testing'):
-                    yield from self._check_formats([f])
-                else:
-                    yield f
+            yield from self._check_formats(formats, lambda f: f.get('has_drm') or f.get('__needs_testing'))
 
         def _build_selector_function(selector):
             if isinstance(selector, list):  # ,
@@ -2714,12 +2976,23 @@ def _raise_pending_errors(self, info):
 
     def sort_formats(self, info_dict):
         formats = self._get_formats(info_dict)
-        formats.sort(key=FormatSorter(
-            self, info_dict.get('_format_sort_fields') or []).calculate_preference)
+        sort_fields = info_dict.get('_format_sort_fields') or []
+        # The sorter is reused for all videos with the same sort order
+        key = (tuple(sort_fields), tuple(self.params.get('format_sort') or ()),
+               bool(self.params.get('format_sort_force')), bool(self.params.get('prefer_free_formats')))
+        sorter = self._format_sorters.get(key)
+        if sorter:
+            if self.params.get('verbose'):
+                sorter.print_verbose_info(self.write_debug)
+        else:
+            sorter = self._format_sorters[key] = FormatSorter(self, sort_fields)
+        formats.sort(key=sorter.calculate_preference)
 
     def process_video_result(self, info_dict, download=True):
         assert info_dict.get('_type', 'video') == 'video'
-        self._num_videos += 1
+        with self._lock:
+            self._num_videos += 1
+            self._local.num_videos = self._num_videos
 
         if 'id' not in info_dict:
             raise ExtractorError('Missing "id" field in extractor result', ie=info_dict['extractor'])
@@ -3164,7 +3437,7 @@ def print_field(field, actual_field=None, optional=False):
         print_field('format')
 
         if self.params.get('forcejson'):
-            self.to_stdout(json.dumps(self.sanitize_info(info_dict)))
+            self.to_stdout(self._info_json(info_dict))
 
     def dl(self, name, info, subtitle=False, test=False):
         if not info.get('url'):
@@ -3218,6 +3491,7 @@ def process_info(self, info_dict):
 
         assert info_dict.get('_type', 'video') == 'video'
         original_infodict = info_dict
+        self._check_interrupted()
 
         if 'format' not in info_dict and 'ext' in info_dict:
             info_dict['format'] = info_dict['ext']
@@ -3238,7 +3512,13 @@ def replace_info_dict(new_info):
 
         new_info, _ = self.pre_process(info_dict, 'video')
         replace_info_dict(new_info)
-        self._num_downloads += 1
+        max_downloads = float(self.params.get('max_downloads') or 'inf')
+        with self._lock:
+            # With --concurrent-urls, the other threads may have used up the remaining downloads
+            if self._num_downloads >= max_downloads:
+                raise MaxDownloadsReached
+            self._num_downloads += 1
+            self._local.num_downloads = self._num_downloads
 
         # info_dict['_filename'] needs to be set for backward compatibility
         info_dict['_filename'] = full_filename = self.prepare_filename(info_dict, warn=True)
@@ -3249,7 +3529,7 @@ def replace_info_dict(new_info):
         self.__forced_printings(info_dict, full_filename, incomplete=('format' not in info_dict))
 
         def check_max_downloads():
-            if self._num_downloads >= float(self.params.get('max_downloads') or 'inf'):
+            if self._local.num_downloads >= max_downloads:
                 raise MaxDownloadsReached
 
         if self.params.get('simulate'):
@@ -3578,6 +3858,9 @@ def ffmpeg_fixup(cndn, msg, cls):
     def __download_wrapper(self, func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            # Number of values written at each level of the JSON that is being streamed, see __process_playlist
+            stream = self._local.json_stream = (
+                [0] if self.params.get('dump_single_json') and self.params.get('stream_single_json') else None)
             try:
                 res = func(*args, **kwargs)
             except UnavailableVideoError as e:
@@ -3586,11 +3869,15 @@ def wrapper(*args, **kwargs):
                 self.to_screen(f'[info] {e}')
                 if not self.params.get('break_per_url'):
                     raise
-                self._num_downloads = 0
+                self._num_downloads = self._local.num_downloads = 0
             else:
-                if self.params.get('dump_single_json', False):
+                if self.params.get('dump_single_json', False) and not (stream and stream[0]):
                     self.post_extract(res)
-                    self.to_stdout(json.dumps(self.sanitize_info(res)))
+                    self.to_stdout(self._info_json(res))
+            finally:
+                self._local.json_stream = None
+                if stream and stream[0]:
+                    self._write_string('\n', self._out_files.out)
         return wrapper
 
     def download(self, url_list):
@@ -3603,12 +3890,63 @@ def download(self, url_list):
                 and self.params.get('max_downloads') != 1):
             raise SameFileError(outtmpl)
 
-        for url in url_list:
-            self.__download_wrapper(self.extract_info)(
-                url, force_generic_extractor=self.params.get('force_generic_extractor', False))
+        concurrency = min(self.params.get('concurrent_urls') or 1, len(url_list))
+        if concurrency > 1:
+            self.__download_concurrently(url_list, concurrency)
+        else:
+            for url in url_list:
+                self.__download_wrapper(self.extract_info)(
+                    url, force_generic_extractor=self.params.get('force_generic_extractor', False))
 
         return self._download_retcode
 
+    def __download_concurrently(self, url_list, concurrency):
+        """
+        Process the URLs in a pool of threads that share this instance.
+        After an error, no more URLs are started; the first error is raised once the running ones finish.
+        An interrupt is raised right away; the running URLs stop at their next check, see _check_interrupted
+        """
+        stop, interrupted = threading.Event(), threading.Event()
+
+        def abort_on_interrupt(_):
+            # The hook is left in place for the URLs that are still running after an interrupt
+            if interrupted.is_set() and not all(future.done() for future in futures):
+                raise KeyboardInterrupt
+
+        def download(url):
+            if stop.is_set():
+                return
+            self._local.interrupted = interrupted
+            try:
+                self.__download_wrapper(self.extract_info)(
+                    url, force_generic_extractor=self.params.get('force_generic_extractor', False))
+            except BaseException:
+                stop.set()
+                raise
+
+        self.write_debug(f'Processing {len(url_list)} URLs in {concurrency} threads')
+        self.add_progress_hook(abort_on_interrupt)
+        executor = concurrent.futures.ThreadPoolExecutor(concurrency, thread_name_prefix='download')
+        futures = []
+        try:
+            futures.extend(executor.submit(download, url) for url in url_list)
+            concurrent.futures.wait(futures)
+        except KeyboardInterrupt:
+            # Running URLs stop at their next progress update, playlist entry or extraction
+            stop.set()
+            interrupted.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            raise
+        finally:
+            if not interrupted.is_set():
+                executor.shutdown(wait=True)
+                self._progress_hooks.remove(abort_on_interrupt)
+
+        for future in futures:
+            future.result()
+
     def download_with_info_file(self, info_filename):
         with contextlib.closing(fileinput.FileInput(
                 [info_filename], mode='r',
@@ -3636,14 +3974,7 @@ def sanitize_info(info_dict, remove_private_keys=False):
         """ Sanitize the infodict for converting to json """
         if info_dict is None:
             return info_dict
-        info_dict.setdefault('epoch', int(time.time()))
-        info_dict.setdefault('_type', 'video')
-        info_dict.setdefault('_version', {
-            'version': __version__,
-            'current_git_head': current_git_head(),
-            'release_git_head': RELEASE_GIT_HEAD,
-            'repository': ORIGIN,
-        })
+        YoutubeDL._add_info_json_defaults(info_dict)
 
         if remove_private_keys:
             reject = lambda k, v: v is None or k.startswith('__') or k in {
@@ -3666,6 +3997,28 @@ def filter_fn(obj):
 
         return filter_fn(info_dict)
 
+    @staticmethod
+    def _add_info_json_defaults(info_dict):
+        info_dict.setdefault('epoch', int(time.time()))
+        info_dict.setdefault('_type', 'video')
+        info_dict.setdefault('_version', {
+            'version': __version__,
+            'current_git_head': current_git_head(),
+            'release_git_head': RELEASE_GIT_HEAD,
+            'repository': ORIGIN,
+        })
+
+    @staticmethod
+    def _json_default(obj):
+        return list(obj) if isinstance(obj, (set, LazyList)) else repr(obj)
+
+    @classmethod
+    def _info_json(cls, info_dict, root=True):
+        """Same as json.dumps(cls.sanitize_info(info_dict)), but without copying the info_dict"""
+        if root and info_dict is not None:
+            cls._add_info_json_defaults(info_dict)
+        return json.dumps(info_dict, default=cls._json_default)
+
     @staticmethod
     def filter_requested_info(info_dict, actually_filter=True):
         """ Alias of sanitize_info for backward compatibility """
@@ -3757,11 +4110,8 @@ def _make_archive_id(self, info_dict):
             if not url:
                 return
             # Try to find matching extractor for the URL and take its ie_key
-            for ie_key, ie in self._ies.items():
-                if ie.suitable(url):
-                    extractor = ie_key
-                    break
-            else:
+            extractor = next((ie_key for ie_key, _ in self._suitable_ies(url)), None)
+            if extractor is None:
                 return
         return make_archive_id(extractor, video_id)
 
@@ -3781,10 +4131,14 @@ def record_download_archive(self, info_dict):
         assert vid_id
 
         self.write_debug(f'Adding to archive: {vid_id}')
-        if is_path_like(fn):
-            with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-                archive_file.write(vid_id + '\n')
-        self.archive.add(vid_id)
+        with self._lock:
+            if isinstance(self.archive, DownloadArchive):
+                self.archive.record(vid_id)
+                return
+            if is_path_like(fn):
+                with locked_file(fn, 'a', encoding='utf-8') as archive_file:
+                    archive_file.write(vid_id + '\n')
+            self.archive.add(vid_id)
 
     @staticmethod
     def format_resolution(format, default='unknown'):
@@ -4225,6 +4579,7 @@ def build_request_director(self, handlers, preferences=None):
                     'verbose': 'debug_printtraffic',
                     'source_address': 'source_address',
                     'timeout': 'socket_timeout',
+                    'connection_pool_size': 'connection_pool_size',
                     'legacy_ssl_support': 'legacyserverconnect',
                     'enable_file_urls': 'enable_file_urls',
                     'impersonate': 'impersonate',
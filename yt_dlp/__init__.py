@@ -205,6 +205,12 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('HTTP connections', opts.http_connections, True)
+    validate_positive('playlist prefetch', opts.playlist_prefetch)
+    validate_positive('playlist page prefetch', opts.playlist_page_prefetch)
+    validate_positive('concurrent URLs', opts.concurrent_urls, True)
+    validate_positive('fragment window', opts.fragment_window, True)
+    validate_positive('connection pool size', opts.connection_pool_size, True)
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -299,6 +305,7 @@ def validate_bytes(name, value):
     opts.max_filesize = validate_bytes('max filesize', opts.max_filesize)
     opts.buffersize = validate_bytes('buffer size', opts.buffersize)
     opts.http_chunk_size = validate_bytes('http chunk size', opts.http_chunk_size)
+    opts.fragment_buffer_size = validate_bytes('fragment buffer size', opts.fragment_buffer_size)
 
     # Output templates
     def validate_outtmpl(tmpl, msg):
@@ -525,6 +532,8 @@ def report_conflict(arg1, opt1, arg2='--allow-unplayable-formats', opt2='allow_u
     report_conflict('--sponskrub', 'sponskrub', '--sponsorblock-remove', 'sponsorblock_remove')
     report_conflict('--sponskrub-cut', 'sponskrub_cut', '--split-chapter', 'split_chapters',
                     val1=opts.sponskrub and opts.sponskrub_cut)
+    report_conflict('--concurrent-urls', 'concurrent_urls', '--stream-single-json', 'stream_single_json',
+                    val1=opts.concurrent_urls > 1, default=1)
 
     # Conflicts with --allow-unplayable-formats
     report_conflict('--embed-metadata', 'addmetadata')
@@ -567,6 +576,9 @@ def report_deprecation(val, old, new=None):
     if opts.overwrites:  # --force-overwrites implies --no-continue
         opts.continue_dl = False
 
+    if opts.stream_single_json:  # --stream-single-json implies -J
+        opts.dump_single_json = True
+
     if (opts.addmetadata or opts.sponsorblock_mark) and opts.addchapters is None:
         # Add chapters when adding metadata or marking sponsors
         opts.addchapters = True
@@ -804,6 +816,7 @@ def parse_options(argv=None):
         'print_to_file': opts.print_to_file,
         'forcejson': opts.dumpjson or opts.print_json,
         'dump_single_json': opts.dump_single_json,
+        'stream_single_json': opts.stream_single_json,
         'force_write_download_archive': opts.force_write_download_archive,
         'simulate': (print_only or any_getting or None) if opts.simulate is None else opts.simulate,
         'skip_download': opts.skip_download,
@@ -838,9 +851,13 @@ def parse_options(argv=None):
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
         'keep_fragments': opts.keep_fragments,
         'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'fragment_window': opts.fragment_window,
+        'adaptive_concurrent_fragments': opts.adaptive_concurrent_fragments,
+        'fragment_buffer_size': opts.fragment_buffer_size,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'http_chunk_size': opts.http_chunk_size,
+        'http_connections': opts.http_connections,
         'continuedl': opts.continue_dl,
         'noprogress': opts.quiet if opts.noprogress is None else opts.noprogress,
         'progress_with_newline': opts.progress_with_newline,
@@ -851,6 +868,9 @@ def parse_options(argv=None):
         'playlistreverse': opts.playlist_reverse,
         'playlistrandom': opts.playlist_random,
         'lazy_playlist': opts.lazy_playlist,
+        'concurrent_urls': opts.concurrent_urls,
+        'playlist_prefetch': opts.playlist_prefetch,
+        'playlist_page_prefetch': opts.playlist_page_prefetch,
         'noplaylist': opts.noplaylist,
         'logtostderr': opts.outtmpl.get('default') == '-',
         'consoletitle': opts.consoletitle,
@@ -891,9 +911,11 @@ def parse_options(argv=None):
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'cache_backend': opts.cache_backend,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
+        'download_archive_index': opts.download_archive_index,
         'break_on_existing': opts.break_on_existing,
         'break_on_reject': opts.break_on_reject,
         'break_per_url': opts.break_per_url,
@@ -926,6 +948,7 @@ def parse_options(argv=None):
         'postprocessors': postprocessors,
         'fixup': opts.fixup,
         'source_address': opts.source_address,
+        'connection_pool_size': opts.connection_pool_size,
         'impersonate': opts.impersonate,
         'call_home': opts.call_home,
         'sleep_interval_requests': opts.sleep_interval_requests,
@@ -943,6 +966,7 @@ def parse_options(argv=None):
         'ffmpeg_location': opts.ffmpeg_location,
         'hls_prefer_native': opts.hls_prefer_native,
         'hls_use_mpegts': opts.hls_use_mpegts,
+        'hls_native_live': opts.hls_native_live,
         'hls_split_discontinuity': opts.hls_split_discontinuity,
         'external_downloader_args': opts.external_downloader_args,
         'postprocessor_args': opts.postprocessor_args,
@@ -1,4 +1,6 @@
 import base64
+import functools
+import struct
 from math import ceil
 
 from .compat import compat_ord
@@ -17,11 +19,11 @@ def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
 else:
     def aes_cbc_decrypt_bytes(data, key, iv):
         """ Decrypt bytes with AES-CBC using native implementation since pycryptodome is unavailable """
-        return intlist_to_bytes(aes_cbc_decrypt(*map(bytes_to_intlist, (data, key, iv))))
+        return _cbc_decrypt(bytes(data), bytes(key), bytes(iv))
 
     def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
         """ Decrypt bytes with AES-GCM using native implementation since pycryptodome is unavailable """
-        return intlist_to_bytes(aes_gcm_decrypt_and_verify(*map(bytes_to_intlist, (data, key, tag, nonce))))
+        return _gcm_decrypt_and_verify(bytes(data), bytes(key), bytes(tag), bytes(nonce))
 
 
 def aes_cbc_encrypt_bytes(data, key, iv, **kwargs):
@@ -134,19 +136,7 @@ def aes_ctr_encrypt(data, key, iv):
     @param {int[]} iv          16-Byte initialization vector
     @returns {int[]}           encrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
-    counter = iter_vector(iv)
-
-    encrypted_data = []
-    for i in range(block_count):
-        counter_block = next(counter)
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
-
-        cipher_counter_block = aes_encrypt(counter_block, expanded_key)
-        encrypted_data += xor(block, cipher_counter_block)
-    return encrypted_data[:len(data)]
+    return bytes_to_intlist(_ctr_encrypt(*map(intlist_to_bytes, (data, key, iv))))
 
 
 def aes_cbc_decrypt(data, key, iv):
@@ -158,19 +148,7 @@ def aes_cbc_decrypt(data, key, iv):
     @param {int[]} iv          16-Byte IV
     @returns {int[]}           decrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
-
-    decrypted_data = []
-    previous_cipher_block = iv
-    for i in range(block_count):
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
-
-        decrypted_block = aes_decrypt(block, expanded_key)
-        decrypted_data += xor(decrypted_block, previous_cipher_block)
-        previous_cipher_block = block
-    return decrypted_data[:len(data)]
+    return bytes_to_intlist(_cbc_decrypt(*map(intlist_to_bytes, (data, key, iv))))
 
 
 def aes_cbc_encrypt(data, key, iv, *, padding_mode='pkcs7'):
@@ -183,23 +161,18 @@ def aes_cbc_encrypt(data, key, iv, *, padding_mode='pkcs7'):
     @param padding_mode        Padding mode to use
     @returns {int[]}           encrypted data
     """
-    expanded_key = key_expansion(key)
+    round_keys = _encryption_round_keys(intlist_to_bytes(key))
     block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
 
     encrypted_data = []
-    previous_cipher_block = iv
+    state = struct.unpack('>4I', intlist_to_bytes(iv))
     for i in range(block_count):
         block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block = pad_block(block, padding_mode)
+        block = struct.unpack('>4I', intlist_to_bytes(pad_block(block, padding_mode)))
+        state = _encrypt_block(*(x ^ y for x, y in zip(block, state)), round_keys)
+        encrypted_data.append(struct.pack('>4I', *state))
 
-        mixed_block = xor(block, previous_cipher_block)
-
-        encrypted_block = aes_encrypt(mixed_block, expanded_key)
-        encrypted_data += encrypted_block
-
-        previous_cipher_block = encrypted_block
-
-    return encrypted_data
+    return bytes_to_intlist(b''.join(encrypted_data))
 
 
 def aes_gcm_decrypt_and_verify(data, key, tag, nonce):
@@ -212,37 +185,7 @@ def aes_gcm_decrypt_and_verify(data, key, tag, nonce):
     @param {int[]} nonce       IV (recommended 12-Byte)
     @returns {int[]}           decrypted data
     """
-
-    # XXX: check aes, gcm param
-
-    hash_subkey = aes_encrypt([0] * BLOCK_SIZE_BYTES, key_expansion(key))
-
-    if len(nonce) == 12:
-        j0 = [*nonce, 0, 0, 0, 1]
-    else:
-        fill = (BLOCK_SIZE_BYTES - (len(nonce) % BLOCK_SIZE_BYTES)) % BLOCK_SIZE_BYTES + 8
-        ghash_in = nonce + [0] * fill + bytes_to_intlist((8 * len(nonce)).to_bytes(8, 'big'))
-        j0 = ghash(hash_subkey, ghash_in)
-
-    # TODO: add nonce support to aes_ctr_decrypt
-
-    # nonce_ctr = j0[:12]
-    iv_ctr = inc(j0)
-
-    decrypted_data = aes_ctr_decrypt(data, key, iv_ctr + [0] * (BLOCK_SIZE_BYTES - len(iv_ctr)))
-    pad_len = len(data) // 16 * 16
-    s_tag = ghash(
-        hash_subkey,
-        data
-        + [0] * (BLOCK_SIZE_BYTES - len(data) + pad_len)        # pad
-        + bytes_to_intlist((0 * 8).to_bytes(8, 'big')           # length of associated data
-                           + ((len(data) * 8).to_bytes(8, 'big'))),  # length of data
-    )
-
-    if tag != aes_ctr_encrypt(s_tag, key, j0):
-        raise ValueError('Mismatching authentication tag')
-
-    return decrypted_data
+    return bytes_to_intlist(_gcm_decrypt_and_verify(*map(intlist_to_bytes, (data, key, tag, nonce))))
 
 
 def aes_encrypt(data, expanded_key):
@@ -532,6 +475,163 @@ def ghash(subkey, data):
     return last_y
 
 
+# The following implementation works on 32-bit words and merges SubBytes, ShiftRows and MixColumns
+# into lookups in precomputed tables ("T-tables"), which is much faster than the byte-wise implementation above
+
+def _gf_mul(x, y):
+    return 0 if x == 0 or y == 0 else RIJNDAEL_EXP_TABLE[(RIJNDAEL_LOG_TABLE[x] + RIJNDAEL_LOG_TABLE[y]) % 0xFF]
+
+
+def _rotate_word(word, bits):
+    return ((word >> bits) | (word << (32 - bits))) & 0xFFFFFFFF
+
+
+@functools.lru_cache(maxsize=None)
+def _tables():
+    te0 = tuple(
+        (_gf_mul(x, 2) << 24) | (x << 16) | (x << 8) | _gf_mul(x, 3) for x in SBOX)
+    td0 = tuple(
+        (_gf_mul(x, 0xE) << 24) | (_gf_mul(x, 0x9) << 16) | (_gf_mul(x, 0xD) << 8) | _gf_mul(x, 0xB) for x in SBOX_INV)
+    return (
+        (te0, *(tuple(_rotate_word(w, bits) for w in te0) for bits in (8, 16, 24))),
+        (td0, *(tuple(_rotate_word(w, bits) for w in td0) for bits in (8, 16, 24))))
+
+
+@functools.lru_cache(maxsize=16)
+def _encryption_round_keys(key):
+    words = struct.unpack(f'>{len(key) + 28}I', intlist_to_bytes(key_expansion(bytes_to_intlist(key))))
+    return tuple(words[i:i + 4] for i in range(0, len(words), 4))
+
+
+@functools.lru_cache(maxsize=16)
+def _decryption_round_keys(key):
+    # Equivalent inverse cipher (FIPS-197, 5.3.5): the round keys are used in reverse order,
+    # with InvMixColumns applied to all but the first and last of them
+    _, (td0, td1, td2, td3) = _tables()
+    round_keys = _encryption_round_keys(key)
+    return (round_keys[-1], *(
+        tuple(td0[SBOX[w >> 24]] ^ td1[SBOX[(w >> 16) & 0xFF]] ^ td2[SBOX[(w >> 8) & 0xFF]] ^ td3[SBOX[w & 0xFF]]
+              for w in round_key)
+        for round_key in round_keys[-2:0:-1]), round_keys[0])
+
+
+def _encrypt_block(s0, s1, s2, s3, round_keys):
+    (te0, te1, te2, te3), _ = _tables()
+    k0, k1, k2, k3 = round_keys[0]
+    s0, s1, s2, s3 = s0 ^ k0, s1 ^ k1, s2 ^ k2, s3 ^ k3
+    for k0, k1, k2, k3 in round_keys[1:-1]:
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ k0,
+            te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ k1,
+            te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ k2,
+            te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ k3)
+    k0, k1, k2, k3 = round_keys[-1]
+    return (
+        (SBOX[s0 >> 24] << 24 | SBOX[(s1 >> 16) & 0xFF] << 16 | SBOX[(s2 >> 8) & 0xFF] << 8 | SBOX[s3 & 0xFF]) ^ k0,
+        (SBOX[s1 >> 24] << 24 | SBOX[(s2 >> 16) & 0xFF] << 16 | SBOX[(s3 >> 8) & 0xFF] << 8 | SBOX[s0 & 0xFF]) ^ k1,
+        (SBOX[s2 >> 24] << 24 | SBOX[(s3 >> 16) & 0xFF] << 16 | SBOX[(s0 >> 8) & 0xFF] << 8 | SBOX[s1 & 0xFF]) ^ k2,
+        (SBOX[s3 >> 24] << 24 | SBOX[(s0 >> 16) & 0xFF] << 16 | SBOX[(s1 >> 8) & 0xFF] << 8 | SBOX[s2 & 0xFF]) ^ k3)
+
+
+def _decrypt_block(s0, s1, s2, s3, round_keys):
+    _, (td0, td1, td2, td3) = _tables()
+    k0, k1, k2, k3 = round_keys[0]
+    s0, s1, s2, s3 = s0 ^ k0, s1 ^ k1, s2 ^ k2, s3 ^ k3
+    for k0, k1, k2, k3 in round_keys[1:-1]:
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ k0,
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ k1,
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ k2,
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ k3)
+    k0, k1, k2, k3 = round_keys[-1]
+    return (
+        (SBOX_INV[s0 >> 24] << 24 | SBOX_INV[(s3 >> 16) & 0xFF] << 16
+         | SBOX_INV[(s2 >> 8) & 0xFF] << 8 | SBOX_INV[s1 & 0xFF]) ^ k0,
+        (SBOX_INV[s1 >> 24] << 24 | SBOX_INV[(s0 >> 16) & 0xFF] << 16
+         | SBOX_INV[(s3 >> 8) & 0xFF] << 8 | SBOX_INV[s2 & 0xFF]) ^ k1,
+        (SBOX_INV[s2 >> 24] << 24 | SBOX_INV[(s1 >> 16) & 0xFF] << 16
+         | SBOX_INV[(s0 >> 8) & 0xFF] << 8 | SBOX_INV[s3 & 0xFF]) ^ k2,
+        (SBOX_INV[s3 >> 24] << 24 | SBOX_INV[(s2 >> 16) & 0xFF] << 16
+         | SBOX_INV[(s1 >> 8) & 0xFF] << 8 | SBOX_INV[s0 & 0xFF]) ^ k3)
+
+
+def _pad_to_blocks(data):
+    return data + bytes(-len(data) % BLOCK_SIZE_BYTES)
+
+
+def _cbc_decrypt(data, key, iv):
+    round_keys = _decryption_round_keys(key)
+    previous = struct.unpack('>4I', iv)
+    decrypted_data = []
+    for block in struct.iter_unpack('>4I', _pad_to_blocks(data)):
+        s0, s1, s2, s3 = _decrypt_block(*block, round_keys)
+        decrypted_data.append(struct.pack(
+            '>4I', s0 ^ previous[0], s1 ^ previous[1], s2 ^ previous[2], s3 ^ previous[3]))
+        previous = block
+    return b''.join(decrypted_data)[:len(data)]
+
+
+def _ctr_encrypt(data, key, iv):
+    round_keys = _encryption_round_keys(key)
+    counter = int.from_bytes(iv, 'big')
+    keystream = []
+    for _ in range(0, len(data), BLOCK_SIZE_BYTES):
+        keystream.append(struct.pack('>4I', *_encrypt_block(
+            counter >> 96, (counter >> 64) & 0xFFFFFFFF, (counter >> 32) & 0xFFFFFFFF, counter & 0xFFFFFFFF,
+            round_keys)))
+        counter = (counter + 1) & ((1 << 128) - 1)
+    keystream = b''.join(keystream)[:len(data)]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+
+def _ghash_tables(hash_subkey):
+    # NIST SP 800-38D, 6.3: the product of the subkey with every single bit of a block,
+    # combined into one table of products per byte of the block
+    bit_products = []
+    v = hash_subkey
+    for _ in range(128):
+        bit_products.append(v)
+        v = (v >> 1) ^ (0xE1 << 120) if v & 1 else v >> 1
+    tables = []
+    for position in range(BLOCK_SIZE_BYTES):
+        table = [0] * 256
+        for byte in range(1, 256):
+            lowest = byte & -byte
+            table[byte] = table[byte ^ lowest] ^ bit_products[position * 8 + 8 - lowest.bit_length()]
+        tables.append(table)
+    return tables
+
+
+def _ghash(tables, data):
+    result = 0
+    for i in range(0, len(data), BLOCK_SIZE_BYTES):
+        result ^= int.from_bytes(data[i:i + BLOCK_SIZE_BYTES], 'big')
+        product = 0
+        for table, byte in zip(tables, result.to_bytes(BLOCK_SIZE_BYTES, 'big')):
+            product ^= table[byte]
+        result = product
+    return result.to_bytes(BLOCK_SIZE_BYTES, 'big')
+
+
+def _gcm_decrypt_and_verify(data, key, tag, nonce):
+    ghash_tables = _ghash_tables(int.from_bytes(
+        struct.pack('>4I', *_encrypt_block(0, 0, 0, 0, _encryption_round_keys(key))), 'big'))
+
+    if len(nonce) == 12:
+        j0 = nonce + b'\x00\x00\x00\x01'
+    else:
+        j0 = _ghash(ghash_tables, _pad_to_blocks(nonce) + bytes(8) + (8 * len(nonce)).to_bytes(8, 'big'))
+
+    counter = (int.from_bytes(j0, 'big') + 1) & ((1 << 128) - 1)
+    decrypted_data = _ctr_encrypt(data, key, counter.to_bytes(BLOCK_SIZE_BYTES, 'big'))
+    s_tag = _ghash(ghash_tables, _pad_to_blocks(data) + bytes(8) + (8 * len(data)).to_bytes(8, 'big'))
+
+    if tag != _ctr_encrypt(s_tag, key, j0):
+        raise ValueError('Mismatching authentication tag')
+
+    return decrypted_data
+
+
 __all__ = [
     'aes_cbc_decrypt',
     'aes_cbc_decrypt_bytes',
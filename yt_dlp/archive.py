@@ -0,0 +1,198 @@
+import atexit
+import hashlib
+import os
+import threading
+import time
+
+from .dependencies import sqlite3
+from .utils import locked_file
+
+
+class DownloadArchive:
+    """
+    A download archive file that is looked up through an SQLite index (<filename>.sqlite3)
+
+    The archive file remains the source of truth. Recorded entries are appended to it in batches
+    (see record), and kept in memory, since the next update reads them from the file.
+    When the archive is first queried, only the lines appended since the index was last
+    updated (by any process) are read; the index is rebuilt if the file was rewritten.
+    If the index can not be used, the whole file is loaded into memory instead
+    """
+
+    _CHUNK_SIZE = 1024 * 1024
+    _FINGERPRINT_SIZE = 4096
+    _TIMEOUT = 30
+    _BATCH_SIZE = 100
+    _FLUSH_INTERVAL = 5
+
+    def __init__(self, ydl, filename):
+        self._ydl, self.filename = ydl, filename
+        self.index_filename = f'{filename}.sqlite3'
+        self._lock = threading.RLock()
+        self._connection = None
+        self._fallback = None  # The entries of the file, if the index can not be used
+        self._added = set()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._flush_at_exit = False
+
+    def _connect(self):
+        if self._connection or self._fallback is not None:
+            return self._connection
+        connection = None
+        try:
+            connection = sqlite3.connect(
+                self.index_filename, timeout=self._TIMEOUT, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS archive (id TEXT PRIMARY KEY) WITHOUT ROWID')
+            connection.execute('CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value)')
+            self._update(connection)
+        except (sqlite3.Error, OSError) as e:
+            if connection:
+                connection.close()
+            self._ydl.report_warning(
+                f'Unable to use the index {self.index_filename!r} of the download archive; '
+                f'loading the whole archive into memory instead: {e}')
+            self._fallback = self._load_file()
+            return None
+        self._connection = connection
+        return connection
+
+    def _load_file(self):
+        entries = set()
+        try:
+            with locked_file(self.filename, 'r', encoding='utf-8') as archive_file:
+                for line in archive_file:
+                    entries.add(line.strip())
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _update(self, connection):
+        # Writers wait for each other, so that every line is read by only one process
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            state = dict(connection.execute('SELECT key, value FROM state'))
+            offset, fingerprint = state.get('offset') or 0, state.get('fingerprint')
+            try:
+                with locked_file(self.filename, 'rb') as archive_file:
+                    if fingerprint != self._fingerprint(archive_file, offset):
+                        if offset:
+                            self._ydl.write_debug(f'Archive file {self.filename!r} was modified; rebuilding its index')
+                        connection.execute('DELETE FROM archive')
+                        offset = 0
+                    archive_file.seek(offset)
+                    offset += self._index_lines(connection, archive_file)
+                    fingerprint = self._fingerprint(archive_file, offset)
+            except OSError as e:
+                if not isinstance(e, FileNotFoundError):
+                    raise
+                connection.execute('DELETE FROM archive')
+                offset, fingerprint = 0, None
+            connection.executemany(
+                'INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)',
+                (('offset', offset), ('fingerprint', fingerprint)))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _fingerprint(self, archive_file, offset):
+        """
+        Identify the indexed part of the file, so that rewrites are noticed
+
+        The start of the file and the bytes just before the offset are hashed, since an edited file
+        that grows back past the offset has its indexed lines shifted there
+        """
+        size = os.fstat(archive_file.fileno()).st_size
+        if size < offset:
+            return None
+        fingerprint = hashlib.sha256()
+        archive_file.seek(0)
+        fingerprint.update(archive_file.read(min(offset, self._FINGERPRINT_SIZE)))
+        tail_start = max(offset - self._FINGERPRINT_SIZE, self._FINGERPRINT_SIZE)
+        if tail_start < offset:
+            archive_file.seek(tail_start)
+            fingerprint.update(archive_file.read(offset - tail_start))
+        return fingerprint.hexdigest()
+
+    def _index_lines(self, connection, archive_file):
+        """Index all complete lines from the current position and return the number of bytes read"""
+        read, remainder = 0, b''
+        while True:
+            chunk = archive_file.read(self._CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split(b'\n')
+            remainder = lines.pop()
+            read += len(chunk)
+            connection.executemany('INSERT OR IGNORE INTO archive (id) VALUES (?)', (
+                (line,) for line in (line.decode('utf-8').strip() for line in lines) if line))
+        if remainder.strip():
+            # The last line has no newline yet. Index it, but read it again next time
+            connection.execute('INSERT OR IGNORE INTO archive (id) VALUES (?)', (remainder.decode('utf-8').strip(),))
+        if read:
+            self._ydl.write_debug(f'Indexed {read} bytes of archive file {self.filename!r}')
+        return read - len(remainder)
+
+    def __contains__(self, vid_id):
+        if vid_id in self._added:
+            return True
+        elif not vid_id:
+            return False
+        with self._lock:
+            connection = self._connect()
+            if not connection:
+                return vid_id in self._fallback
+            return bool(connection.execute('SELECT 1 FROM archive WHERE id = ?', (vid_id,)).fetchone())
+
+    def __bool__(self):
+        if self._added:
+            return True
+        with self._lock:
+            connection = self._connect()
+            if not connection:
+                return bool(self._fallback)
+            return bool(connection.execute('SELECT 1 FROM archive LIMIT 1').fetchone())
+
+    def add(self, vid_id):
+        self._added.add(vid_id)
+
+    def record(self, vid_id):
+        """
+        Add an entry and append it to the file
+
+        An entry recorded _FLUSH_INTERVAL seconds after the last append is written right away.
+        Bursts of entries are written together, once _BATCH_SIZE of them are pending, on the first entry
+        after _FLUSH_INTERVAL, on close or at exit; pending entries are lost if the process is killed
+        """
+        with self._lock:
+            self.add(vid_id)
+            self._pending.append(vid_id)
+            if not self._flush_at_exit:
+                # The pending appends are not lost when the YoutubeDL instance is never closed
+                atexit.register(self.close)
+                self._flush_at_exit = True
+            if (len(self._pending) >= self._BATCH_SIZE
+                    or time.monotonic() - self._last_flush >= self._FLUSH_INTERVAL):
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            with locked_file(self.filename, 'a', encoding='utf-8') as archive_file:
+                archive_file.write(''.join(f'{vid_id}\n' for vid_id in self._pending))
+            self._pending.clear()
+
+    def close(self):
+        with self._lock:
+            if self._flush_at_exit:
+                atexit.unregister(self.close)
+                self._flush_at_exit = False
+            self.flush()
+            if self._connection:
+                self._connection.close()
+                self._connection = None
@@ -1,18 +1,220 @@
+import atexit
 import contextlib
 import json
 import os
 import re
 import shutil
+import threading
+import time
 import traceback
 import urllib.parse
 
+from .dependencies import sqlite3
 from .utils import expand_path, traverse_obj, version_tuple, write_json_file
 from .version import __version__
 
 
+class CacheBackend:
+    """
+    Storage of the cache entries
+
+    Entries are JSON-serializable objects identified by a section and a key.
+    Failures are reported as warnings; load returns None if the entry could not be read
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._ydl = cache._ydl
+
+    def load(self, section, key):
+        raise NotImplementedError
+
+    def store(self, section, key, obj):
+        raise NotImplementedError
+
+    def prune(self, section, max_entries):
+        """Remove all but the max_entries most recently written entries of a section, possibly not right away"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileCacheBackend(CacheBackend):
+    """Stores every entry as a JSON file in <cachedir>/<section>/"""
+
+    def _get_cache_fn(self, section, key, dtype='json'):
+        key = urllib.parse.quote(key, safe='').replace('%', ',')  # encode non-ascii characters
+        return os.path.join(self._cache._get_root_dir(), section, f'{key}.{dtype}')
+
+    def load(self, section, key):
+        cache_fn = self._get_cache_fn(section, key)
+        with contextlib.suppress(OSError):
+            try:
+                with open(cache_fn, encoding='utf-8') as cachef:
+                    return json.load(cachef)
+            except (ValueError, KeyError):
+                try:
+                    file_size = os.path.getsize(cache_fn)
+                except OSError as oe:
+                    file_size = str(oe)
+                self._ydl.report_warning(f'Cache retrieval from {cache_fn} failed ({file_size})')
+
+    def store(self, section, key, obj):
+        fn = self._get_cache_fn(section, key)
+        try:
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            write_json_file(obj, fn)
+        except Exception:
+            tb = traceback.format_exc()
+            self._ydl.report_warning(f'Writing cache to {fn!r} failed: {tb}')
+
+    def prune(self, section, max_entries):
+        section_dir = os.path.dirname(self._get_cache_fn(section, 'x'))
+        with contextlib.suppress(OSError):
+            entries = sorted((
+                entry for entry in os.scandir(section_dir)
+                if entry.is_file() and entry.name.endswith('.json')),
+                key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for entry in entries[max_entries:]:
+                self._ydl.write_debug(f'Removing {section}.{entry.name} from cache')
+                with contextlib.suppress(OSError):
+                    os.remove(entry.path)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Stores all entries in a single SQLite database in <cachedir>
+
+    The database is in WAL mode so that many processes can share it.
+    Writes are batched into a single transaction, which also evicts
+    entries older than MAX_AGE, the oldest ones of sections larger than MAX_ENTRIES
+    and those of the sections pruned since the last batch
+    """
+
+    FILENAME = 'cache.sqlite3'
+    MAX_AGE = 90 * 24 * 60 * 60
+    MAX_ENTRIES = 10000  # per section
+    _BATCH_SIZE = 100
+    _FLUSH_INTERVAL = 5
+    _TIMEOUT = 30
+
+    def __init__(self, cache):
+        super().__init__(cache)
+        self._lock = threading.RLock()
+        self._connection = None
+        self._pending = {}
+        self._prunes = {}  # section: max_entries
+        self._last_flush = time.monotonic()
+        self._flush_at_exit = False
+
+    def _connect(self):
+        if not self._connection:
+            root_dir = self._cache._get_root_dir()
+            os.makedirs(root_dir, exist_ok=True)
+            # Transactions are handled explicitly, see _flush
+            self._connection = sqlite3.connect(
+                os.path.join(root_dir, self.FILENAME), timeout=self._TIMEOUT,
+                isolation_level=None, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'section TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, updated REAL NOT NULL, '
+                'PRIMARY KEY (section, key))')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS cache_updated ON cache (section, updated)')
+        return self._connection
+
+    def _report_error(self, action):
+        self._ydl.report_warning(
+            f'{action} SQLite cache {os.path.join(self._cache._get_root_dir(), self.FILENAME)!r} failed: '
+            f'{traceback.format_exc()}')
+
+    def load(self, section, key):
+        with self._lock:
+            if (section, key) in self._pending:
+                return json.loads(self._pending[section, key][0])
+            try:
+                row = self._connect().execute(
+                    'SELECT data FROM cache WHERE section = ? AND key = ? AND updated >= ?',
+                    (section, key, time.time() - self.MAX_AGE)).fetchone()
+                return json.loads(row[0]) if row else None
+            except (sqlite3.Error, OSError, ValueError):
+                self._report_error('Reading from')
+
+    def _register_flush_at_exit(self):
+        # The pending writes are not lost when the YoutubeDL instance is never closed
+        if not self._flush_at_exit:
+            atexit.register(self.close)
+            self._flush_at_exit = True
+
+    def store(self, section, key, obj):
+        with self._lock:
+            self._register_flush_at_exit()
+            self._pending[section, key] = (json.dumps(obj, ensure_ascii=False), time.time())
+            if (len(self._pending) >= self._BATCH_SIZE
+                    or time.monotonic() - self._last_flush >= self._FLUSH_INTERVAL):
+                self._flush()
+
+    def _evict(self, connection, section, max_entries):
+        connection.execute(
+            'DELETE FROM cache WHERE section = ? AND key NOT IN ('
+            'SELECT key FROM cache WHERE section = ? ORDER BY updated DESC LIMIT ?)',
+            (section, section, max_entries))
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        pending, self._pending = self._pending, {}
+        prunes, self._prunes = self._prunes, {}
+        if not pending and not prunes:
+            return
+        try:
+            connection = self._connect()
+            # Take the write lock at the start, so that concurrent writers wait for each other instead of failing
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO cache (section, key, data, updated) VALUES (?, ?, ?, ?)',
+                    ((section, key, data, updated) for (section, key), (data, updated) in pending.items()))
+                connection.execute('DELETE FROM cache WHERE updated < ?', (time.time() - self.MAX_AGE,))
+                for section in {section for section, _ in pending}:
+                    self._evict(connection, section, self.MAX_ENTRIES)
+                for section, max_entries in prunes.items():
+                    self._evict(connection, section, max_entries)
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        except (sqlite3.Error, OSError):
+            self._report_error('Writing to')
+
+    def prune(self, section, max_entries):
+        # Applied with the next batch, so that pruning does not take the write lock of the database by itself
+        with self._lock:
+            self._prunes[section] = min(max_entries, self._prunes.get(section, max_entries))
+            self._register_flush_at_exit()
+
+    def close(self):
+        with self._lock:
+            if self._flush_at_exit:
+                atexit.unregister(self.close)
+                self._flush_at_exit = False
+            self._flush()
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+
+_CACHE_BACKENDS = {
+    'file': FileCacheBackend,
+    'sqlite': SQLiteCacheBackend,
+}
+
+
 class Cache:
     def __init__(self, ydl):
         self._ydl = ydl
+        self.__backend = None
 
     def _get_root_dir(self):
         res = self._ydl.params.get('cachedir')
@@ -21,10 +223,17 @@ def _get_root_dir(self):
             res = os.path.join(cache_root, 'yt-dlp')
         return expand_path(res)
 
-    def _get_cache_fn(self, section, key, dtype):
-        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
-        key = urllib.parse.quote(key, safe='').replace('%', ',')  # encode non-ascii characters
-        return os.path.join(self._get_root_dir(), section, f'{key}.{dtype}')
+    @property
+    def _backend(self):
+        if not self.__backend:
+            name = self._ydl.params.get('cache_backend') or 'file'
+            if name == 'sqlite' and not sqlite3:
+                self._ydl.report_warning(
+                    'Cannot use the SQLite cache without sqlite3 support; falling back to the file cache. '
+                    'Please use a Python interpreter compiled with sqlite3 support')
+                name = 'file'
+            self.__backend = _CACHE_BACKENDS[name](self)
+        return self.__backend
 
     @property
     def enabled(self):
@@ -32,18 +241,13 @@ def enabled(self):
 
     def store(self, section, key, data, dtype='json'):
         assert dtype in ('json',)
+        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
 
         if not self.enabled:
             return
 
-        fn = self._get_cache_fn(section, key, dtype)
-        try:
-            os.makedirs(os.path.dirname(fn), exist_ok=True)
-            self._ydl.write_debug(f'Saving {section}.{key} to cache')
-            write_json_file({'yt-dlp_version': __version__, 'data': data}, fn)
-        except Exception:
-            tb = traceback.format_exc()
-            self._ydl.report_warning(f'Writing cache to {fn!r} failed: {tb}')
+        self._ydl.write_debug(f'Saving {section}.{key} to cache')
+        self._backend.store(section, key, {'yt-dlp_version': __version__, 'data': data})
 
     def _validate(self, data, min_ver):
         version = traverse_obj(data, 'yt-dlp_version')
@@ -55,25 +259,32 @@ def _validate(self, data, min_ver):
 
     def load(self, section, key, dtype='json', default=None, *, min_ver=None):
         assert dtype in ('json',)
+        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
 
         if not self.enabled:
             return default
 
-        cache_fn = self._get_cache_fn(section, key, dtype)
-        with contextlib.suppress(OSError):
-            try:
-                with open(cache_fn, encoding='utf-8') as cachef:
-                    self._ydl.write_debug(f'Loading {section}.{key} from cache')
-                    return self._validate(json.load(cachef), min_ver)
-            except (ValueError, KeyError):
-                try:
-                    file_size = os.path.getsize(cache_fn)
-                except OSError as oe:
-                    file_size = str(oe)
-                self._ydl.report_warning(f'Cache retrieval from {cache_fn} failed ({file_size})')
-
+        data = self._backend.load(section, key)
+        if data is None:
+            return default
+        self._ydl.write_debug(f'Loading {section}.{key} from cache')
+        try:
+            return self._validate(data, min_ver)
+        except KeyError:
+            self._ydl.report_warning(f'Cache retrieval of {section}.{key} failed (invalid entry)')
         return default
 
+    def prune(self, section, max_entries):
+        """Remove all but the max_entries most recently written entries of a section, possibly not right away"""
+        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
+
+        if self.enabled:
+            self._backend.prune(section, max_entries)
+
+    def close(self):
+        if self.__backend:
+            self.__backend.close()
+
     def remove(self):
         if not self.enabled:
             self._ydl.to_screen('Cache is disabled (Did you combine --no-cache-dir and --rm-cache-dir?)')
@@ -85,6 +296,8 @@ def remove(self):
 
         self._ydl.to_screen(
             f'Removing cache dir {cachedir} .', skip_eol=True)
+        self.close()
+        self.__backend = None
         if os.path.exists(cachedir):
             self._ydl.to_screen('.', skip_eol=True)
             shutil.rmtree(cachedir)
@@ -110,7 +110,7 @@ def _get_suitable_downloader(info_dict, protocol, params, default):
 
     if protocol in ('m3u8', 'm3u8_native'):
         if info_dict.get('is_live'):
-            return FFmpegFD
+            return HlsFD if params.get('hls_native_live') else FFmpegFD
         elif (external_downloader or '').lower() == 'native':
             return HlsFD
         elif protocol == 'm3u8_native' and get_suitable_downloader(
@@ -71,9 +71,12 @@ class FileDownloader:
                         passed to all downloaders. For compatibility with youtube-dl,
                         a single list of args can also be used
     hls_use_mpegts:     Use the mpegts container for HLS videos.
+    hls_native_live:    Download live HLS streams natively by refreshing the playlist
     http_chunk_size:    Size of a chunk for chunk-based HTTP downloading. May be
                         useful for bypassing bandwidth throttling imposed by
                         a webserver (experimental)
+    http_connections:   Number of connections used to download a file in
+                        parallel ranges
     progress_template:  See YoutubeDL.py
     retry_sleep_functions: See YoutubeDL.py
 
@@ -1,28 +1,222 @@
 import concurrent.futures
 import contextlib
+import io
 import json
 import math
 import os
 import struct
+import threading
 import time
+import urllib.parse
 
 from .common import FileDownloader
 from .http import HttpFD
 from ..aes import aes_cbc_decrypt_bytes, unpad_pkcs7
 from ..compat import compat_os_name
-from ..networking import Request
-from ..networking.exceptions import HTTPError, IncompleteRead
-from ..utils import DownloadError, RetryManager, encodeFilename, traverse_obj
+from ..networking import HEADRequest, Request
+from ..networking.exceptions import HTTPError, IncompleteRead, RequestError
+from ..utils import NO_DEFAULT, DownloadError, RetryManager, encodeFilename, traverse_obj
 from ..utils.networking import HTTPHeaderDict
 from ..utils.progress import ProgressCalculator
 
 
 class HttpQuietDownloader(HttpFD):
+    retry_callback = None
+
     def to_screen(self, *args, **kargs):
         pass
 
     to_console_title = to_screen
 
+    def report_retry(self, err, *args, **kwargs):
+        if self.retry_callback:
+            self.retry_callback(err)
+        return super().report_retry(err, *args, **kwargs)
+
+
+class _FragmentBuffer:
+    """
+    File-like object that holds a fragment in memory while the shared
+    memory budget of its downloader allows it, and spills to the
+    fragment file on disk otherwise
+    """
+
+    def __init__(self, fd, filename, open_mode):
+        self._fd = fd
+        self._filename = filename
+        self._buffer = io.BytesIO()
+        self._reserved = 0
+        self._spill = None
+        if open_mode == 'ab' and os.path.isfile(encodeFilename(filename)):
+            self._spill_to_disk(open_mode)
+
+    def _spill_to_disk(self, open_mode='wb'):
+        self._spill = self._fd._open_fragment_file(self._filename, open_mode)
+        if self._buffer is not None:
+            self._spill.write(self._buffer.getvalue())
+            self._buffer = None
+            self._release()
+
+    def _release(self):
+        self._fd._release_buffer_memory(self._reserved)
+        self._reserved = 0
+
+    def write(self, data):
+        if self._buffer is not None:
+            if self._fd._reserve_buffer_memory(len(data)):
+                self._reserved += len(data)
+                return self._buffer.write(data)
+            self._spill_to_disk()
+        return self._spill.write(data)
+
+    def flush(self):
+        if self._spill is not None:
+            self._spill.flush()
+
+    def close(self):
+        # The content is kept until it is read with getvalue() or discarded
+        if self._spill is not None:
+            self._spill.close()
+
+    def getvalue(self):
+        if self._buffer is None:
+            self.close()
+            with open(encodeFilename(self._filename), 'rb') as f:
+                return f.read()
+        data = self._buffer.getvalue()
+        self.discard()
+        return data
+
+    def discard(self):
+        self.close()
+        self._buffer = None
+        self._release()
+
+
+class HttpBufferedDownloader(HttpQuietDownloader):
+    """
+    Downloads fragments into memory instead of temporary files.
+    At most fragment_buffer_size bytes are held in memory at once (shared by
+    all the fragments being downloaded); fragments that do not fit are
+    written to disk as usual
+    """
+
+    def __init__(self, ydl, params):
+        super().__init__(ydl, params)
+        self._buffers = {}
+        self._buffer_lock = threading.Lock()
+        self._buffer_memory_left = params['fragment_buffer_size']
+
+    def _reserve_buffer_memory(self, size):
+        with self._buffer_lock:
+            if size > self._buffer_memory_left:
+                return False
+            self._buffer_memory_left -= size
+            return True
+
+    def _release_buffer_memory(self, size):
+        with self._buffer_lock:
+            self._buffer_memory_left += size
+
+    def _open_fragment_file(self, filename, open_mode):
+        return super().sanitize_open(filename, open_mode)[0]
+
+    def sanitize_open(self, filename, open_mode):
+        old_buffer = self._buffers.get(filename)
+        if old_buffer is not None:
+            old_buffer.discard()
+        self._buffers[filename] = _FragmentBuffer(self, filename, open_mode)
+        return self._buffers[filename], filename
+
+    def pop_buffer(self, filename):
+        return self._buffers.pop(filename, None)
+
+    def real_download(self, filename, info_dict):
+        success = False
+        try:
+            success = super().real_download(filename, info_dict)
+        finally:
+            if not success:
+                buffer = self.pop_buffer(filename)
+                if buffer is not None:
+                    buffer.discard()
+        return success
+
+
+class FragmentConcurrencyController:
+    """
+    Adjusts the number of fragments downloaded at once between 1 and max_workers
+    (additive increase, multiplicative decrease).
+
+    The limit is doubled (slow start) and later increased by one after each round
+    of `limit` fragments whose throughput improved on the previous round without
+    retries. It is halved whenever the server answers with a throttling status,
+    and decreased by one when the throughput drops or many fragments need retries.
+    A single controller may be shared by the downloads of several formats
+    """
+
+    _THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.limit = 1
+        self._active = 0
+        self._speed = None
+        self._slow_start = True
+        self._cond = threading.Condition()
+        self._start_round()
+
+    def _start_round(self):
+        self._round_start = time.time()
+        self._round_bytes = self._round_fragments = self._round_retries = 0
+
+    def _set_limit(self, limit):
+        self.limit = max(1, min(limit, self.max_workers))
+        self._cond.notify_all()
+
+    def acquire(self, blocking=True):
+        with self._cond:
+            while self._active >= self.limit:
+                if not blocking:
+                    return False
+                self._cond.wait()
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def report_retry(self, err):
+        with self._cond:
+            self._round_retries += 1
+            if isinstance(err, HTTPError) and err.status in self._THROTTLE_STATUSES:
+                self._slow_start = False
+                self._speed = None
+                self._set_limit(self.limit // 2)
+                self._start_round()
+
+    def report_fragment(self, size):
+        with self._cond:
+            self._round_bytes += size
+            self._round_fragments += 1
+            if self._round_fragments < self.limit:
+                return
+            speed = FileDownloader.calc_speed(self._round_start, time.time(), self._round_bytes)
+            if self._round_retries > self._round_fragments / 4:
+                self._slow_start = False
+                self._set_limit(self.limit - 1)
+            elif speed and self._speed and speed < self._speed * 0.8:
+                self._slow_start = False
+                self._set_limit(self.limit - 1)
+            elif not self._round_retries and speed and (not self._speed or speed > self._speed * 1.05):
+                self._set_limit(self.limit * 2 if self._slow_start else self.limit + 1)
+            else:
+                self._slow_start = False
+            self._speed = speed
+            self._start_round()
+
 
 class FragmentFD(FileDownloader):
     """
@@ -37,6 +231,22 @@ class FragmentFD(FileDownloader):
     keep_fragments:     Keep downloaded fragments on disk after downloading is
                         finished
     concurrent_fragment_downloads:  The number of threads to use for native hls and dash downloads
+    connection_pool_size:
+                        If set, connections to the fragment host are opened
+                        before the first fragment is downloaded (see YoutubeDL.py)
+    adaptive_concurrent_fragments:
+                        Treat concurrent_fragment_downloads as the maximum and
+                        adjust the number of concurrent fragment downloads to the
+                        measured throughput and throttling of the server
+    fragment_window:    Maximum number of fragments that may be downloaded or held
+                        while waiting for an earlier fragment to be appended when
+                        concurrent_fragment_downloads > 1. Default is twice the
+                        number of concurrent fragments
+    fragment_buffer_size:
+                        Maximum number of bytes of fragments to hold in memory
+                        instead of writing them to temporary files. Fragments
+                        exceeding this are written to disk. Ignored with
+                        keep_fragments (DASH and hlsnative only)
     _no_ytdl_file:      Don't use .ytdl file
 
     For each incomplete fragment download yt-dlp keeps on disk a special
@@ -60,6 +270,11 @@ class FragmentFD(FileDownloader):
     This feature is experimental and file format may change in future.
     """
 
+    # Yielded by a source of fragments that has no new fragment yet, e.g. a live playlist between refreshes.
+    # The downloaded fragments are then appended while it is asked again every _FRAGMENT_POLL_INTERVAL
+    _FRAGMENT_NOT_READY = object()
+    _FRAGMENT_POLL_INTERVAL = 0.1
+
     def report_retry_fragment(self, err, frag_index, count, retries):
         self.deprecation_warning('yt_dlp.downloader.FragmentFD.report_retry_fragment is deprecated. '
                                  'Use yt_dlp.downloader.FileDownloader.report_retry instead')
@@ -133,6 +348,10 @@ def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_dat
     def _read_fragment(self, ctx):
         if not ctx.get('fragment_filename_sanitized'):
             return None
+        if isinstance(ctx['dl'], HttpBufferedDownloader):
+            buffer = ctx['dl'].pop_buffer(ctx['fragment_filename_sanitized'])
+            if buffer is not None:
+                return buffer.getvalue()
         try:
             down, frag_sanitized = self.sanitize_open(ctx['fragment_filename_sanitized'], 'rb')
         except FileNotFoundError:
@@ -165,14 +384,23 @@ def _prepare_frag_download(self, ctx):
             total_frags_str = 'unknown (live)'
         self.to_screen(f'[{self.FD_NAME}] Total fragments: {total_frags_str}')
         self.report_destination(ctx['filename'])
-        dl = HttpQuietDownloader(self.ydl, {
+        dl_params = {
             **self.params,
             'noprogress': True,
             'test': False,
             'sleep_interval': 0,
             'max_sleep_interval': 0,
             'sleep_interval_subtitles': 0,
-        })
+            'http_connections': 1,
+        }
+        if self.params.get('fragment_buffer_size') and not self.params.get('keep_fragments'):
+            dl = HttpBufferedDownloader(self.ydl, {
+                **dl_params,
+                'nopart': True,
+                'xattr_set_filesize': False,
+            })
+        else:
+            dl = HttpQuietDownloader(self.ydl, dl_params)
         tmpfilename = self.temp_name(ctx['filename'])
         open_mode = 'wb'
 
@@ -339,6 +567,46 @@ def _prepare_external_frag_download(self, ctx):
             'fragment_index': 0,
         })
 
+    def _report_fragment_latencies(self, latencies):
+        """Print per-host and slowest fragment download times in verbose mode"""
+        if not self.params.get('verbose') or not latencies:
+            return
+        by_host = {}
+        for _, url, latency in latencies:
+            by_host.setdefault(urllib.parse.urlparse(url).netloc, []).append(latency)
+        self.write_debug(f'[{self.FD_NAME}] Fragment latency by host: ' + ', '.join(
+            f'{host} avg {sum(times) / len(times):.2f}s, max {max(times):.2f}s ({len(times)} fragments)'
+            for host, times in sorted(by_host.items(), key=lambda x: max(x[1]), reverse=True)))
+        self.write_debug(f'[{self.FD_NAME}] Slowest fragments: ' + ', '.join(
+            f'{frag_index} ({latency:.2f}s)'
+            for frag_index, _, latency in sorted(latencies, key=lambda x: x[2], reverse=True)[:5]))
+
+    def _connection_stats(self):
+        """Total number of HTTP connections opened and reused by the request handlers"""
+        opened = reused = 0
+        for rh in self.ydl._request_director.handlers.values():
+            stats = getattr(rh, 'connection_stats', None)
+            if stats:
+                rh_opened, rh_reused = stats.snapshot()
+                opened, reused = opened + rh_opened, reused + rh_reused
+        return opened, reused
+
+    def _report_connection_stats(self, initial_stats):
+        if not self.params.get('verbose'):
+            return
+        (opened, reused), (initial_opened, initial_reused) = self._connection_stats(), initial_stats
+        if opened != initial_opened or reused != initial_reused:
+            self.write_debug(
+                f'[{self.FD_NAME}] HTTP connections: {opened - initial_opened} opened, {reused - initial_reused} reused')
+
+    def _warm_up_connections(self, pool, url, info_dict, count):
+        """Open connections to the fragment host in parallel, so that they can be reused by the first fragments"""
+        def warm_up():
+            with contextlib.suppress(RequestError):
+                self.ydl.urlopen(HEADRequest(url, headers=info_dict.get('http_headers'))).read()
+
+        concurrent.futures.wait([pool.submit(warm_up) for _ in range(count)])
+
     def decrypter(self, info_dict):
         _key_cache = {}
 
@@ -377,6 +645,12 @@ def download_and_append_fragments_multiple(self, *args, **kwargs):
         max_workers = self.params.get('concurrent_fragment_downloads', 1)
         if max_progress > 1:
             self._prepare_multiline_status(max_progress)
+        if self.params.get('adaptive_concurrent_fragments') and max_workers > 1:
+            # All formats share the limit, so any of them may use all the workers
+            kwargs['concurrency'] = FragmentConcurrencyController(max_workers)
+            pool_size = max_workers + 1
+        else:
+            pool_size = math.ceil(max_workers / max_progress)
         is_live = any(traverse_obj(args, (..., 2, 'is_live')))
 
         def thread_func(idx, ctx, fragments, info_dict, tpe):
@@ -411,7 +685,7 @@ def interrupt_trigger_iter(fg):
 
         spins = []
         for idx, (ctx, fragments, info_dict) in enumerate(args):
-            tpe = FTPE(math.ceil(max_workers / max_progress))
+            tpe = FTPE(pool_size)
             job = tpe.submit(thread_func, idx, ctx, interrupt_trigger_iter(fragments), info_dict, tpe)
             spins.append((tpe, job))
 
@@ -432,7 +706,7 @@ def interrupt_trigger_iter(fg):
     def download_and_append_fragments(
             self, ctx, fragments, info_dict, *, is_fatal=(lambda idx: False),
             pack_func=(lambda content, idx: content), finish_func=None,
-            tpe=None, interrupt_trigger=(True, )):
+            tpe=None, interrupt_trigger=(True, ), concurrency=None):
 
         if not self.params.get('skip_unavailable_fragments', True):
             is_fatal = lambda _: True
@@ -456,7 +730,10 @@ def error_callback(err, count, retries):
                     ctx['dest_stream'].close()
                 self.report_retry(err, count, retries, frag_index, fatal)
                 ctx['last_error'] = err
+                if concurrency is not None:
+                    concurrency.report_retry(err)
 
+            start_time = time.monotonic()
             for retry in RetryManager(self.params.get('fragment_retries'), error_callback):
                 try:
                     ctx['fragment_count'] = fragment.get('fragment_count')
@@ -469,6 +746,8 @@ def error_callback(err, count, retries):
                 except DownloadError:  # has own retry settings
                     if fatal:
                         raise
+            if ctx.get('fragment_filename_sanitized'):
+                fragment_latencies.append((frag_index, fragment['url'], time.monotonic() - start_time))
 
         def append_fragment(frag_content, frag_index, ctx):
             if frag_content:
@@ -482,35 +761,115 @@ def append_fragment(frag_content, frag_index, ctx):
             return True
 
         decrypt_fragment = self.decrypter(info_dict)
+        fragment_latencies = []
+        connection_stats = self._connection_stats()
+
+        max_workers = self.params.get('concurrent_fragment_downloads', 1)
+        if concurrency is None and self.params.get('adaptive_concurrent_fragments') and max_workers > 1:
+            concurrency = FragmentConcurrencyController(max_workers)
+        if concurrency is None:
+            max_workers = math.ceil(max_workers / ctx.get('max_progress', 1))
+        else:
+            ctx['dl'].retry_callback = concurrency.report_retry
 
-        max_workers = math.ceil(
-            self.params.get('concurrent_fragment_downloads', 1) / ctx.get('max_progress', 1))
         if max_workers > 1:
             def _download_fragment(fragment):
                 ctx_copy = ctx.copy()
-                download_fragment(fragment, ctx_copy)
+                try:
+                    download_fragment(fragment, ctx_copy)
+                finally:
+                    if concurrency is not None:
+                        concurrency.release()
                 return fragment, fragment['frag_index'], ctx_copy.get('fragment_filename_sanitized')
 
+            # Fragments may finish in any order, but are appended in order. The window bounds
+            # the number of fragments that are in flight or waiting for an earlier one
+            window = max(self.params.get('fragment_window') or 2 * max_workers, max_workers)
+            fragments = iter(fragments)
+            pending, finished = {}, {}
+            next_index = submitted = 0
+
+            def append_finished():
+                nonlocal next_index
+                while next_index in finished:
+                    fragment, frag_index, frag_filename = finished.pop(next_index)
+                    next_index += 1
+                    ctx.update({
+                        'fragment_filename_sanitized': frag_filename,
+                        'fragment_index': frag_index,
+                    })
+                    frag_content = decrypt_fragment(fragment, self._read_fragment(ctx))
+                    if concurrency is not None:
+                        concurrency.report_fragment(len(frag_content or b''))
+                    if not append_fragment(frag_content, frag_index, ctx):
+                        return False
+                return True
+
             with tpe or concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
                 try:
-                    for fragment, frag_index, frag_filename in pool.map(_download_fragment, fragments):
-                        ctx.update({
-                            'fragment_filename_sanitized': frag_filename,
-                            'fragment_index': frag_index,
-                        })
-                        if not append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx):
+                    next_fragment = next(fragments, NO_DEFAULT)
+                    warm_up_url = traverse_obj(next_fragment, 'url')
+                    if warm_up_url and self.params.get('connection_pool_size') and not self.params.get('test'):
+                        self._warm_up_connections(
+                            pool, warm_up_url, info_dict, min(max_workers, self.params['connection_pool_size']))
+                    while True:
+                        not_ready = False
+                        while len(pending) + len(finished) < window:
+                            if next_fragment is NO_DEFAULT:
+                                next_fragment = next(fragments, NO_DEFAULT)
+                                if next_fragment is NO_DEFAULT:
+                                    break
+                            if next_fragment is self._FRAGMENT_NOT_READY:
+                                next_fragment, not_ready = NO_DEFAULT, True
+                                break
+                            # Only wait for a free slot when there is nothing else to do
+                            if concurrency is not None and not concurrency.acquire(blocking=not pending):
+                                break
+                            pending[pool.submit(_download_fragment, next_fragment)] = submitted
+                            submitted += 1
+                            next_fragment = NO_DEFAULT
+                        if not pending:
+                            if not_ready:
+                                time.sleep(self._FRAGMENT_POLL_INTERVAL)
+                                continue
+                            break
+                        # The fragments that are not ready yet are asked for again shortly
+                        done, _ = concurrent.futures.wait(
+                            pending, timeout=self._FRAGMENT_POLL_INTERVAL if not_ready else None,
+                            return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            finished[pending.pop(future)] = future.result()
+                        if not append_finished():
                             return False
                 except KeyboardInterrupt:
                     self._finish_multiline_status()
-                    self.report_error(
-                        'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
-                    pool.shutdown(wait=False)
-                    raise
+                    if not info_dict.get('is_live'):
+                        self.report_error(
+                            'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
+                        pool.shutdown(wait=False)
+                        raise
+                    # Finish the recording with the fragments that are already being downloaded.
+                    # The pool starts them in order, so the cancelled ones are all after those
+                    self.to_screen(f'[{self.FD_NAME}] Interrupted by user; finishing the download')
+                    for future in pending:
+                        future.cancel()
+                    concurrent.futures.wait(pending)
+                    finished.update(
+                        (index, future.result()) for future, index in pending.items() if not future.cancelled())
+                    pending.clear()
+                    if not append_finished():
+                        return False
+                finally:
+                    for future in pending:
+                        future.cancel()
         else:
             for fragment in fragments:
                 if not interrupt_trigger[0]:
                     break
                 try:
+                    if fragment is self._FRAGMENT_NOT_READY:
+                        time.sleep(self._FRAGMENT_POLL_INTERVAL)
+                        continue
                     download_fragment(fragment, ctx)
                     result = append_fragment(
                         decrypt_fragment(fragment, self._read_fragment(ctx)), fragment['frag_index'], ctx)
@@ -524,4 +883,6 @@ def _download_fragment(fragment):
         if finish_func is not None:
             ctx['dest_stream'].write(finish_func())
             ctx['dest_stream'].flush()
+        self._report_fragment_latencies(fragment_latencies)
+        self._report_connection_stats(connection_stats)
         return self._finish_frag_download(ctx, info_dict)
@@ -1,6 +1,9 @@
 import binascii
 import io
+import queue
 import re
+import threading
+import time
 import urllib.parse
 
 from . import get_suitable_downloader
@@ -8,8 +11,10 @@
 from .fragment import FragmentFD
 from .. import webvtt
 from ..dependencies import Cryptodome
+from ..networking.exceptions import RequestError
 from ..utils import (
     bug_reports_message,
+    float_or_none,
     parse_m3u8_attributes,
     remove_start,
     traverse_obj,
@@ -26,6 +31,8 @@ class HlsFD(FragmentFD):
     """
 
     FD_NAME = 'hlsnative'
+    # Stop refreshing a live playlist that has not changed for this many target durations
+    _LIVE_STALL_FACTOR = 6
 
     @staticmethod
     def _has_drm(manifest):  # TODO: https://github.com/yt-dlp/yt-dlp/pull/5039
@@ -37,7 +44,7 @@ def _has_drm(manifest):  # TODO: https://github.com/yt-dlp/yt-dlp/pull/5039
         )), manifest))
 
     @classmethod
-    def can_download(cls, manifest, info_dict, allow_unplayable_formats=False):
+    def can_download(cls, manifest, info_dict, allow_unplayable_formats=False, allow_live=False):
         UNSUPPORTED_FEATURES = [
             # r'#EXT-X-BYTERANGE',  # playlists composed of byte ranges of media files [2]
 
@@ -63,7 +70,7 @@ def can_download(cls, manifest, info_dict, allow_unplayable_formats=False):
             ]
 
         def check_results():
-            yield not info_dict.get('is_live')
+            yield allow_live or not info_dict.get('is_live')
             for feature in UNSUPPORTED_FEATURES:
                 yield not re.search(feature, manifest)
             if not allow_unplayable_formats:
@@ -78,7 +85,11 @@ def real_download(self, filename, info_dict):
         man_url = urlh.url
         s = urlh.read().decode('utf-8', 'ignore')
 
-        can_download, message = self.can_download(s, info_dict, self.params.get('allow_unplayable_formats')), None
+        native_live = self.params.get('hls_native_live')
+        can_download, message = self.can_download(
+            s, info_dict, self.params.get('allow_unplayable_formats'), allow_live=native_live), None
+        live = native_live and '#EXT-X-ENDLIST' not in s and (
+            info_dict.get('is_live') or re.search(r'(?m)#EXT-X-MEDIA-SEQUENCE:(?!0$)', s))
         if can_download:
             has_ffmpeg = FFmpegFD.available()
             no_crypto = not Cryptodome.AES and '#EXT-X-KEY:METHOD=AES-128' in s
@@ -87,10 +98,11 @@ def real_download(self, filename, info_dict):
             elif no_crypto:
                 message = ('The stream has AES-128 encryption and neither ffmpeg nor pycryptodomex are available; '
                            'Decryption will be performed natively, but will be extremely slow')
-            elif info_dict.get('extractor_key') == 'Generic' and re.search(r'(?m)#EXT-X-MEDIA-SEQUENCE:(?!0$)', s):
+            elif not native_live and info_dict.get('extractor_key') == 'Generic' and re.search(r'(?m)#EXT-X-MEDIA-SEQUENCE:(?!0$)', s):
                 install_ffmpeg = '' if has_ffmpeg else 'install ffmpeg and '
-                message = ('Live HLS streams are not supported by the native downloader. If this is a livestream, '
-                           f'please {install_ffmpeg}add "--downloader ffmpeg --hls-use-mpegts" to your command')
+                message = ('Live HLS streams are only supported by the native downloader with --hls-native-live. '
+                           f'If this is a livestream, please add it or {install_ffmpeg}add '
+                           '"--downloader ffmpeg --hls-use-mpegts" to your command')
         if not can_download:
             if self._has_drm(s) and not self.params.get('allow_unplayable_formats'):
                 if info_dict.get('has_drm') and self.params.get('test'):
@@ -110,6 +122,8 @@ def real_download(self, filename, info_dict):
         is_webvtt = info_dict['ext'] == 'vtt'
         if is_webvtt:
             real_downloader = None  # Packing the fragments is not currently supported for external downloader
+        elif live:
+            real_downloader = None  # External downloaders need the complete list of fragments
         else:
             real_downloader = get_suitable_downloader(
                 info_dict, self.params, None, protocol='m3u8_frag_urls', to_stdout=(filename == '-'))
@@ -126,8 +140,6 @@ def is_ad_fragment_end(s):
             return (s.startswith('#ANVATO-SEGMENT-INFO') and 'type=master' in s
                     or s.startswith('#UPLYNK-SEGMENT') and s.endswith(',segment'))
 
-        fragments = []
-
         media_frags = 0
         ad_frags = 0
         ad_frag_next = False
@@ -150,6 +162,7 @@ def is_ad_fragment_end(s):
             'filename': filename,
             'total_frags': media_frags,
             'ad_frags': ad_frags,
+            'live': bool(live),
         }
 
         if real_downloader:
@@ -166,8 +179,6 @@ def is_ad_fragment_end(s):
         extra_key_query = None
         if extra_param_to_key_url := info_dict.get('extra_param_to_key_url'):
             extra_key_query = urllib.parse.parse_qs(extra_param_to_key_url)
-        i = 0
-        media_sequence = 0
         decrypt_info = {'METHOD': 'NONE'}
         external_aes_key = traverse_obj(info_dict, ('hls_aes', 'key'))
         if external_aes_key:
@@ -176,14 +187,29 @@ def is_ad_fragment_end(s):
         external_aes_iv = traverse_obj(info_dict, ('hls_aes', 'iv'))
         if external_aes_iv:
             external_aes_iv = binascii.unhexlify(remove_start(external_aes_iv, '0x').zfill(32))
-        byte_range = {}
-        discontinuity_count = 0
         frag_index = 0
-        ad_frag_next = False
-        for line in s.splitlines():
-            line = line.strip()
-            if line:
+        init_map = None
+        last_sequence = None
+
+        def parse_fragments(s, man_url, refresh=False):
+            # When refreshing a live playlist, only the segments that were not seen yet are returned
+            nonlocal decrypt_info, frag_index, init_map, last_sequence
+            fragments = []
+            media_sequence = segment_sequence = 0
+            byte_range = {}
+            discontinuity_count = 0
+            ad_frag_next = False
+            for line in s.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
                 if not line.startswith('#'):
+                    sequence = segment_sequence
+                    segment_sequence += 1
+                    if refresh and last_sequence is not None and sequence <= last_sequence:
+                        media_sequence += 1
+                        continue
+                    last_sequence = sequence
                     if format_index and discontinuity_count != format_index:
                         continue
                     if ad_frag_next:
@@ -207,11 +233,10 @@ def is_ad_fragment_end(s):
                 elif line.startswith('#EXT-X-MAP'):
                     if format_index and discontinuity_count != format_index:
                         continue
-                    if frag_index > 0:
+                    if frag_index > 0 and not refresh:
                         self.report_error(
                             'Initialization fragment found after media fragments, unable to download')
-                        return False
-                    frag_index += 1
+                        return None
                     map_info = parse_m3u8_attributes(line[11:])
                     frag_url = urljoin(man_url, map_info.get('URI'))
                     if extra_segment_query:
@@ -225,6 +250,11 @@ def is_ad_fragment_end(s):
                             'end': sub_range_start + int(splitted_byte_range[0]),
                         }
 
+                    # Live playlists repeat the initialization fragment on every refresh
+                    if refresh and init_map == (frag_url, byte_range):
+                        continue
+                    init_map = (frag_url, byte_range)
+                    frag_index += 1
                     fragments.append({
                         'frag_index': frag_index,
                         'url': frag_url,
@@ -254,7 +284,7 @@ def is_ad_fragment_end(s):
                                 decrypt_info['KEY'] = None
 
                 elif line.startswith('#EXT-X-MEDIA-SEQUENCE'):
-                    media_sequence = int(line[22:])
+                    media_sequence = segment_sequence = int(line[22:])
                 elif line.startswith('#EXT-X-BYTERANGE'):
                     splitted_byte_range = line[17:].split('@')
                     sub_range_start = int(splitted_byte_range[1]) if len(splitted_byte_range) == 2 else byte_range['end']
@@ -266,13 +296,75 @@ def is_ad_fragment_end(s):
                     ad_frag_next = True
                 elif is_ad_fragment_end(line):
                     ad_frag_next = False
+                elif live and line.startswith('#EXT-X-DISCONTINUITY-SEQUENCE'):
+                    # Segments are removed from the start of live playlists along with their discontinuities
+                    discontinuity_count = int(line[30:])
                 elif line.startswith('#EXT-X-DISCONTINUITY'):
                     discontinuity_count += 1
-                i += 1
+            return fragments
+
+        def refresh_playlist(fragments, s, man_url, new_fragments, stop):
+            """Put the new fragments of each refresh of the live playlist into new_fragments, and None at its end"""
+            try:
+                last_refresh = stalled_since = time.monotonic()
+                while '#EXT-X-ENDLIST' not in s:
+                    target_duration = float_or_none(traverse_obj(
+                        re.search(r'#EXT-X-TARGETDURATION:(\d+(?:\.\d+)?)', s), 1)) or 10
+                    # Reload after the target duration, or half of it if the playlist did not change (RFC 8216, 6.3.4)
+                    interval = target_duration if fragments else target_duration / 2
+                    if stop.wait(max(0, interval - (time.monotonic() - last_refresh))):
+                        return
+                    last_refresh = time.monotonic()
+                    try:
+                        urlh = self.ydl.urlopen(self._prepare_url(info_dict, man_url))
+                        s, man_url = urlh.read().decode('utf-8', 'ignore'), urlh.url
+                    except RequestError as err:
+                        self.report_warning(f'Unable to refresh m3u8 manifest: {err}')
+                        fragments = []
+                    else:
+                        fragments = parse_fragments(s, man_url, refresh=True)
+                    if fragments:
+                        stalled_since = last_refresh
+                    elif last_refresh - stalled_since > self._LIVE_STALL_FACTOR * target_duration:
+                        self.report_warning(
+                            'The m3u8 manifest stopped receiving new fragments; finishing the download')
+                        return
+                    new_fragments.put(fragments)
+            except Exception as err:
+                new_fragments.put(err)
+            finally:
+                new_fragments.put(None)
+
+        def live_fragments(fragments, s, man_url):
+            # The playlist is refreshed by another thread, so that the downloaded fragments are appended meanwhile
+            yield from fragments
+            new_fragments, stop = queue.Queue(), threading.Event()
+            threading.Thread(
+                target=refresh_playlist, args=(fragments, s, man_url, new_fragments, stop), daemon=True).start()
+            try:
+                while True:
+                    try:
+                        fragments = new_fragments.get_nowait()
+                    except queue.Empty:
+                        yield self._FRAGMENT_NOT_READY
+                        continue
+                    if fragments is None:
+                        return
+                    elif isinstance(fragments, Exception):
+                        raise fragments
+                    yield from fragments
+            finally:
+                stop.set()
+
+        fragments = parse_fragments(s, man_url)
+        if fragments is None:
+            return False
 
         # We only download the first fragment during the test
         if self.params.get('test', False):
             fragments = [fragments[0] if fragments else None]
+        elif live:
+            fragments = live_fragments(fragments, s, man_url)
 
         if real_downloader:
             info_dict['fragments'] = fragments
@@ -372,7 +464,7 @@ def fin_fragments():
 
                 return output.getvalue().encode()
 
-            if len(fragments) == 1:
+            if not live and len(fragments) == 1:
                 self.download_and_append_fragments(ctx, fragments, info_dict)
             else:
                 self.download_and_append_fragments(
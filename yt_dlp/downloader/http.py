@@ -1,5 +1,9 @@
+import concurrent.futures
+import json
+import math
 import os
 import random
+import threading
 import time
 
 from .common import FileDownloader
@@ -7,6 +11,7 @@
 from ..networking.exceptions import (
     CertificateVerifyError,
     HTTPError,
+    RequestError,
     TransportError,
 )
 from ..utils import (
@@ -25,6 +30,9 @@
 
 
 class HttpFD(FileDownloader):
+    # Files are only split into ranges of at least this size
+    _MIN_RANGE_SIZE = 1024 * 1024
+
     def real_download(self, filename, info_dict):
         url = info_dict['url']
         request_data = info_dict.get('request_data', None)
@@ -64,6 +72,14 @@ class DownloadContext(dict):
 
         ctx.is_resume = ctx.resume_len > 0
 
+        connections = self.params.get('http_connections') or 1
+        if (connections > 1 and not is_test and ctx.tmpfilename != '-' and req_start is None and req_end is None
+                # A partial download without range state can only be resumed by a single connection
+                and (not ctx.is_resume or os.path.isfile(encodeFilename(self.ytdl_filename(filename))))):
+            result = self._download_ranges(ctx.filename, ctx.tmpfilename, info_dict, headers, connections, chunk_size)
+            if result is not None:
+                return result
+
         class SucceedDownload(Exception):
             pass
 
@@ -381,3 +397,186 @@ def retry(e):
                 close_stream()
                 raise
         return False
+
+    def _download_ranges(self, filename, tmpfilename, info_dict, headers, connections, chunk_size):
+        """
+        Download the file with several connections, each one fetching a range of it into
+        its place in the preallocated temporary file. The progress of every range is kept
+        in the .ytdl file so that the download can be resumed.
+
+        Returns None when the server does not support ranges or the file is too small to be split
+        """
+        url, request_data = info_dict['url'], info_dict.get('request_data')
+
+        def open_range(start, end):
+            request = Request(url, request_data, headers)
+            request.headers['Range'] = f'bytes={start}-{end}'
+            data = self.ydl.urlopen(request)
+            content_start, _, content_len = parse_http_range(data.headers.get('Content-Range'))
+            if content_start != start or data.headers.get('Content-encoding'):
+                data.close()
+                return None, None
+            return data, content_len
+
+        try:
+            probe, content_len = open_range(0, 0)
+        except RequestError:
+            return None
+        if probe is None:
+            return None
+        probe.read()
+        probe.close()
+        if not content_len or content_len < 2 * self._MIN_RANGE_SIZE:
+            return None
+        min_data_len, max_data_len = self.params.get('min_filesize'), self.params.get('max_filesize')
+        if (min_data_len is not None and content_len < min_data_len
+                or max_data_len is not None and content_len > max_data_len):
+            return None  # Let the regular download report it
+
+        ytdl_filename = encodeFilename(self.ytdl_filename(filename))
+        ranges = None
+        if (self.params.get('continuedl', True)
+                and os.path.isfile(ytdl_filename) and os.path.isfile(encodeFilename(tmpfilename))):
+            stream, _ = self.sanitize_open(ytdl_filename, 'r')
+            try:
+                state = json.loads(stream.read())['downloader']
+                if state['content_length'] == content_len:
+                    ranges = [{key: int(rng[key]) for key in ('start', 'end', 'downloaded')} for rng in state['ranges']]
+            except Exception:
+                pass
+            finally:
+                stream.close()
+            if ranges is None:
+                self.report_unable_to_resume()
+            else:
+                self.report_resuming_byte(sum(rng['downloaded'] for rng in ranges))
+        if ranges is None:
+            range_size = max(math.ceil(content_len / connections), self._MIN_RANGE_SIZE)
+            ranges = [{
+                'start': start,
+                'end': min(start + range_size, content_len) - 1,
+                'downloaded': 0,
+            } for start in range(0, content_len, range_size)]
+            stream, tmpfilename = self.sanitize_open(tmpfilename, 'wb')
+            stream.truncate(content_len)
+            stream.close()
+
+        self.report_destination(filename)
+        self.to_screen(f'[download] Downloading {len(ranges)} ranges with {connections} connections')
+        if self.params.get('xattr_set_filesize', False):
+            try:
+                write_xattr(tmpfilename, 'user.ytdl.filesize', str(content_len).encode())
+            except (XAttrUnavailableError, XAttrMetadataError) as err:
+                self.report_error(f'unable to set filesize xattr: {err}')
+
+        lock = threading.Lock()
+        stop = threading.Event()
+        streams = set()  # The open handles of the ranges
+        resume_len = byte_counter = sum(rng['downloaded'] for rng in ranges)
+        start_time = last_save = time.time()
+
+        def write_state():
+            # The counted bytes of every range must be on disk before they are saved
+            for handle in streams:
+                handle.flush()
+            stream, _ = self.sanitize_open(ytdl_filename, 'w')
+            try:
+                stream.write(json.dumps({'downloader': {'content_length': content_len, 'ranges': ranges}}))
+            finally:
+                stream.close()
+
+        def fetch(rng, stream):
+            nonlocal byte_counter, last_save
+            block_size = self.params.get('buffersize', 1024)
+            while not stop.is_set() and rng['start'] + rng['downloaded'] <= rng['end']:
+                pos = rng['start'] + rng['downloaded']
+                end = min(rng['end'], pos + chunk_size - 1) if chunk_size else rng['end']
+                data, _ = open_range(pos, end)
+                if data is None:
+                    raise TransportError('The server did not honour the requested range')
+                stream.seek(pos)
+                try:
+                    while not stop.is_set() and pos <= end:
+                        before = time.time()
+                        data_block = data.read(min(block_size, end - pos + 1))
+                        if not data_block:
+                            raise ContentTooShortError(pos - rng['start'], rng['end'] - rng['start'] + 1)
+                        stream.write(data_block)
+                        pos += len(data_block)
+                        now = time.time()
+                        if not self.params.get('noresizebuffer', False):
+                            block_size = self.best_block_size(now - before, len(data_block))
+
+                        with lock:
+                            rng['downloaded'] += len(data_block)
+                            byte_counter += len(data_block)
+                            if now - last_save > 1:
+                                write_state()
+                                last_save = now
+                            speed = self.calc_speed(start_time, now, byte_counter - resume_len)
+                            self._hook_progress({
+                                'status': 'downloading',
+                                'downloaded_bytes': byte_counter,
+                                'total_bytes': content_len,
+                                'tmpfilename': tmpfilename,
+                                'filename': filename,
+                                'eta': self.calc_eta(speed, content_len - byte_counter),
+                                'speed': speed,
+                                'elapsed': now - start_time,
+                                'ctx_id': info_dict.get('ctx_id'),
+                            }, info_dict)
+                        self.slow_down(start_time, now, byte_counter - resume_len)
+                finally:
+                    data.close()
+
+        def download_range(rng):
+            # Every range writes through its own handle, so the file can not be locked
+            stream = open(encodeFilename(tmpfilename), 'r+b')  # noqa: SIM115
+            with lock:
+                streams.add(stream)
+            try:
+                for retry in RetryManager(self.params.get('retries'), self.report_retry):
+                    try:
+                        fetch(rng, stream)
+                    except HTTPError as err:
+                        if err.status < 500 or err.status >= 600:
+                            raise
+                        retry.error = err
+                    except CertificateVerifyError:
+                        raise
+                    except (TransportError, ContentTooShortError) as err:
+                        retry.error = err
+            finally:
+                with lock:
+                    streams.remove(stream)
+                    stream.close()
+
+        with concurrent.futures.ThreadPoolExecutor(connections) as pool:
+            futures = [
+                pool.submit(download_range, rng) for rng in ranges
+                if rng['start'] + rng['downloaded'] <= rng['end']]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            finally:
+                stop.set()
+                with lock:
+                    if byte_counter != content_len:
+                        write_state()
+
+        if byte_counter != content_len:
+            return False
+
+        self.try_remove(ytdl_filename)
+        self.try_rename(tmpfilename, filename)
+        if self.params.get('updatetime', True):
+            info_dict['filetime'] = self.try_utime(filename, probe.headers.get('last-modified', None))
+        self._hook_progress({
+            'downloaded_bytes': byte_counter,
+            'total_bytes': byte_counter,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': time.time() - start_time,
+            'ctx_id': info_dict.get('ctx_id'),
+        }, info_dict)
+        return True
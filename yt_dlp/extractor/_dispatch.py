@@ -0,0 +1,200 @@
+import ast
+import collections
+import inspect
+import re
+import textwrap
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from ..utils import variadic
+
+_NGRAM_SIZE = 4
+
+
+def _pattern_literals(pattern):
+    """
+    Return what any URL matching the pattern must contain, as a tuple of requirements.
+    A requirement is either a lowercase ASCII literal, or a tuple of alternatives,
+    each of which is again a tuple of requirements
+    """
+    def requirements(items):
+        result, current = [], []
+
+        def flush():
+            if len(current) >= _NGRAM_SIZE:
+                result.append(''.join(current))
+            current.clear()
+
+        def walk(items):
+            for op, av in items:
+                if op is sre_parse.LITERAL and chr(av).isascii():
+                    current.append(chr(av).lower())
+                elif op is sre_parse.SUBPATTERN:
+                    walk(av[-1])
+                else:
+                    flush()
+                    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                        walk(av[2])
+                        flush()
+                    elif op is sre_parse.BRANCH:
+                        alternatives = tuple(map(requirements, av[1]))
+                        if all(alternatives):
+                            result.append(alternatives)
+
+        walk(items)
+        flush()
+        return tuple(result)
+
+    return requirements(sre_parse.parse(pattern))
+
+
+def _returns_only_subset(func):
+    """Whether a suitable() override can only return True when super().suitable(url) does"""
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return False
+    func_def = tree.body[0]
+    if not isinstance(func_def, ast.FunctionDef) or len(func_def.args.args) != 2:
+        return False
+    url_arg = func_def.args.args[1].arg
+
+    def is_subset(node):
+        if isinstance(node, ast.Constant):
+            return not node.value
+        elif isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            return any(map(is_subset, node.values))
+        elif isinstance(node, ast.IfExp):
+            return is_subset(node.body) and is_subset(node.orelse)
+        return (
+            isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'suitable'
+            and isinstance(node.func.value, ast.Call) and getattr(node.func.value.func, 'id', None) == 'super'
+            and len(node.args) == 1 and getattr(node.args[0], 'id', None) == url_arg and not node.keywords)
+
+    if any(isinstance(node, (ast.Lambda, ast.FunctionDef, ast.Yield))
+           for node in ast.walk(func_def) if node is not func_def):
+        return False
+    return all(
+        node.value is not None and is_subset(node.value)
+        for node in ast.walk(func_def) if isinstance(node, ast.Return))
+
+
+def url_literals(ie):
+    """
+    Return, for each of the _VALID_URL patterns of an extractor, what a URL must contain
+    to be matched by the pattern (see _pattern_literals); or None if the extractor must always be tried
+    """
+    cls = ie if isinstance(ie, type) else type(ie)
+    from .common import InfoExtractor
+
+    for base in cls.__mro__:
+        if base is InfoExtractor:
+            break
+        elif '_match_valid_url' in base.__dict__ or (
+                'suitable' in base.__dict__ and not _returns_only_subset(base.__dict__['suitable'].__func__)):
+            return None
+    else:
+        return None
+
+    if cls._VALID_URL is False:
+        return ()
+    try:
+        return tuple(map(_pattern_literals, variadic(cls._VALID_URL)))
+    except (re.error, RecursionError, TypeError):
+        return None
+
+
+def _ngrams(literal):
+    return {literal[i:i + _NGRAM_SIZE] for i in range(len(literal) - _NGRAM_SIZE + 1)}
+
+
+def url_ngrams(ies):
+    """
+    Return, for each extractor, a tuple with the 4-grams of each of its patterns, at least one of which
+    any URL matching the pattern must contain; or None if the extractor must always be tried.
+    The 4-grams are chosen to be rare among the given extractors
+    """
+    ies = [ie if isinstance(ie, type) else type(ie) for ie in ies]
+    # Set by lazy_extractors, so that the patterns need not be parsed at runtime
+    literals = [None if '_URL_NGRAMS' in ie.__dict__ else url_literals(ie) for ie in ies]
+
+    counts = collections.Counter()
+
+    def count(requirements):
+        for requirement in requirements:
+            if isinstance(requirement, str):
+                counts.update(_ngrams(requirement))
+            else:
+                for alternative in requirement:
+                    count(alternative)
+
+    for ie_literals in filter(None, literals):
+        for requirements in ie_literals:
+            count(requirements)
+
+    def cover(requirements):
+        """The cheapest set of ngrams at least one of which is in any matching URL"""
+        best = None
+        for requirement in requirements:
+            if isinstance(requirement, str):
+                ngrams = {min(_ngrams(requirement), key=lambda ngram: (counts[ngram], ngram))}
+            else:
+                alternative_covers = list(map(cover, requirement))
+                if None in alternative_covers:
+                    continue
+                ngrams = set().union(*alternative_covers)
+            if best is None or sum(map(counts.get, ngrams)) < sum(map(counts.get, best)):
+                best = ngrams
+        return best
+
+    def ie_ngrams(ie, ie_literals):
+        if '_URL_NGRAMS' in ie.__dict__:
+            return ie._URL_NGRAMS
+        elif ie_literals is None:
+            return None
+        return tuple(
+            None if ngrams is None else tuple(sorted(ngrams))
+            for ngrams in map(cover, ie_literals))
+
+    return [ie_ngrams(ie, ie_literals) for ie, ie_literals in zip(ies, literals)]
+
+
+class ExtractorIndex:
+    """
+    Finds the extractors that may be suitable for a URL without trying every _VALID_URL
+
+    Every pattern is indexed by a few 4-grams, at least one of which any matching URL must contain.
+    Extractors whose patterns have no such literals, or that may be suitable for more URLs than their
+    _VALID_URL, are always candidates. The candidates keep the order of the extractors,
+    so the first suitable one is the same as in a linear search
+    """
+
+    def __init__(self, ies):
+        self._ies = list(ies)
+        self._always, self._index = [], collections.defaultdict(list)
+
+        for position, ie_ngrams in enumerate(url_ngrams(ie for _, ie in self._ies)):
+            if ie_ngrams is None:
+                self._always.append(position)
+                continue
+            for ngrams in ie_ngrams:
+                if ngrams is None:
+                    self._always.append(position)
+                    break
+                for ngram in ngrams:
+                    self._index[ngram].append(position)
+
+    def candidates(self, url):
+        """Yield (ie_key, ie) of the extractors that may be suitable for the URL, in order"""
+        if not url.isascii():
+            yield from self._ies
+            return
+        url = url.lower()
+        positions = set(self._always)
+        for i in range(len(url) - _NGRAM_SIZE + 1):
+            positions.update(self._index.get(url[i:i + _NGRAM_SIZE], ()))
+        for position in sorted(positions):
+            yield self._ies[position]
@@ -1344,6 +1344,12 @@ def _search_json(self, start_pattern, string, name, video_id, *, end_pattern='',
         else:
             fatal, has_default = False, True
 
+        if contains_pattern == r'{(?s:.+)}' and isinstance(string, str):
+            # The greedy default pattern would match the whole rest of the string before backtracking
+            json_obj = self._locate_json(start_pattern, string, end_pattern, **kwargs)
+            if json_obj is not NO_DEFAULT:
+                return json_obj
+
         json_string = self._search_regex(
             rf'(?:{start_pattern})\s*(?P<json>{contains_pattern})\s*(?:{end_pattern})',
             string, name, group='json', fatal=fatal, default=None if has_default else NO_DEFAULT)
@@ -1362,6 +1368,48 @@ def _search_json(self, start_pattern, string, name, video_id, *, end_pattern='',
                     f'Unable to extract {_name} - Failed to parse JSON: {e}', video_id=video_id)
         return default
 
+    _JS_OBJECT_TOKENS_RE = re.compile(r'''(?sx)
+        [{}] | "(?:\\.|[^\\"])*" | '(?:\\.|[^\\'])*' | `(?:\\.|[^\\`])*` | /\*.*?\*/ | //[^\n]*''')
+
+    @classmethod
+    def _js_object_end(cls, string, start):
+        """Find the end of the JS object at string[start], skipping over strings and comments"""
+        depth = 0
+        for mobj in cls._JS_OBJECT_TOKENS_RE.finditer(string, start):
+            token = mobj.group(0)
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if not depth:
+                    return mobj.end()
+
+    def _locate_json(self, start_pattern, string, end_pattern='', *, transform_source=None, **kwargs):
+        """
+        Decode the JSON object that follows start_pattern, in the same way as _search_json with the default
+        contains_pattern, but without matching the rest of the string with a regex.
+        Returns NO_DEFAULT if it is not found this way, in which case _search_json falls back to the regex
+        """
+        mobj = re.search(rf'(?:{start_pattern})\s*(?={{)', string)
+        if not mobj:
+            return NO_DEFAULT
+        try:
+            if transform_source:
+                end = self._js_object_end(string, mobj.end())
+                if end is None:
+                    return NO_DEFAULT
+                json_obj = json.loads(
+                    string[mobj.end():end], cls=LenientJSONDecoder, strict=False,
+                    transform_source=transform_source, ignore_extra=True, **kwargs)
+            else:
+                json_obj, end = LenientJSONDecoder(strict=False, **kwargs).raw_decode(string, mobj.end())
+        except ValueError:
+            return NO_DEFAULT
+        # The regex would need end_pattern to match after the object, or after some later "}"
+        if end_pattern and not re.compile(rf'}}\s*(?:{end_pattern})').search(string, end - 1):
+            return NO_DEFAULT
+        return json_obj
+
     def _html_search_regex(self, pattern, string, name, default=NO_DEFAULT, fatal=True, flags=0, group=None):
         """
         Like _search_regex, but strips HTML tags and unescapes entities.
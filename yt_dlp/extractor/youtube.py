@@ -1,6 +1,8 @@
 import base64
 import calendar
 import collections
+import concurrent.futures
+import contextlib
 import copy
 import datetime as dt
 import enum
@@ -763,9 +765,28 @@ def _download_ytcfg(self, client, video_id):
         }.get(client)
         if not url:
             return {}
-        webpage = self._download_webpage(
-            url, video_id, fatal=False, note=f'Downloading {client.replace("_", " ").strip()} client config')
-        return self.extract_ytcfg(video_id, webpage) or {}
+        # The config is revalidated with the server, and not cached at all for logged-in users
+        cached = None if self.is_authenticated else self.cache.load('youtube-ytcfg', client)
+        validators = filter_dict({
+            'If-None-Match': traverse_obj(cached, ('etag', {str})),
+            'If-Modified-Since': traverse_obj(cached, ('last_modified', {str})),
+        }) if traverse_obj(cached, ('ytcfg', {dict})) else {}
+        webpage, urlh = self._download_webpage_handle(
+            url, video_id, fatal=False, note=f'Downloading {client.replace("_", " ").strip()} client config',
+            headers=validators, expected_status=304 if validators else None) or (None, None)
+        if validators and urlh and urlh.status == 304:
+            self.write_debug(f'{client} client config has not changed')
+            return cached['ytcfg']
+
+        ytcfg = self.extract_ytcfg(video_id, webpage) or {}
+        if ytcfg and urlh and not self.is_authenticated:
+            validators = filter_dict({
+                'etag': urlh.headers.get('ETag'),
+                'last_modified': urlh.headers.get('Last-Modified'),
+            })
+            if validators:
+                self.cache.store('youtube-ytcfg', client, {**validators, 'ytcfg': ytcfg})
+        return ytcfg
 
     @staticmethod
     def _build_api_continuation_query(continuation, ctp=None):
@@ -1335,11 +1356,15 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
     }
     _SUBTITLE_FORMATS = ('json3', 'srv1', 'srv2', 'srv3', 'ttml', 'vtt')
     _POTOKEN_EXPERIMENTS = ('51217476', '51217102')
+    _COMMENT_REPLIES_CONCURRENCY = 4
     _BROKEN_CLIENTS = {
         short_client_name(client): client
         for client in ('android', 'android_creator', 'android_music')
     }
     _DEFAULT_CLIENTS = ('ios', 'web_creator')
+    _NSIG_RESULTS_CACHE_SIZE = 1000  # per player
+    _NSIG_RESULTS_CACHE_PLAYERS = 20
+    _PLAYER_CACHE_SIZE = 3  # players whose code is kept in the cache
 
     _GEO_BYPASS = False
 
@@ -3026,14 +3051,37 @@ def _extract_player_info(cls, player_url):
     def _load_player(self, video_id, player_url, fatal=True):
         player_id = self._extract_player_info(player_url)
         if player_id not in self._code_cache:
-            code = self._download_webpage(
-                player_url, video_id, fatal=fatal,
-                note='Downloading player ' + player_id,
-                errnote=f'Download of {player_url} failed')
+            code = self._load_cached_player(player_id, player_url)
+            if not code:
+                code = self._download_webpage(
+                    player_url, video_id, fatal=fatal,
+                    note='Downloading player ' + player_id,
+                    errnote=f'Download of {player_url} failed')
+                if code:
+                    self._store_cached_player(player_id, player_url, code)
             if code:
                 self._code_cache[player_id] = code
         return self._code_cache.get(player_id)
 
+    def _load_cached_player(self, player_id, player_url):
+        # The URL of a player is specific to its version, so the cached code never needs to be revalidated
+        cached = self.cache.load('youtube-player', player_id)
+        code = traverse_obj(cached, ('code', {str}))
+        if not code or cached.get('url') != player_url:
+            return None
+        elif cached.get('sha256') != hashlib.sha256(code.encode()).hexdigest():
+            self.write_debug(f'Discarding corrupted player {player_id} from cache')
+            return None
+        return code
+
+    def _store_cached_player(self, player_id, player_url, code):
+        self.cache.store('youtube-player', player_id, {
+            'url': player_url,
+            'sha256': hashlib.sha256(code.encode()).hexdigest(),
+            'code': code,
+        })
+        self.cache.prune('youtube-player', self._PLAYER_CACHE_SIZE)
+
     def _extract_signature_function(self, video_id, player_url, example_sig):
         player_id = self._extract_player_info(player_url)
 
@@ -3146,6 +3194,11 @@ def _decrypt_nsig(self, s, video_id, player_url):
             raise ExtractorError('Cannot decrypt nsig without player_url')
         player_url = urljoin('https://www.youtube.com', player_url)
 
+        ret = self._load_nsig_result(s, player_url)
+        if ret:
+            self.write_debug(f'Decrypted nsig {s} => {ret} (cached)')
+            return ret
+
         try:
             jsi, player_id, func_code = self._extract_n_function_code(video_id, player_url)
         except ExtractorError as e:
@@ -3172,8 +3225,35 @@ def _decrypt_nsig(self, s, video_id, player_url):
                 video_id=video_id, note='Executing signature code').strip()
 
         self.write_debug(f'Decrypted nsig {s} => {ret}')
+        self._store_nsig_result(s, player_url, ret)
         return ret
 
+    def _load_nsig_result(self, s, player_url):
+        if self.get_param('youtube_print_sig_code'):
+            return None
+        with contextlib.suppress(ExtractorError):
+            results = self.cache.load(
+                'youtube-nsig-results', self._extract_player_info(player_url), min_ver='2024.07.09')
+            return traverse_obj(results, (s, {str}))
+
+    def _store_nsig_result(self, s, player_url, ret):
+        """Remember the result across runs; evicting the oldest values and the least recently updated players"""
+        try:
+            player_id = self._extract_player_info(player_url)
+        except ExtractorError:
+            return
+        # Reload the results, since other processes may have added to them in the meantime
+        results = self.cache.load('youtube-nsig-results', player_id, min_ver='2024.07.09')
+        is_new_player = not isinstance(results, dict)
+        results = {} if is_new_player else results
+        results.pop(s, None)
+        results[s] = ret
+        self.cache.store('youtube-nsig-results', player_id, dict(
+            itertools.islice(results.items(), max(len(results) - self._NSIG_RESULTS_CACHE_SIZE, 0), None)))
+        # The other players can only become too many when the results of a player are first stored
+        if is_new_player:
+            self.cache.prune('youtube-nsig-results', self._NSIG_RESULTS_CACHE_PLAYERS)
+
     def _extract_n_function_name(self, jscode, player_url=None):
         # Examples (with placeholders nfunc, narray, idx):
         # *  .get("n"))&&(b=nfunc(b)
@@ -3266,11 +3346,17 @@ def _extract_signature_timestamp(self, video_id, player_url, ytcfg=None, fatal=F
                     raise ExtractorError(error_msg)
                 self.report_warning(error_msg)
                 return
+            player_id = self._extract_player_info(player_url)
+            sts = int_or_none(self.cache.load('youtube-sts', player_id))
+            if sts:
+                return sts
             code = self._load_player(video_id, player_url, fatal=fatal)
             if code:
                 sts = int_or_none(self._search_regex(
                     r'(?:signatureTimestamp|sts)\s*:\s*(?P<sts>[0-9]{5})', code,
                     'JS player signature timestamp', group='sts', fatal=fatal))
+                if sts:
+                    self.cache.store('youtube-sts', player_id, sts)
         return sts
 
     def _mark_watched(self, video_id, player_responses):
@@ -3461,7 +3547,7 @@ def _extract_comment_old(self, comment_renderer, parent=None):
 
         return info
 
-    def _comment_entries(self, root_continuation_data, ytcfg, video_id, parent=None, tracker=None):
+    def _comment_entries(self, root_continuation_data, ytcfg, video_id, parent=None, tracker=None, prefetched=None):
 
         get_single_config_arg = lambda c: self._configuration_arg(c, [''])[0]
 
@@ -3493,10 +3579,10 @@ def extract_header(contents):
                 break
             return _continuation
 
-        def extract_thread(contents, entity_payloads):
+        def extract_thread(contents, entity_payloads, replies):
             if not parent:
                 tracker['current_page_thread'] = 0
-            for content in contents:
+            for content, prefetched_replies in zip(contents, replies):
                 if not parent and tracker['total_parent_comments'] >= max_parents:
                     yield
                 comment_thread_renderer = try_get(content, lambda x: x['commentThreadRenderer'])
@@ -3554,10 +3640,83 @@ def extract_thread(contents, entity_payloads):
                     tracker['current_page_thread'] += 1
                     comment_entries_iter = self._comment_entries(
                         comment_replies_renderer, ytcfg, video_id,
-                        parent=comment.get('id'), tracker=tracker)
+                        parent=comment.get('id'), tracker=tracker, prefetched=prefetched_replies)
                     yield from itertools.islice(comment_entries_iter, min(
                         max_replies_per_thread, max(0, max_replies - tracker['total_reply_comments'])))
 
+        def fetch_replies(root_continuation_data, thread_num, limit, budget):
+            """
+            Download the pages of a reply thread in the background, until about limit replies are found
+            or the replies remaining for the page, which budget shares with the other threads, are used up
+            """
+            pages, response, count = [], None, 0
+            continuation = self._extract_continuation(root_continuation_data)
+            for page_num in itertools.count(0):
+                with budget['lock']:
+                    if not continuation or count >= limit or budget['remaining'] <= 0:
+                        break
+                headers = self.generate_api_headers(ytcfg=ytcfg, visitor_data=self._extract_visitor_data(response))
+                try:
+                    response = self._extract_response(
+                        item_id=None, query=continuation, ep='next', ytcfg=ytcfg, headers=headers,
+                        note=(f'    Downloading comment API JSON reply thread {thread_num}' if page_num == 0
+                              else f'       Downloading comment replies API JSON page {page_num}'),
+                        check_get_keys=[[*continuation_items_path, ..., (
+                            'commentThreadRenderer', 'commentViewModel', 'commentRenderer')]])
+                except ExtractorError as e:
+                    pages.append((continuation, e))
+                    break
+                pages.append((continuation, response))
+                continuation = None
+                for continuation_items in traverse_obj(response, continuation_items_path, expected_type=list):
+                    count += len(continuation_items)
+                    with budget['lock']:
+                        budget['remaining'] -= len(continuation_items)
+                    continuation = self._extract_continuation({'contents': continuation_items})
+                    if continuation:
+                        break
+            return pages
+
+        def prefetch(contents, next_continuation, response, page_num):
+            """
+            Start fetching the next page of root comments and the reply threads of this one,
+            which are then processed in order
+            """
+            replies = [None] * len(contents)
+            remaining_parents = max_parents - tracker['total_parent_comments']
+            fetch_next = (
+                not parent and next_continuation and remaining_parents > len(contents)
+                and max_comments - tracker['running_total'] > len(contents))
+            limit = min(max_replies_per_thread, max_replies - tracker['total_reply_comments'])
+            fetch_threads = not parent and max_depth != 1 and limit > 0
+            if not fetch_next and not fetch_threads:
+                return None, None, replies
+            executor = concurrent.futures.ThreadPoolExecutor(
+                self._COMMENT_REPLIES_CONCURRENCY + 1, thread_name_prefix='comment_replies')
+            next_page = None
+            if fetch_next:
+                check_get_keys = None
+                if not (tracker['est_total'] == 0 and tracker['running_total'] == 0):
+                    check_get_keys = [[*continuation_items_path, ..., (
+                        'commentThreadRenderer', 'commentViewModel', 'commentRenderer')]]
+                headers = self.generate_api_headers(ytcfg=ytcfg, visitor_data=self._extract_visitor_data(response))
+                comment_prog_str = f"({tracker['running_total']}/~{tracker['est_total']})"
+                next_page = next_continuation, executor.submit(
+                    self._extract_response, item_id=None, query=next_continuation, ep='next', ytcfg=ytcfg,
+                    headers=headers, note=f'Downloading comment API JSON page {page_num + 1} {comment_prog_str}',
+                    check_get_keys=check_get_keys)
+            if not fetch_threads:
+                return executor, next_page, replies
+            budget = {'lock': threading.Lock(), 'remaining': max_replies - tracker['total_reply_comments']}
+            thread_num = 0
+            for i, content in enumerate(contents[:max(0, remaining_parents)]):
+                comment_replies_renderer = traverse_obj(
+                    content, ('commentThreadRenderer', 'replies', 'commentRepliesRenderer', {dict}))
+                if comment_replies_renderer:
+                    thread_num += 1
+                    replies[i] = executor.submit(fetch_replies, comment_replies_renderer, thread_num, limit, budget)
+            return executor, next_page, replies
+
         # Keeps track of counts across recursive calls
         if not tracker:
             tracker = {
@@ -3583,8 +3742,10 @@ def extract_thread(contents, entity_payloads):
             int_or_none(p, default=sys.maxsize) for p in self._configuration_arg('max_comments') + [''] * 4)
 
         continuation = self._extract_continuation(root_continuation_data)
+        # The pages of a reply thread that were downloaded in advance, see prefetch_replies
+        prefetched = collections.deque(prefetched.result() if prefetched else ())
 
-        response = None
+        response = next_page = None
         is_forced_continuation = False
         is_first_continuation = parent is None
         if is_first_continuation and not continuation:
@@ -3620,10 +3781,17 @@ def extract_thread(contents, entity_payloads):
                 check_get_keys = [[*continuation_items_path, ..., (
                     'commentsHeaderRenderer' if is_first_continuation else ('commentThreadRenderer', 'commentViewModel', 'commentRenderer'))]]
             try:
-                response = self._extract_response(
-                    item_id=None, query=continuation,
-                    ep='next', ytcfg=ytcfg, headers=headers, note=note_prefix,
-                    check_get_keys=check_get_keys)
+                if next_page and next_page[0] == continuation:
+                    response = next_page[1].result()
+                elif prefetched and prefetched[0][0] == continuation:
+                    response = prefetched.popleft()[1]
+                    if isinstance(response, ExtractorError):
+                        raise response
+                else:
+                    response = self._extract_response(
+                        item_id=None, query=continuation,
+                        ep='next', ytcfg=ytcfg, headers=headers, note=note_prefix,
+                        check_get_keys=check_get_keys)
             except ExtractorError as e:
                 # Ignore incomplete data error for replies if retries didn't work.
                 # This is to allow any other parent comments and comment threads to be downloaded.
@@ -3651,11 +3819,18 @@ def extract_thread(contents, entity_payloads):
                         break
                     continue
 
-                for entry in extract_thread(continuation_items, mutations):
-                    if not entry:
-                        return
-                    yield entry
                 continuation = self._extract_continuation({'contents': continuation_items})
+                executor, next_page, replies = prefetch(continuation_items, continuation, response, page_num)
+                try:
+                    for entry in extract_thread(continuation_items, mutations, replies):
+                        if not entry:
+                            return
+                        yield entry
+                finally:
+                    for future in filter(None, replies):
+                        future.cancel()
+                    if executor:
+                        executor.shutdown(wait=False)
                 if continuation:
                     break
 
@@ -3821,33 +3996,13 @@ def append_client(*client_names):
                         all_clients.add(actual_client)
                         return
 
-        tried_iframe_fallback = False
-        player_url = None
-        skipped_clients = {}
-        while clients:
-            client, base_client, variant = _split_innertube_client(clients.pop())
-            player_ytcfg = {}
-            if client == 'web':
-                player_ytcfg = self._get_default_ytcfg() if ignore_initial_response else master_ytcfg
-            elif 'configs' not in self._configuration_arg('player_skip'):
-                player_ytcfg = self._download_ytcfg(client, video_id) or player_ytcfg
-
-            player_url = player_url or self._extract_player_url(master_ytcfg, player_ytcfg, webpage=webpage)
-            require_js_player = self._get_default_ytcfg(client).get('REQUIRE_JS_PLAYER')
-            if 'js' in self._configuration_arg('player_skip'):
-                require_js_player = False
-                player_url = None
-
-            if not player_url and not tried_iframe_fallback and require_js_player:
-                player_url = self._download_player_url(video_id)
-                tried_iframe_fallback = True
-
+        def fetch_player_response(client, player_ytcfg, player_url):
             pr = initial_pr if client == 'web' and not ignore_initial_response else None
             for retry in self.RetryManager(fatal=False):
                 try:
                     pr = pr or self._extract_player_response(
                         client, video_id, player_ytcfg or master_ytcfg, player_ytcfg,
-                        player_url if require_js_player else None, initial_pr, smuggled_data)
+                        player_url, initial_pr, smuggled_data)
                 except ExtractorError as e:
                     self.report_warning(e)
                     break
@@ -3857,41 +4012,90 @@ def append_client(*client_names):
                 if all(x in experiments for x in self._POTOKEN_EXPERIMENTS):
                     pr = None
                     retry.error = ExtractorError('API returned broken formats (poToken experiment detected)', expected=True)
-            if not pr:
-                continue
+            return pr
 
-            if pr_id := self._invalid_player_response(pr, video_id):
-                skipped_clients[client] = pr_id
-            elif pr:
-                # Save client name for introspection later
-                name = short_client_name(client)
-                sd = traverse_obj(pr, ('streamingData', {dict})) or {}
-                sd[STREAMING_DATA_CLIENT_NAME] = name
-                for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
-                    f[STREAMING_DATA_CLIENT_NAME] = name
-                prs.append(pr)
-
-            # tv_embedded can work around age-gate and age-verification IF the video is embeddable
-            if self._is_agegated(pr) and variant != 'tv_embedded':
-                append_client(f'tv_embedded.{base_client}')
-
-            # Unauthenticated users will only get tv_embedded client formats if age-gated
-            if self._is_agegated(pr) and not self.is_authenticated:
-                self.to_screen(
-                    f'{video_id}: This video is age-restricted; some formats may be missing '
-                    f'without authentication. {self._login_hint()}', only_once=True)
-
-            # EU countries require age-verification for accounts to access age-restricted videos
-            # If account is not age-verified, _is_agegated() will be truthy for non-embedded clients
-            # If embedding is disabled for the video, _is_unplayable() will be truthy for tv_embedded
-            embedding_is_disabled = variant == 'tv_embedded' and self._is_unplayable(pr)
-            if self.is_authenticated and (self._is_agegated(pr) or embedding_is_disabled):
-                self.to_screen(
-                    f'{video_id}: This video is age-restricted and YouTube is requiring '
-                    'account age-verification; some formats may be missing', only_once=True)
-                # web_creator and mediaconnect can work around the age-verification requirement
-                # _producer, _testsuite, & _vr variants can also work around age-verification
-                append_client('web_creator', 'mediaconnect')
+        tried_iframe_fallback = False
+        player_url = None
+        skipped_clients = {}
+        pending = collections.deque()
+
+        def request_clients():
+            """Start the player requests of the clients that were added, to be processed before the pending ones"""
+            nonlocal player_url, tried_iframe_fallback
+            requests = []
+            while clients:
+                client, base_client, variant = _split_innertube_client(clients.pop())
+                player_ytcfg = {}
+                if client == 'web':
+                    player_ytcfg = self._get_default_ytcfg() if ignore_initial_response else master_ytcfg
+                elif 'configs' not in self._configuration_arg('player_skip'):
+                    player_ytcfg = self._download_ytcfg(client, video_id) or player_ytcfg
+
+                player_url = player_url or self._extract_player_url(master_ytcfg, player_ytcfg, webpage=webpage)
+                require_js_player = self._get_default_ytcfg(client).get('REQUIRE_JS_PLAYER')
+                if 'js' in self._configuration_arg('player_skip'):
+                    require_js_player = False
+                    player_url = None
+
+                if not player_url and not tried_iframe_fallback and require_js_player:
+                    player_url = self._download_player_url(video_id)
+                    tried_iframe_fallback = True
+
+                if require_js_player and player_url:
+                    # Load the player before the requests are made concurrently, so that it is downloaded only once
+                    self._extract_signature_timestamp(video_id, player_url, master_ytcfg, fatal=False)
+                requests.append((client, base_client, variant, executor.submit(
+                    fetch_player_response, client, player_ytcfg, player_url if require_js_player else None)))
+            pending.extendleft(reversed(requests))
+
+        # The player requests of the clients are made concurrently, but their responses are processed in order,
+        # and the fallback clients that they add are processed right after them, as if they were made one by one
+        executor = concurrent.futures.ThreadPoolExecutor(len(clients) or 1, thread_name_prefix='player_responses')
+        try:
+            request_clients()
+            while pending:
+                client, base_client, variant, pr = pending.popleft()
+                pr = pr.result()
+                if not pr:
+                    continue
+
+                if pr_id := self._invalid_player_response(pr, video_id):
+                    skipped_clients[client] = pr_id
+                elif pr:
+                    # Save client name for introspection later
+                    name = short_client_name(client)
+                    sd = traverse_obj(pr, ('streamingData', {dict})) or {}
+                    sd[STREAMING_DATA_CLIENT_NAME] = name
+                    for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
+                        f[STREAMING_DATA_CLIENT_NAME] = name
+                    prs.append(pr)
+
+                # tv_embedded can work around age-gate and age-verification IF the video is embeddable
+                if self._is_agegated(pr) and variant != 'tv_embedded':
+                    append_client(f'tv_embedded.{base_client}')
+
+                # Unauthenticated users will only get tv_embedded client formats if age-gated
+                if self._is_agegated(pr) and not self.is_authenticated:
+                    self.to_screen(
+                        f'{video_id}: This video is age-restricted; some formats may be missing '
+                        f'without authentication. {self._login_hint()}', only_once=True)
+
+                # EU countries require age-verification for accounts to access age-restricted videos
+                # If account is not age-verified, _is_agegated() will be truthy for non-embedded clients
+                # If embedding is disabled for the video, _is_unplayable() will be truthy for tv_embedded
+                embedding_is_disabled = variant == 'tv_embedded' and self._is_unplayable(pr)
+                if self.is_authenticated and (self._is_agegated(pr) or embedding_is_disabled):
+                    self.to_screen(
+                        f'{video_id}: This video is age-restricted and YouTube is requiring '
+                        'account age-verification; some formats may be missing', only_once=True)
+                    # web_creator and mediaconnect can work around the age-verification requirement
+                    # _producer, _testsuite, & _vr variants can also work around age-verification
+                    append_client('web_creator', 'mediaconnect')
+                request_clients()
+        finally:
+            for *_, pr in pending:
+                pr.cancel()
+            executor.shutdown(wait=False)
 
         if skipped_clients:
             self.report_warning(
@@ -5142,7 +5346,16 @@ def _entries(self, tab, item_id, ytcfg, account_syncid, visitor_data):
             try_get(tab_content, lambda x: x['sectionListRenderer'], dict)
             or try_get(tab_content, lambda x: x['richGridRenderer'], dict) or {})
         yield from extract_entries(parent_renderer)
-        continuation = continuation_list[0]
+
+        pages = self._continuation_pages(continuation_list[0], item_id, ytcfg, account_syncid, visitor_data)
+        prefetch = self.get_param('playlist_page_prefetch')
+        for page in self._prefetch_pages(pages, prefetch) if prefetch else pages:
+            yield from page
+
+    def _continuation_pages(self, continuation, item_id, ytcfg, account_syncid, visitor_data):
+        """Yield the entries of each continuation page; the next page is requested once they are consumed"""
+        continuation_list = [None]
+        extract_entries = lambda x: self._extract_entries(x, continuation_list)
         seen_continuations = set()
         for page_num in itertools.count(1):
             if not continuation:
@@ -5194,12 +5407,34 @@ def _entries(self, tab, item_id, ytcfg, account_syncid, visitor_data):
                 func, parent_key = known_renderers[key]
                 video_items_renderer = {parent_key: continuation_items} if parent_key else continuation_items
                 continuation_list = [None]
-                yield from func(video_items_renderer)
+                yield func(video_items_renderer)
                 continuation = continuation_list[0] or self._extract_continuation(video_items_renderer)
 
             if not video_items_renderer:
                 break
 
+    def _prefetch_pages(self, pages, count):
+        """Yield each of the pages as a list, while up to count following pages are downloaded in the background"""
+        # The pages are consumed in a single thread, since each continuation is found in the previous page
+        executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='tab_pages')
+
+        def next_page():
+            page = next(pages, None)
+            return None if page is None else list(page)
+
+        pending = collections.deque()
+        try:
+            while True:
+                pending.extend(executor.submit(next_page) for _ in range(count + 1 - len(pending)))
+                page = pending.popleft().result()
+                if page is None:
+                    return
+                yield page
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     @staticmethod
     def _extract_selected_tab(tabs, fatal=True):
         for tab_renderer in tabs:
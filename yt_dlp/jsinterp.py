@@ -1,5 +1,6 @@
 import collections
 import contextlib
+import functools
 import itertools
 import json
 import math
@@ -198,6 +199,7 @@ def interpret_statement(self, stmt, local_vars, allow_recursion, *args, **kwargs
 
 class JSInterpreter:
     __named_object_counter = 0
+    _SEPARATE_CACHE_SIZE = 1 << 14
 
     _RE_FLAGS = {
         # special knowledge: Python's re flags are bitmask values, current max 128
@@ -215,6 +217,9 @@ class JSInterpreter:
     def __init__(self, code, objects=None):
         self.code, self._functions = code, {}
         self._objects = {} if objects is None else objects
+        # Function bodies are split into the same statements and expressions every time they are called.
+        # Caching this per interpreter (i.e. per player) leaves mostly the evaluation for repeated calls
+        self._cached_separate = functools.lru_cache(maxsize=self._SEPARATE_CACHE_SIZE)(self._separate_all)
 
     class Exception(ExtractorError):  # noqa: A001
         def __init__(self, msg, expr=None, *args, **kwargs):
@@ -281,12 +286,15 @@ def _separate(expr, delim=',', max_split=None):
         yield expr[start:]
 
     @classmethod
-    def _separate_at_paren(cls, expr, delim=None):
+    def _separate_all(cls, expr, delim=',', max_split=None):
+        return tuple(cls._separate(expr, delim, max_split))
+
+    def _separate_at_paren(self, expr, delim=None, *, cache=True):
         if delim is None:
             delim = expr and _MATCHING_PARENS[expr[0]]
-        separated = list(cls._separate(expr, delim, 1))
+        separated = (self._cached_separate if cache else self._separate_all)(expr, delim, 1)
         if len(separated) < 2:
-            raise cls.Exception(f'No terminating paren {delim}', expr)
+            raise self.Exception(f'No terminating paren {delim}', expr)
         return separated[0][1:].strip(), separated[1].strip()
 
     def _operator(self, op, left_val, right_expr, expr, local_vars, allow_recursion):
@@ -297,7 +305,7 @@ def _operator(self, op, left_val, right_expr, expr, local_vars, allow_recursion)
             if left_val not in (None, JS_Undefined):
                 return left_val
         elif op == '?':
-            right_expr = _js_ternary(left_val, *self._separate(right_expr, ':', 1))
+            right_expr = _js_ternary(left_val, *self._cached_separate(right_expr, ':', 1))
 
         right_val = self.interpret_expression(right_expr, local_vars, allow_recursion)
         if not _OPERATORS.get(op):
@@ -331,7 +339,7 @@ def interpret_statement(self, stmt, local_vars, allow_recursion=100):
         allow_recursion -= 1
 
         should_return = False
-        sub_statements = list(self._separate(stmt, ';')) or ['']
+        sub_statements = list(self._cached_separate(stmt, ';')) or ['']
         expr = stmt = sub_statements.pop().strip()
 
         for sub_stmt in sub_statements:
@@ -349,7 +357,7 @@ def interpret_statement(self, stmt, local_vars, allow_recursion=100):
             return None, should_return
 
         if expr[0] in _QUOTES:
-            inner, outer = self._separate(expr, expr[0], 1)
+            inner, outer = self._cached_separate(expr, expr[0], 1)
             if expr[0] == '/':
                 flags, outer = self._regex_flags(outer)
                 # We don't support regex methods yet, so no point compiling it
@@ -381,7 +389,8 @@ def interpret_statement(self, stmt, local_vars, allow_recursion=100):
         if expr.startswith('{'):
             inner, outer = self._separate_at_paren(expr)
             # try for object expression (Map)
-            sub_expressions = [list(self._separate(sub_expr.strip(), ':', 1)) for sub_expr in self._separate(inner)]
+            sub_expressions = [
+                list(self._cached_separate(sub_expr.strip(), ':', 1)) for sub_expr in self._cached_separate(inner)]
             if all(len(sub_expr) == 2 for sub_expr in sub_expressions):
                 def dict_item(key, val):
                     val = self.interpret_expression(val, local_vars, allow_recursion)
@@ -409,7 +418,7 @@ def dict_item(key, val):
             inner, outer = self._separate_at_paren(expr)
             name = self._named_object(local_vars, [
                 self.interpret_expression(item, local_vars, allow_recursion)
-                for item in self._separate(inner)])
+                for item in self._cached_separate(inner)])
             expr = name + outer
 
         m = re.match(r'''(?x)
@@ -481,7 +490,7 @@ def dict_item(key, val):
                     body = 'switch(%s){%s}' % (switch_val, body)
                 else:
                     body, expr = remaining, ''
-            start, cndn, increment = self._separate(constructor, ';')
+            start, cndn, increment = self._cached_separate(constructor, ';')
             self.interpret_expression(start, local_vars, allow_recursion)
             while True:
                 if not _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion)):
@@ -504,7 +513,7 @@ def dict_item(key, val):
             for default in (False, True):
                 matched = False
                 for item in items:
-                    case, stmt = (i.strip() for i in self._separate(item, ':', 1))
+                    case, stmt = (i.strip() for i in self._cached_separate(item, ':', 1))
                     if default:
                         matched = matched or case == 'default'
                     elif not matched:
@@ -526,7 +535,7 @@ def dict_item(key, val):
             return ret, should_abort or should_return
 
         # Comma separated statements
-        sub_expressions = list(self._separate(expr))
+        sub_expressions = list(self._cached_separate(expr))
         if len(sub_expressions) > 1:
             for sub_expr in sub_expressions:
                 ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
@@ -605,7 +614,7 @@ def dict_item(key, val):
             return self._index(val, idx), should_return
 
         for op in _OPERATORS:
-            separated = list(self._separate(expr, op))
+            separated = list(self._cached_separate(expr, op))
             right_expr = separated.pop()
             while True:
                 if op in '?<>*-' and len(separated) > 1 and not separated[-1].strip():
@@ -668,7 +677,7 @@ def eval_method():
                 # Function call
                 argvals = [
                     self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in self._separate(arg_str)]
+                    for v in self._cached_separate(arg_str)]
 
                 # Fixup prototype call
                 if isinstance(obj, type) and member.startswith('prototype.'):
@@ -776,7 +785,7 @@ def eval_method():
         elif m and m.group('function'):
             fname = m.group('fname')
             argvals = [self.interpret_expression(v, local_vars, allow_recursion)
-                       for v in self._separate(m.group('args'))]
+                       for v in self._cached_separate(m.group('args'))]
             if fname in local_vars:
                 return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
             elif fname not in self._functions:
@@ -832,7 +841,8 @@ def extract_function_code(self, funcname):
             self.code)
         if func_m is None:
             raise self.Exception(f'Could not find JS function "{funcname}"')
-        code, _ = self._separate_at_paren(func_m.group('code'))
+        # The match spans the rest of the player, which must not be kept by the cache
+        code, _ = self._separate_at_paren(func_m.group('code'), cache=False)
         return [x.strip() for x in func_m.group('args').split(',')], code
 
     def extract_function(self, funcname):
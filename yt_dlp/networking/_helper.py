@@ -6,6 +6,7 @@
 import socket
 import ssl
 import sys
+import threading
 import typing
 import urllib.parse
 import urllib.request
@@ -196,6 +197,26 @@ def _clear_instances(self):
         self.__instances.clear()
 
 
+class ConnectionStats:
+    """Thread-safe counters of the HTTP connections opened and reused by a request handler"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def record(self, reused):
+        with self._lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            return self.opened, self.reused
+
+
 def add_accept_encoding_header(headers: HTTPHeaderDict, supported_encodings: Iterable[str]):
     if 'Accept-Encoding' not in headers:
         headers['Accept-Encoding'] = ', '.join(supported_encodings) or 'identity'
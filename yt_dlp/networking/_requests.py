@@ -33,6 +33,7 @@
 import urllib3.util
 
 from ._helper import (
+    ConnectionStats,
     InstanceStoreMixin,
     add_accept_encoding_header,
     create_connection,
@@ -164,24 +165,52 @@ def read(self, amt: int | None = None):
             raise TransportError(cause=e) from e
 
 
+class CountingConnectionPoolMixin:
+    """Record in connection_stats whether each connection taken from the pool is new or reused"""
+    connection_stats = None
+
+    def _get_conn(self, *args, **kwargs):
+        conn = super()._get_conn(*args, **kwargs)
+        self.connection_stats.record(reused=getattr(conn, 'sock', None) is not None)
+        return conn
+
+
+@functools.lru_cache(maxsize=None)
+def _counting_pool_class(pool_class, connection_stats):
+    return type(pool_class.__name__, (CountingConnectionPoolMixin, pool_class), {
+        'connection_stats': connection_stats,
+    })
+
+
 class RequestsHTTPAdapter(requests.adapters.HTTPAdapter):
-    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, **kwargs):
+    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, connection_stats=None, **kwargs):
         self._pm_args = {}
         if ssl_context:
             self._pm_args['ssl_context'] = ssl_context
         if source_address:
             self._pm_args['source_address'] = (source_address, 0)
         self._proxy_ssl_context = proxy_ssl_context or ssl_context
+        self._connection_stats = connection_stats
         super().__init__(**kwargs)
 
+    def _count_connections(self, manager):
+        if self._connection_stats:
+            manager.pool_classes_by_scheme = {
+                scheme: pool_class if issubclass(pool_class, CountingConnectionPoolMixin)
+                else _counting_pool_class(pool_class, self._connection_stats)
+                for scheme, pool_class in manager.pool_classes_by_scheme.items()}
+        return manager
+
     def init_poolmanager(self, *args, **kwargs):
-        return super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        self._count_connections(self.poolmanager)
 
     def proxy_manager_for(self, proxy, **proxy_kwargs):
         extra_kwargs = {}
         if not proxy.lower().startswith('socks') and self._proxy_ssl_context:
             extra_kwargs['proxy_ssl_context'] = self._proxy_ssl_context
-        return super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs)
+        return self._count_connections(
+            super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs))
 
     # Skip `requests` internal verification; we use our own SSLContext
     def cert_verify(*args, **kwargs):
@@ -264,8 +293,10 @@ class RequestsRH(RequestHandler, InstanceStoreMixin):
     _SUPPORTED_FEATURES = (Features.NO_PROXY, Features.ALL_PROXY)
     RH_NAME = 'requests'
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, connection_pool_size: int | None = None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.connection_pool_size = connection_pool_size
+        self.connection_stats = ConnectionStats()
 
         # Forward urllib3 debug messages to our logger
         logger = logging.getLogger('urllib3')
@@ -303,6 +334,8 @@ def _create_instance(self, cookiejar, legacy_ssl_support=None):
             ssl_context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
             source_address=self.source_address,
             max_retries=urllib3.util.retry.Retry(False),
+            connection_stats=self.connection_stats,
+            **({'pool_maxsize': self.connection_pool_size} if self.connection_pool_size else {}),
         )
         session.adapters.clear()
         session.headers = requests.models.CaseInsensitiveDict({'Connection': 'keep-alive'})
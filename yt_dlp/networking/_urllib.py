@@ -4,6 +4,7 @@
 import http.client
 import io
 import ssl
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -20,6 +21,7 @@
 )
 
 from ._helper import (
+    ConnectionStats,
     InstanceStoreMixin,
     add_accept_encoding_header,
     create_connection,
@@ -63,12 +65,59 @@ def _create_http_connection(http_class, source_address, *args, **kwargs):
     return hc
 
 
+class _PooledHTTPResponse(http.client.HTTPResponse):
+    """HTTPResponse that hands its connection back to the pool once the body has been read"""
+    _release_conn = None
+    _trailer_read = False
+
+    def _read_and_discard_trailer(self):
+        super()._read_and_discard_trailer()
+        self._trailer_read = True
+
+    def _close_conn(self):
+        super()._close_conn()
+        if self._release_conn:
+            release_conn, self._release_conn = self._release_conn, None
+            release_conn(not self.will_close and (self.length == 0 or self._trailer_read))
+
+
+class HTTPConnectionPool:
+    """Idle keep-alive connections, grouped by destination"""
+
+    def __init__(self, maxsize, stats=None):
+        self.maxsize = maxsize
+        self.stats = stats or ConnectionStats()
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            connections = self._idle.get(key)
+            return connections.pop() if connections else None
+
+    def put(self, key, conn):
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.maxsize:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
 class HTTPHandler(urllib.request.AbstractHTTPHandler):
     """Handler for HTTP requests and responses.
 
     This class, when installed with an OpenerDirector, automatically adds
     the standard headers to every HTTP request and handles gzipped, deflated and
-    brotli responses from web servers.
+    brotli responses from web servers. If a HTTPConnectionPool is given,
+    connections are kept alive and reused for subsequent requests.
 
     Part of this code was copied from:
 
@@ -78,10 +127,11 @@ class HTTPHandler(urllib.request.AbstractHTTPHandler):
     public domain.
     """
 
-    def __init__(self, context=None, source_address=None, *args, **kwargs):
+    def __init__(self, context=None, source_address=None, pool=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._source_address = source_address
         self._context = context
+        self._pool = pool
 
     @staticmethod
     def _make_conn_class(base, req):
@@ -91,17 +141,70 @@ def _make_conn_class(base, req):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
         return conn_class
 
+    def _open(self, base, req, **http_conn_args):
+        pool_key = (base, req.host, req._tunnel_host, req.headers.get('Ytdl-socks-proxy'))
+        http_class = functools.partial(
+            _create_http_connection, self._make_conn_class(base, req), self._source_address)
+        if not self._pool:
+            return self.do_open(http_class, req, **http_conn_args)
+        return self._do_open_pooled(http_class, req, pool_key, **http_conn_args)
+
     def http_open(self, req):
-        conn_class = self._make_conn_class(http.client.HTTPConnection, req)
-        return self.do_open(functools.partial(
-            _create_http_connection, conn_class, self._source_address), req)
+        return self._open(http.client.HTTPConnection, req)
 
     def https_open(self, req):
-        conn_class = self._make_conn_class(http.client.HTTPSConnection, req)
-        return self.do_open(
-            functools.partial(
-                _create_http_connection, conn_class, self._source_address),
-            req, context=self._context)
+        return self._open(http.client.HTTPSConnection, req, context=self._context)
+
+    def _do_open_pooled(self, http_class, req, pool_key, **http_conn_args):
+        # Based on AbstractHTTPHandler.do_open, but without "Connection: close"
+        if not req.host:
+            raise urllib.error.URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers = {name.title(): val for name, val in headers.items()}
+        tunnel_headers = {}
+        if req._tunnel_host and 'Proxy-Authorization' in headers:
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+
+        while True:
+            conn = self._pool.get(pool_key)
+            reused = conn is not None
+            if reused:
+                conn.timeout = req.timeout
+                if conn.sock:
+                    conn.sock.settimeout(req.timeout)
+            else:
+                conn = http_class(req.host, timeout=req.timeout, **http_conn_args)
+                conn.response_class = _PooledHTTPResponse
+                if req._tunnel_host:
+                    conn.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            conn.set_debuglevel(self._debuglevel)
+            try:
+                conn.request(req.get_method(), req.selector, req.data, headers,
+                             encode_chunked=req.has_header('Transfer-encoding'))
+                res = conn.getresponse()
+            except ConnectionError as err:
+                conn.close()
+                if reused:  # The server has closed the idle connection
+                    continue
+                raise urllib.error.URLError(err)
+            except OSError as err:
+                conn.close()
+                raise urllib.error.URLError(err)
+            break
+
+        self._pool.stats.record(reused)
+        res._release_conn = functools.partial(self._release_conn, pool_key, conn)
+        res.url = req.get_full_url()
+        res.msg = res.reason
+        return res
+
+    def _release_conn(self, pool_key, conn, reusable):
+        if reusable and conn.sock:
+            self._pool.put(pool_key, conn)
+        else:
+            conn.close()
 
     @staticmethod
     def deflate(data):
@@ -338,11 +441,23 @@ class UrllibRH(RequestHandler, InstanceStoreMixin):
     _SUPPORTED_FEATURES = (Features.NO_PROXY, Features.ALL_PROXY)
     RH_NAME = 'urllib'
 
-    def __init__(self, *, enable_file_urls: bool = False, **kwargs):
+    def __init__(self, *, enable_file_urls: bool = False, connection_pool_size: int | None = None, **kwargs):
         super().__init__(**kwargs)
         self.enable_file_urls = enable_file_urls
         if self.enable_file_urls:
             self._SUPPORTED_URL_SCHEMES = (*self._SUPPORTED_URL_SCHEMES, 'file')
+        # Connections are only kept alive if a pool size is given
+        self.connection_pool_size = connection_pool_size
+        self.connection_stats = ConnectionStats()
+
+    def close(self):
+        self._clear_instances()
+
+    def _close_instance(self, opener):
+        for handler in opener.handlers:
+            if isinstance(handler, HTTPHandler) and handler._pool:
+                handler._pool.close()
+        super()._close_instance(opener)
 
     def _check_extensions(self, extensions):
         super()._check_extensions(extensions)
@@ -357,7 +472,9 @@ def _create_instance(self, proxies, cookiejar, legacy_ssl_support=None):
             HTTPHandler(
                 debuglevel=int(bool(self.verbose)),
                 context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
-                source_address=self.source_address),
+                source_address=self.source_address,
+                pool=self.connection_pool_size and HTTPConnectionPool(
+                    self.connection_pool_size, self.connection_stats)),
             HTTPCookieProcessor(cookiejar),
             DataHandler(),
             UnknownHandler(),
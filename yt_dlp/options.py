@@ -511,6 +511,13 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--socket-timeout',
         dest='socket_timeout', type=float, default=None, metavar='SECONDS',
         help='Time to wait before giving up, in seconds')
+    network.add_option(
+        '--connection-pool-size',
+        metavar='N', dest='connection_pool_size', default=None, type=int,
+        help=(
+            'Maximum number of idle HTTP connections to keep open per host for reuse. '
+            'This also enables keep-alive for the built-in urllib handler, and makes dash/hlsnative downloads '
+            'open connections to the fragment host before the first fragment is requested'))
     network.add_option(
         '--source-address',
         metavar='IP', dest='source_address', default=None,
@@ -685,6 +692,17 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-download-archive',
         dest='download_archive', action='store_const', const=None,
         help='Do not use archive file (default)')
+    selection.add_option(
+        '--download-archive-index',
+        action='store_true', dest='download_archive_index', default=False,
+        help=(
+            'Look up the download archive through an SQLite index stored next to it (FILE.sqlite3) '
+            'instead of loading the whole file into memory. Useful for very large archives. '
+            'IDs recorded in quick succession are appended to the archive in batches'))
+    selection.add_option(
+        '--no-download-archive-index',
+        action='store_false', dest='download_archive_index',
+        help='Load the whole download archive into memory (default)')
     selection.add_option(
         '--max-downloads',
         dest='max_downloads', metavar='NUMBER', type=int, default=None,
@@ -914,6 +932,29 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '-N', '--concurrent-fragments',
         dest='concurrent_fragment_downloads', metavar='N', default=1, type=int,
         help='Number of fragments of a dash/hlsnative video that should be downloaded concurrently (default is %default)')
+    downloader.add_option(
+        '--concurrent-urls',
+        dest='concurrent_urls', metavar='N', default=1, type=int,
+        help=(
+            'Number of input URLs to process in parallel (default is %default). '
+            'Messages of the downloads are interleaved, and their progress lines overwrite each other'))
+    downloader.add_option(
+        '--adaptive-concurrent-fragments',
+        action='store_true', dest='adaptive_concurrent_fragments', default=False,
+        help=(
+            'Adjust the number of fragments downloaded concurrently between 1 and --concurrent-fragments '
+            'based on the measured throughput, retries and throttling responses (HTTP 429/503) of the server'))
+    downloader.add_option(
+        '--no-adaptive-concurrent-fragments',
+        action='store_false', dest='adaptive_concurrent_fragments',
+        help='Always download --concurrent-fragments fragments concurrently (default)')
+    downloader.add_option(
+        '--fragment-window',
+        dest='fragment_window', metavar='N', default=None, type=int,
+        help=(
+            'Maximum number of fragments that are being downloaded or are waiting to be written when using '
+            '--concurrent-fragments. Fragments finishing early are held in this window until the ones before '
+            'them are done (default is twice the number of concurrent fragments)'))
     downloader.add_option(
         '-r', '--limit-rate', '--rate-limit',
         dest='ratelimit', metavar='RATE',
@@ -963,6 +1004,13 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-keep-fragments',
         action='store_false', dest='keep_fragments',
         help='Delete downloaded fragments after downloading is finished (default)')
+    downloader.add_option(
+        '--fragment-buffer-size',
+        dest='fragment_buffer_size', metavar='SIZE', default=None,
+        help=(
+            'Keep up to this much fragment data of dash/hlsnative downloads in memory '
+            'instead of writing each fragment to a temporary file, e.g. 50M (default is disabled). '
+            'Fragments that do not fit are written to disk. Ignored with --keep-fragments'))
     downloader.add_option(
         '--buffer-size',
         dest='buffersize', metavar='SIZE', default='1024',
@@ -981,6 +1029,12 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         help=(
             'Size of a chunk for chunk-based HTTP downloading, e.g. 10485760 or 10M (default is disabled). '
             'May be useful for bypassing bandwidth throttling imposed by a webserver (experimental)'))
+    downloader.add_option(
+        '--http-connections',
+        dest='http_connections', metavar='N', default=1, type=int,
+        help=(
+            'Number of connections used to download a HTTP file in parallel ranges, '
+            'if the server reports its size and supports ranges (default is %default)'))
     downloader.add_option(
         '--test',
         action='store_true', dest='test', default=False,
@@ -1005,6 +1059,19 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-lazy-playlist',
         action='store_false', dest='lazy_playlist',
         help='Process videos in the playlist only after the entire playlist is parsed (default)')
+    downloader.add_option(
+        '--playlist-prefetch',
+        dest='playlist_prefetch', metavar='N', type=int, default=0,
+        help=(
+            'Number of upcoming playlist entries to extract in parallel while the current one is being '
+            'downloaded (default is %default). Extraction messages of these entries may be printed early. '
+            'Extractors that are not safe to run concurrently may fail with this'))
+    downloader.add_option(
+        '--playlist-page-prefetch',
+        dest='playlist_page_prefetch', metavar='N', type=int, default=0,
+        help=(
+            'Number of pages of a paged playlist to download in parallel, ahead of the page '
+            'whose entries are being processed (default is %default)'))
     downloader.add_option(
         '--xattr-set-filesize',
         dest='xattr_set_filesize', action='store_true',
@@ -1031,6 +1098,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         help=(
             'Do not use the mpegts container for HLS videos. '
             'This is default when not downloading live streams'))
+    downloader.add_option(
+        '--hls-native-live',
+        dest='hls_native_live', action='store_true', default=False,
+        help=(
+            'Download live HLS streams with the native downloader, '
+            'refreshing the playlist and appending new fragments until the stream ends (Experimental)'))
+    downloader.add_option(
+        '--no-hls-native-live',
+        dest='hls_native_live', action='store_false',
+        help='Download live HLS streams with ffmpeg (default)')
     downloader.add_option(
         '--download-sections',
         metavar='REGEX', dest='download_ranges', action='append',
@@ -1220,6 +1297,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         help=(
             'Quiet, but print JSON information for each url or infojson passed. Simulate unless --no-simulate is used. '
             'If the URL refers to a playlist, the whole playlist information is dumped in a single line'))
+    verbosity.add_option(
+        '--stream-single-json',
+        action='store_true', dest='stream_single_json', default=False,
+        help=(
+            'Same as -J, but print the entries of playlists as they are processed instead of keeping them in memory. '
+            'The "entries" are printed before the other fields of the playlist'))
+    verbosity.add_option(
+        '--no-stream-single-json',
+        action='store_false', dest='stream_single_json',
+        help='Keep the whole playlist information in memory before printing it with -J (default)')
     verbosity.add_option(
         '--print-json',
         action='store_true', dest='print_json', default=False,
@@ -1495,6 +1582,12 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
     filesystem.add_option(
         '--no-cache-dir', action='store_false', dest='cachedir',
         help='Disable filesystem caching')
+    filesystem.add_option(
+        '--cache-backend',
+        metavar='BACKEND', dest='cache_backend', default='file', choices=('file', 'sqlite'),
+        help=(
+            'How to store the cache. One of "file" (default), one file per entry; '
+            'or "sqlite", a single database that is better suited for many concurrent processes'))
     filesystem.add_option(
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
@@ -4,6 +4,7 @@
 import codecs
 import collections
 import collections.abc
+import concurrent.futures
 import contextlib
 import datetime as dt
 import email.header
@@ -2261,14 +2262,52 @@ def __init__(self, pagefunc, pagesize, use_cache=True):
         self._pagesize = pagesize
         self._pagecount = float('inf')
         self._use_cache = use_cache
-        self._cache = {}
+        self._cache = collections.OrderedDict()
+        self._cache_size = None
+        self._prefetch_count = 0
+        self._prefetched = {}
+        self._executor = None
+
+    def prefetch(self, count, cache_size=64):
+        """
+        Fetch the next count pages in background threads whenever a page is fetched,
+        and keep only the cache_size most recently used pages in the cache (None for all)
+        """
+        self._prefetch_count = count
+        self._cache_size = cache_size
+        if count and not self._executor:
+            self._executor = concurrent.futures.ThreadPoolExecutor(count, thread_name_prefix='paged_list')
+
+    def _fetch_page(self, pagenum):
+        return list(self._pagefunc(pagenum))
+
+    def _schedule_prefetch(self, wanted):
+        for num in list(self._prefetched):
+            if num not in wanted:
+                self._prefetched.pop(num).cancel()
+        for num in wanted:
+            if num < self._pagecount and num not in self._prefetched and num not in self._cache:
+                self._prefetched[num] = self._executor.submit(self._fetch_page, num)
 
     def getpage(self, pagenum):
         page_results = self._cache.get(pagenum)
-        if page_results is None:
-            page_results = [] if pagenum > self._pagecount else list(self._pagefunc(pagenum))
+        if page_results is not None:
+            self._cache.move_to_end(pagenum)
+        elif pagenum > self._pagecount:
+            page_results = []
+        else:
+            future = self._prefetched.pop(pagenum, None)
+            wanted = range(pagenum + 1, pagenum + 1 + self._prefetch_count)
+            if wanted and not future:
+                self._schedule_prefetch(wanted)
+            page_results = future.result() if future else self._fetch_page(pagenum)
+            if wanted:
+                # Pages after one with less than maximum results are not needed
+                self._schedule_prefetch(wanted if len(page_results) >= self._pagesize else ())
         if self._use_cache:
             self._cache[pagenum] = page_results
+            if self._cache_size and len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
         return page_results
 
     def getslice(self, start=0, end=None):
@@ -2380,6 +2419,8 @@ def __init__(self, ydl, info_dict):
                 self._entries[i - 1] = entry
         elif isinstance(entries, (list, PagedList, LazyList)):
             self._entries = entries
+            if isinstance(entries, PagedList) and ydl.params.get('playlist_page_prefetch'):
+                entries.prefetch(ydl.params['playlist_page_prefetch'])
         else:
             self._entries = LazyList(entries)
 
@@ -3168,86 +3209,108 @@ def filter_using_list(row, filter_array):
     return '\n'.join(''.join(row).rstrip() for row in table)
 
 
-def _match_one(filter_part, dct, incomplete):
-    # TODO: Generalize code with YoutubeDL._build_format_filter
-    STRING_OPERATORS = {
-        '*=': operator.contains,
-        '^=': lambda attr, value: attr.startswith(value),
-        '$=': lambda attr, value: attr.endswith(value),
-        '~=': lambda attr, value: re.search(value, attr),
-    }
-    COMPARISON_OPERATORS = {
-        **STRING_OPERATORS,
-        '<=': operator.le,  # "<=" must be defined above "<"
-        '<': operator.lt,
-        '>=': operator.ge,
-        '>': operator.gt,
-        '=': operator.eq,
-    }
+_MATCH_STRING_OPERATORS = {
+    '*=': operator.contains,
+    '^=': lambda attr, value: attr.startswith(value),
+    '$=': lambda attr, value: attr.endswith(value),
+    '~=': lambda attr, value: re.search(value, attr),
+}
+_MATCH_COMPARISON_OPERATORS = {
+    **_MATCH_STRING_OPERATORS,
+    '<=': operator.le,  # "<=" must be defined above "<"
+    '<': operator.lt,
+    '>=': operator.ge,
+    '>': operator.gt,
+    '=': operator.eq,
+}
+_MATCH_UNARY_OPERATORS = {
+    '': lambda v: (v is True) if isinstance(v, bool) else (v is not None),
+    '!': lambda v: (v is False) if isinstance(v, bool) else (v is None),
+}
+_MATCH_COMPARISON_RE = re.compile(r'''(?x)
+    (?P<key>[a-z_]+)
+    \s*(?P<negation>!\s*)?(?P<op>{})(?P<none_inclusive>\s*\?)?\s*
+    (?:
+        (?P<quote>["\'])(?P<quotedstrval>.+?)(?P=quote)|
+        (?P<strval>.+?)
+    )
+    '''.format('|'.join(map(re.escape, _MATCH_COMPARISON_OPERATORS.keys()))))
+_MATCH_UNARY_RE = re.compile(r'''(?x)
+    (?P<op>{})\s*(?P<key>[a-z_]+)
+    '''.format('|'.join(map(re.escape, _MATCH_UNARY_OPERATORS.keys()))))
 
-    if isinstance(incomplete, bool):
-        is_incomplete = lambda _: incomplete
-    else:
-        is_incomplete = lambda k: k in incomplete
 
-    operator_rex = re.compile(r'''(?x)
-        (?P<key>[a-z_]+)
-        \s*(?P<negation>!\s*)?(?P<op>{})(?P<none_inclusive>\s*\?)?\s*
-        (?:
-            (?P<quote>["\'])(?P<quotedstrval>.+?)(?P=quote)|
-            (?P<strval>.+?)
-        )
-        '''.format('|'.join(map(re.escape, COMPARISON_OPERATORS.keys()))))
-    m = operator_rex.fullmatch(filter_part.strip())
+@functools.lru_cache(maxsize=1024)
+def _compile_match_one(filter_part):
+    """Parse a filter part into a function(dct, is_incomplete) that does the comparison"""
+    # TODO: Generalize code with YoutubeDL._build_format_filter
+    m = _MATCH_COMPARISON_RE.fullmatch(filter_part.strip())
     if m:
         m = m.groupdict()
-        unnegated_op = COMPARISON_OPERATORS[m['op']]
+        key, none_inclusive = m['key'], m['none_inclusive']
+        unnegated_op = _MATCH_COMPARISON_OPERATORS[m['op']]
+        comparison_value = m['quotedstrval'] or m['strval'] or m['intval']
+        if m['quote']:
+            comparison_value = comparison_value.replace(r'\{}'.format(m['quote']), m['quote'])
+        if m['op'] == '~=':
+            with contextlib.suppress(re.error):  # An invalid regex is reported when it is used
+                pattern = re.compile(comparison_value)
+                unnegated_op = lambda attr, _: pattern.search(attr)
         if m['negation']:
             op = lambda attr, value: not unnegated_op(attr, value)
         else:
             op = unnegated_op
-        comparison_value = m['quotedstrval'] or m['strval'] or m['intval']
-        if m['quote']:
-            comparison_value = comparison_value.replace(r'\{}'.format(m['quote']), m['quote'])
-        actual_value = dct.get(m['key'])
-        numeric_comparison = None
-        if isinstance(actual_value, (int, float)):
-            # If the original field is a string and matching comparisonvalue is
-            # a number we should respect the origin of the original field
-            # and process comparison value as a string (see
-            # https://github.com/ytdl-org/youtube-dl/issues/11082)
-            try:
-                numeric_comparison = int(comparison_value)
-            except ValueError:
-                numeric_comparison = parse_filesize(comparison_value)
-                if numeric_comparison is None:
-                    numeric_comparison = parse_filesize(f'{comparison_value}B')
-                if numeric_comparison is None:
-                    numeric_comparison = parse_duration(comparison_value)
-        if numeric_comparison is not None and m['op'] in STRING_OPERATORS:
-            raise ValueError('Operator {} only supports string values!'.format(m['op']))
-        if actual_value is None:
-            return is_incomplete(m['key']) or m['none_inclusive']
-        return op(actual_value, comparison_value if numeric_comparison is None else numeric_comparison)
-
-    UNARY_OPERATORS = {
-        '': lambda v: (v is True) if isinstance(v, bool) else (v is not None),
-        '!': lambda v: (v is False) if isinstance(v, bool) else (v is None),
-    }
-    operator_rex = re.compile(r'''(?x)
-        (?P<op>{})\s*(?P<key>[a-z_]+)
-        '''.format('|'.join(map(re.escape, UNARY_OPERATORS.keys()))))
-    m = operator_rex.fullmatch(filter_part.strip())
+
+        # If the original field is a string and matching comparisonvalue is
+        # a number we should respect the origin of the original field
+        # and process comparison value as a string (see
+        # https://github.com/ytdl-org/youtube-dl/issues/11082)
+        try:
+            numeric_comparison = int(comparison_value)
+        except ValueError:
+            numeric_comparison = parse_filesize(comparison_value)
+            if numeric_comparison is None:
+                numeric_comparison = parse_filesize(f'{comparison_value}B')
+            if numeric_comparison is None:
+                numeric_comparison = parse_duration(comparison_value)
+        if numeric_comparison is not None and m['op'] in _MATCH_STRING_OPERATORS:
+            numeric_error = ValueError('Operator {} only supports string values!'.format(m['op']))
+        else:
+            numeric_error = None
+
+        def match(dct, is_incomplete):
+            actual_value = dct.get(key)
+            if isinstance(actual_value, (int, float)) and numeric_comparison is not None:
+                if numeric_error:
+                    raise numeric_error
+                return op(actual_value, numeric_comparison)
+            if actual_value is None:
+                return is_incomplete(key) or none_inclusive
+            return op(actual_value, comparison_value)
+        return match
+
+    m = _MATCH_UNARY_RE.fullmatch(filter_part.strip())
     if m:
-        op = UNARY_OPERATORS[m.group('op')]
-        actual_value = dct.get(m.group('key'))
-        if is_incomplete(m.group('key')) and actual_value is None:
-            return True
-        return op(actual_value)
+        op, key = _MATCH_UNARY_OPERATORS[m.group('op')], m.group('key')
+
+        def match(dct, is_incomplete):
+            actual_value = dct.get(key)
+            if is_incomplete(key) and actual_value is None:
+                return True
+            return op(actual_value)
+        return match
 
     raise ValueError(f'Invalid filter part {filter_part!r}')
 
 
+@functools.lru_cache(maxsize=1024)
+def _compile_match_str(filter_str):
+    """Parse a filter string of match_str into the functions of its "&"-separated parts"""
+    return tuple(
+        _compile_match_one(filter_part.replace(r'\&', '&'))
+        for filter_part in re.split(r'(?<!\\)&', filter_str))
+
+
 def match_str(filter_str, dct, incomplete=False):
     """ Filter a dictionary with a simple string syntax.
     @returns           Whether the filter passes
@@ -3255,9 +3318,11 @@ def match_str(filter_str, dct, incomplete=False):
                        Can be True/False to indicate all/none of the keys may be missing.
                        All conditions on incomplete keys pass if the key is missing
     """
-    return all(
-        _match_one(filter_part.replace(r'\&', '&'), dct, incomplete)
-        for filter_part in re.split(r'(?<!\\)&', filter_str))
+    if isinstance(incomplete, bool):
+        is_incomplete = lambda _: incomplete
+    else:
+        is_incomplete = lambda k: k in incomplete
+    return all(match(dct, is_incomplete) for match in _compile_match_str(filter_str))
 
 
 def match_filter_func(filters, breaking_filters=None):
@@ -5359,7 +5424,10 @@ class FormatSorter:
     def __init__(self, ydl, field_preference):
         self.ydl = ydl
         self._order = []
+        # The settings are updated with the sort order and limits
+        self.settings = {field: dict(setting) for field, setting in self.settings.items()}
         self.evaluate_params(self.ydl.params, field_preference)
+        self._preference_functions = tuple(map(self._compile_field_preference, self._order))
         if ydl.params.get('verbose'):
             self.print_verbose_info(self.ydl.write_debug)
 
@@ -5526,6 +5594,76 @@ def _calculate_field_preference(self, format_, field):
             value = get_value(field)
         return self._calculate_field_preference_from_value(format_, field, type_, value)
 
+    def _compile_field_order(self, field):
+        """Return a function equivalent to _resolve_field_value(field, value, True) for an ordered field"""
+        order_list = (self._use_free_order and self._get_field_setting(field, 'order_free')) or self._get_field_setting(field, 'order')
+        list_length = len(order_list)
+        empty_pos = order_list.index('') if '' in order_list else list_length + 1
+        patterns = [
+            (i, re.compile(regex)) for i, regex in enumerate(order_list)
+            if regex] if self._get_field_setting(field, 'regex') else None
+
+        def resolve(value):
+            if value is not None:
+                value = value.lower()
+                if patterns is not None:
+                    for i, pattern in patterns:
+                        if pattern.match(value):
+                            return list_length - i
+                    return list_length - empty_pos  # not in list
+            return list_length - (order_list.index(value) if value in order_list else empty_pos)
+        return resolve
+
+    def _compile_field_preference(self, field):
+        """
+        Return a function that calculates the preference of a format for the field, like
+        _calculate_field_preference but with the settings of the field looked up only once
+        """
+        setting = functools.partial(self._get_field_setting, field)
+        type_ = setting('type')
+        if type_ == 'multiple':
+            type_ = 'field'  # Only 'field' is allowed in multiple for now
+            keys = [self._get_field_setting(f, 'field') for f in setting('field')]
+            function = setting('function')
+            get_value = lambda format_: function(format_.get(key) for key in keys)
+        else:
+            key = setting('field')
+            get_value = lambda format_: format_.get(key)
+
+        convert = None
+        if type_ == 'extractor':
+            maximum = setting('max')
+            convert = lambda value: -1 if value is None or (maximum is not None and value >= maximum) else value
+        elif type_ == 'boolean':
+            in_list, not_in_list = setting('in_list'), setting('not_in_list')
+            convert = lambda value: 0 if ((in_list is None or value in in_list)
+                                          and (not_in_list is None or value not in not_in_list)) else -1
+        elif type_ == 'ordered':
+            convert = (self._compile_field_order(field) if setting('convert') == 'order'
+                       else lambda value: self._resolve_field_value(field, value, True))
+
+        reverse, closest, limit = setting('reverse'), setting('closest'), setting('limit')
+        default, is_string = setting('default'), setting('convert') == 'string'
+
+        def preference(format_):
+            value = get_value(format_)
+            if convert:
+                value = convert(value)
+
+            # try to convert to number
+            val_num = float_or_none(value, default=default)
+            is_num = not is_string and val_num is not None
+            if is_num:
+                value = val_num
+
+            return ((-10, 0) if value is None
+                    else (1, value, 0) if not is_num  # if a field has mixed strings and numbers, strings are sorted higher
+                    else (0, -abs(value - limit), value - limit if reverse else limit - value) if closest
+                    else (0, value, 0) if not reverse and (limit is None or value <= limit)
+                    else (0, -value, 0) if limit is None or (reverse and value == limit) or value > limit
+                    else (-1, value, 0))
+        return preference
+
     def calculate_preference(self, format):
         # Determine missing protocol
         if not format.get('protocol'):
@@ -5561,7 +5699,7 @@ def calculate_preference(self, format):
         if not format.get('tbr'):
             format['tbr'] = try_call(lambda: format['vbr'] + format['abr']) or None
 
-        return tuple(self._calculate_field_preference(format, field) for field in self._order)
+        return tuple(preference(format) for preference in self._preference_functions)
 
 
 def filesize_from_tbr(tbr, duration):